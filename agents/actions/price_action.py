@@ -7,6 +7,7 @@ from pycoingecko import CoinGeckoAPI
 from django.utils import timezone
 from pydantic import BaseModel, ConfigDict
 from cdp_agentkit_core.actions import CdpAction
+from core.http import HTTPClientRegistry
 from ..models import PriceCache
 
 
@@ -16,6 +17,14 @@ class CoinGeckoPriceInput(BaseModel):
     vs_currencies: Optional[str] = "usd"
 
 
+def get_coingecko_client() -> CoinGeckoAPI:
+    """CoinGecko client using the process-wide pooled session"""
+    cg = CoinGeckoAPI()
+    cg.session = HTTPClientRegistry().session('coingecko')
+    cg.request_timeout = HTTPClientRegistry.get_config('coingecko')['timeout']
+    return cg
+
+
 class CoinGeckoPriceAction(CdpAction):
     """Action for retrieving cryptocurrency prices from CoinGecko."""
     
@@ -26,19 +35,20 @@ class CoinGeckoPriceAction(CdpAction):
     args_schema: type[BaseModel] = CoinGeckoPriceInput
     
     def __init__(self):
-        """Initialize with CoinGecko API client."""
+        """Initialize the action."""
         super().__init__()
-        self._cg = CoinGeckoAPI()
         self._cache_duration = timedelta(minutes=5)
 
     @staticmethod
-    async def _execute(parameters: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+    def _execute(parameters: Dict[str, Any] = None, **kwargs) -> Dict[str, Any]:
         """Execute the price fetch action"""
+        # Tools pass the validated arguments as keyword arguments
+        parameters = {**kwargs, **(parameters or {})}
         token_id = parameters.get('token_id', '').lower()
-        vs_currencies = parameters.get('vs_currencies', 'usd').lower()
+        vs_currencies = (parameters.get('vs_currencies') or 'usd').lower()
         
         try:
-            cg = CoinGeckoAPI()
+            cg = get_coingecko_client()
             price_data = cg.get_price(
                 ids=token_id,
                 vs_currencies=vs_currencies,
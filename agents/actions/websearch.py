@@ -4,7 +4,7 @@ Web search action using Tavily search
 from typing import Optional, Any, Dict, Callable
 from pydantic import BaseModel, ConfigDict
 from cdp_agentkit_core.actions import CdpAction
-import asyncio
+from core.event_loop import run_sync
 
 
 class WebSearchInput(BaseModel):
@@ -66,17 +66,7 @@ def search_web(parameters: Dict[str, Any] = None, **kwargs) -> str:
     if 'query' not in parameters:
         return "Error: No search query provided. Please provide a query to search for."
         
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    try:
-        return loop.run_until_complete(_search_web(parameters, **kwargs))
-    finally:
-        if not loop.is_closed():
-            loop.close()
+    return run_sync(_search_web(parameters, **kwargs))
 
 
 class WebSearchAction(CdpAction):
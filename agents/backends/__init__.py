@@ -0,0 +1,52 @@
+"""
+Pluggable LLM and CDP backends.
+
+AGENT_LLM_BACKEND and AGENT_CDP_BACKEND pick the real providers ('openai',
+'cdp') or the offline fakes ('fake') used to load test the full stack on
+one machine.
+"""
+from django.conf import settings
+from core.exceptions import AgentConfigurationError
+from core.http import HTTPClientRegistry
+
+
+def llm_backend() -> str:
+    return getattr(settings, 'AGENT_LLM_BACKEND', 'openai')
+
+
+def cdp_backend() -> str:
+    return getattr(settings, 'AGENT_CDP_BACKEND', 'cdp')
+
+
+def chat_model(model: str):
+    """Chat model for a model name on the configured LLM backend"""
+    backend = llm_backend()
+    if backend == 'openai':
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            model=model,
+            http_client=HTTPClientRegistry().client('openai'),
+            http_async_client=HTTPClientRegistry().async_client('openai'),
+            # Report token usage on streamed responses too
+            stream_usage=True,
+        )
+    if backend == 'fake':
+        from .fake_llm import FakeChatModel
+        return FakeChatModel(
+            model_name=model,
+            latency=getattr(settings, 'AGENT_FAKE_LLM_LATENCY', 0.2),
+            token_latency=getattr(settings, 'AGENT_FAKE_LLM_TOKEN_LATENCY', 0.0),
+        )
+    raise AgentConfigurationError(f"Unknown LLM backend: {backend}")
+
+
+def agentkit_wrapper(**kwargs):
+    """CdpAgentkitWrapper (or its in-memory stand-in) for the configured CDP backend"""
+    backend = cdp_backend()
+    if backend == 'cdp':
+        from cdp_langchain.utils import CdpAgentkitWrapper
+        return CdpAgentkitWrapper(**kwargs)
+    if backend == 'fake':
+        from .fake_cdp import FakeAgentkitWrapper
+        return FakeAgentkitWrapper(**kwargs)
+    raise AgentConfigurationError(f"Unknown CDP backend: {backend}")
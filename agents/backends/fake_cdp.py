@@ -0,0 +1,226 @@
+"""
+In-memory stand-in for CdpAgentkitWrapper, for load tests without CDP.
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Optional
+from cdp_langchain.utils import CdpAgentkitWrapper
+from django.conf import settings
+from pydantic import model_validator
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Starting balances of a new fake wallet
+FAKE_INITIAL_BALANCES = {'eth': '1', 'usdc': '1000'}
+
+# USD prices used for fake trades and price lookups
+FAKE_PRICES = {
+    'eth': Decimal('3000'),
+    'weth': Decimal('3000'),
+    'usdc': Decimal('1'),
+    'cbbtc': Decimal('60000'),
+    'bitcoin': Decimal('60000'),
+    'ethereum': Decimal('3000'),
+    'usd-coin': Decimal('1'),
+}
+
+FAUCET_AMOUNTS = {'eth': Decimal('0.0001'), 'usdc': Decimal('1')}
+
+
+class FakeLedger:
+    """Process-wide balances per address and asset, shared by all fake wallets"""
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._balances = {}
+                    instance._tx_count = 0
+                    instance._ledger_lock = threading.Lock()
+                    cls._instance = instance
+        return cls._instance
+
+    def open(self, address: str):
+        """Give a new address its starting balances"""
+        with self._ledger_lock:
+            if address not in self._balances:
+                self._balances[address] = {
+                    asset: Decimal(amount) for asset, amount in FAKE_INITIAL_BALANCES.items()
+                }
+
+    def balance(self, address: str, asset_id: str) -> Decimal:
+        with self._ledger_lock:
+            return self._balances.get(address, {}).get(asset_id.lower(), Decimal('0'))
+
+    def credit(self, address: str, asset_id: str, amount: Decimal):
+        with self._ledger_lock:
+            assets = self._balances.setdefault(address, {})
+            assets[asset_id.lower()] = assets.get(asset_id.lower(), Decimal('0')) + amount
+
+    def move(self, source: str, asset_id: str, amount: Decimal, destination: Optional[str] = None,
+             to_asset_id: Optional[str] = None, to_amount: Optional[Decimal] = None) -> str:
+        """Debit source and credit destination (or source, for trades), returning a tx hash"""
+        asset_id = asset_id.lower()
+        with self._ledger_lock:
+            assets = self._balances.setdefault(source, {})
+            available = assets.get(asset_id, Decimal('0'))
+            if amount <= 0 or available < amount:
+                raise ValueError(f"Insufficient {asset_id} balance: {available} available, {amount} requested")
+            assets[asset_id] = available - amount
+            target = self._balances.setdefault(destination or source, {})
+            credited = (to_asset_id or asset_id).lower()
+            target[credited] = target.get(credited, Decimal('0')) + (to_amount if to_amount is not None else amount)
+            self._tx_count += 1
+            return "0x" + hashlib.sha256(f"{source}-{self._tx_count}".encode()).hexdigest()
+
+
+class FakeAddress:
+    def __init__(self, address_id: str):
+        self.address_id = address_id
+
+    def balance(self, asset_id: str) -> Decimal:
+        return FakeLedger().balance(self.address_id, asset_id)
+
+
+class FakeWallet:
+    """Just enough of cdp.Wallet for the code that reads wallet ids and addresses"""
+
+    def __init__(self, wallet_id: str, network_id: str, address: str):
+        self.id = wallet_id
+        self.network_id = network_id
+        self.default_address = FakeAddress(address)
+        self.addresses = [self.default_address]
+
+
+class FakeAgentkitWrapper(CdpAgentkitWrapper):
+    """
+    CdpAgentkitWrapper that keeps wallets, balances and transfers in memory.
+
+    Every action goes through run_action; known actions are simulated
+    against FakeLedger with the same output format as the real ones, any
+    other action returns a canned result. AGENT_FAKE_CDP_LATENCY is slept
+    per call to stand in for the network.
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_environment(cls, values: dict) -> Any:
+        """Create or restore a fake wallet instead of configuring the CDP SDK"""
+        network_id = values.get("network_id") or "base-sepolia"
+        wallet_data = values.get("cdp_wallet_data")
+        data = json.loads(wallet_data) if isinstance(wallet_data, str) else (wallet_data or {})
+
+        wallet_id = data.get("wallet_id") or values.get("wallet_id") or str(uuid.uuid4())
+        address = (
+            data.get("default_address_id") or values.get("wallet_address")
+            or "0x" + hashlib.sha256(wallet_id.encode()).hexdigest()[:40]
+        )
+        FakeLedger().open(address)
+        return {
+            "wallet": FakeWallet(wallet_id, data.get("network_id") or network_id, address),
+            "network_id": data.get("network_id") or network_id,
+        }
+
+    def export_wallet(self) -> str:
+        return json.dumps({
+            "wallet_id": self.wallet.id,
+            "seed": "fake",
+            "network_id": self.wallet.network_id,
+            "default_address_id": self.wallet.default_address.address_id,
+        })
+
+    @property
+    def address(self) -> str:
+        return self.wallet.default_address.address_id
+
+    def _tx_link(self, tx_hash: str) -> str:
+        return f"https://sepolia.basescan.org/tx/{tx_hash}"
+
+    def run_action(self, func: Callable[..., str], **kwargs) -> Any:
+        """Simulate the action behind func"""
+        latency = getattr(settings, 'AGENT_FAKE_CDP_LATENCY', 0.05)
+        if latency:
+            time.sleep(latency)
+        name = _action_names().get(func, getattr(func, '__name__', 'action'))
+        handler = getattr(self, f"_fake_{name}", None)
+        if handler is None:
+            return f"Simulated {name} with {json.dumps(kwargs, default=str)}"
+        try:
+            return handler(**kwargs)
+        except (ValueError, InvalidOperation) as e:
+            return f"Error running {name} {e!s}"
+
+    def _fake_get_wallet_details(self, **kwargs) -> str:
+        return f"Wallet: {self.wallet.id} on network: {self.wallet.network_id} with default address: {self.address}"
+
+    def _fake_get_balance(self, asset_id: str = 'eth', **kwargs) -> str:
+        balances = "\n".join(
+            f"  {address.address_id}: {address.balance(asset_id)}" for address in self.wallet.addresses
+        )
+        return f"Balances for wallet {self.wallet.id}:\n{balances}"
+
+    def _fake_request_faucet_funds(self, asset_id: Optional[str] = None, **kwargs) -> str:
+        asset_id = (asset_id or 'eth').lower()
+        FakeLedger().credit(self.address, asset_id, FAUCET_AMOUNTS.get(asset_id, Decimal('1')))
+        return f"Received {asset_id} from the faucet. Transaction: {self._tx_link(uuid.uuid4().hex)}"
+
+    def _fake_transfer(self, amount: str, asset_id: str, destination: str, gasless: bool = False, **kwargs) -> str:
+        tx_hash = FakeLedger().move(self.address, asset_id, Decimal(str(amount)), destination=destination)
+        return (
+            f"Transferred {amount} of {asset_id} to {destination}.\n"
+            f"Transaction hash for the transfer: {tx_hash}\n"
+            f"Transaction link for the transfer: {self._tx_link(tx_hash)}"
+        )
+
+    def _fake_trade(self, amount: str, from_asset_id: str, to_asset_id: str, **kwargs) -> str:
+        amount = Decimal(str(amount))
+        from_price = FAKE_PRICES.get(from_asset_id.lower())
+        to_price = FAKE_PRICES.get(to_asset_id.lower())
+        if from_price is None or to_price is None:
+            raise ValueError(f"No fake price for {from_asset_id} or {to_asset_id}")
+        to_amount = (amount * from_price / to_price).quantize(Decimal('0.000001'))
+        tx_hash = FakeLedger().move(self.address, from_asset_id, amount, to_asset_id=to_asset_id, to_amount=to_amount)
+        return (
+            f"Traded {amount} of {from_asset_id} for {to_amount} of {to_asset_id}.\n"
+            f"Transaction hash for the trade: {tx_hash}\n"
+            f"Transaction link for the trade: {self._tx_link(tx_hash)}"
+        )
+
+    def _fake_wrap_eth(self, amount_to_wrap: str, **kwargs) -> str:
+        amount = Decimal(str(amount_to_wrap))
+        FakeLedger().move(self.address, 'eth', amount, to_asset_id='weth')
+        return f"Wrapped ETH with transaction hash: {self._tx_link(uuid.uuid4().hex)}"
+
+    def _fake_deploy_token(self, name: str, symbol: str, total_supply: str, **kwargs) -> str:
+        contract = "0x" + hashlib.sha256(f"{self.address}-{symbol}-{uuid.uuid4()}".encode()).hexdigest()[:40]
+        FakeLedger().credit(self.address, contract, Decimal(str(total_supply)))
+        return (
+            f"Deployed ERC20 token contract {name} ({symbol}) with total supply of {total_supply} tokens "
+            f"at address {contract}. Transaction link: {self._tx_link(uuid.uuid4().hex)}"
+        )
+
+    def _fake_get_token_price(self, token_id: str = '', vs_currencies: str = 'usd', **kwargs) -> Dict[str, Any]:
+        price = FAKE_PRICES.get((token_id or '').lower())
+        if price is None:
+            return {"success": False, "error": f"No price data found for {token_id}"}
+        return {"success": True, "data": {"usd": float(price), "usd_24h_change": 0.0}, "source": "fake"}
+
+
+_ACTION_NAMES = None
+
+
+def _action_names() -> Dict[Callable, str]:
+    """Action name for each action function, built on first use"""
+    global _ACTION_NAMES
+    if _ACTION_NAMES is None:
+        from ..actions import ALL_ACTIONS
+        _ACTION_NAMES = {action.func: action.name for action in ALL_ACTIONS}
+    return _ACTION_NAMES
@@ -0,0 +1,190 @@
+"""
+Scripted chat model for load tests without an LLM provider.
+"""
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field
+import logging
+
+logger = logging.getLogger(__name__)
+
+_ADDRESS = r'(?P<destination>0x[0-9a-fA-F]{40}|[\w-]+(?:\.base)?\.eth)'
+
+# (pattern, tool, args builder) tried in order against the last human message
+FAKE_TOOL_PLANS = [
+    (
+        re.compile(r'\b(?:send|transfer|pay)\s+(?P<amount>\d+(?:\.\d+)?)\s*(?P<asset>[a-z]+)?\b.*?' + _ADDRESS, re.IGNORECASE),
+        'transfer',
+        lambda m: {"amount": m.group('amount'), "asset_id": (m.group('asset') or 'eth').lower(), "destination": m.group('destination')},
+    ),
+    (
+        re.compile(r'\b(?:swap|trade|convert|exchange)\s+(?P<amount>\d+(?:\.\d+)?)\s*(?P<from>[a-z]+)\s+(?:for|to|into)\s+(?P<to>[a-z]+)', re.IGNORECASE),
+        'trade',
+        lambda m: {"amount": m.group('amount'), "from_asset_id": m.group('from').lower(), "to_asset_id": m.group('to').lower()},
+    ),
+    (
+        re.compile(r'\bprice\s+(?:of|for)\s+(?P<token>[a-z][\w-]*)|\b(?P<ticker>[a-z][\w-]*)\s+price\b', re.IGNORECASE),
+        'get_token_price',
+        lambda m: {"token_id": (m.group('token') or m.group('ticker')).lower(), "vs_currencies": "usd"},
+    ),
+    (
+        re.compile(r'\bfaucet\b|\btestnet funds\b', re.IGNORECASE),
+        'request_faucet_funds',
+        lambda m: {},
+    ),
+    (
+        re.compile(r'\bbalances?\b(?:\s+(?:of|in|for))?\s*(?P<asset>eth|usdc|weth|cbbtc)?', re.IGNORECASE),
+        'get_balance',
+        lambda m: {"asset_id": (m.group('asset') or 'eth').lower()},
+    ),
+    (
+        re.compile(r'\bwallet\b|\baddress\b', re.IGNORECASE),
+        'get_wallet_details',
+        lambda m: {},
+    ),
+]
+
+FILLER = (
+    "This is a simulated reply from the offline chat backend used for load testing. "
+    "No request was sent to a model provider and the numbers below are not real."
+).split()
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic chat model that plans tool calls from the last message.
+
+    A turn whose last message is a tool result gets a closing answer
+    quoting it. Otherwise the first FAKE_TOOL_PLANS entry matching the
+    last human message becomes a tool call, if that tool is bound, and
+    anything else gets a canned reply of `reply_words` words. `latency`
+    is slept once per call (time to first token) and `token_latency` per
+    streamed word. Token usage is estimated so turn metrics stay
+    comparable with a real model.
+    """
+
+    model_name: str = "fake-chat"
+    latency: float = 0.2
+    token_latency: float = 0.0
+    reply_words: int = 40
+    tool_names: List[str] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "FakeChatModel":
+        names = [
+            tool.name if hasattr(tool, 'name') else convert_to_openai_tool(tool)["function"]["name"]
+            for tool in tools
+        ]
+        return self.model_copy(update={"tool_names": names})
+
+    def _plan(self, messages: List[BaseMessage]) -> AIMessage:
+        """The reply to a conversation, without usage"""
+        last = messages[-1] if messages else None
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=f"Done. {last.name} returned: {str(last.content)[:300]}")
+
+        text = next((str(msg.content) for msg in reversed(messages) if isinstance(msg, HumanMessage)), "")
+        for pattern, tool, args in FAKE_TOOL_PLANS:
+            match = pattern.search(text)
+            if match and tool in self.tool_names:
+                return AIMessage(content="", tool_calls=[{
+                    "name": tool,
+                    "args": args(match),
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                }])
+        words = (FILLER * (self.reply_words // len(FILLER) + 1))[:self.reply_words]
+        return AIMessage(content=" ".join(words))
+
+    def _usage(self, messages: List[BaseMessage], reply: AIMessage) -> Dict[str, int]:
+        """Estimated usage: ~4 characters a token plus ~150 tokens per bound tool schema"""
+        prompt = sum(len(str(msg.content)) for msg in messages) // 4 + 150 * len(self.tool_names)
+        completion = len(str(reply.content)) // 4 + len(json.dumps(reply.tool_calls)) // 4 + 1
+        return {"input_tokens": prompt, "output_tokens": completion, "total_tokens": prompt + completion}
+
+    def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+        reply = self._plan(messages)
+        reply.usage_metadata = self._usage(messages, reply)
+        reply.response_metadata = {"model_name": self.model_name, "finish_reason": "tool_calls" if reply.tool_calls else "stop"}
+        return reply
+
+    def _chunks(self, reply: AIMessage) -> List[AIMessageChunk]:
+        """The reply split the way a provider streams it, usage on the last chunk"""
+        if reply.tool_calls:
+            chunks = [AIMessageChunk(content="", tool_call_chunks=[{
+                "name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index,
+            } for index, call in enumerate(reply.tool_calls)])]
+        else:
+            words = str(reply.content).split(" ")
+            chunks = [AIMessageChunk(content=word if i == 0 else " " + word) for i, word in enumerate(words)]
+        chunks.append(AIMessageChunk(
+            content="", usage_metadata=reply.usage_metadata, response_metadata=reply.response_metadata,
+        ))
+        return chunks
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency + self.token_latency * self.reply_words)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency + self.token_latency * self.reply_words)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for chunk in self._chunks(self._reply(messages)):
+            if chunk.content:
+                time.sleep(self.token_latency)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager and chunk.content:
+                run_manager.on_llm_new_token(chunk.content, chunk=generation)
+            yield generation
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(self._reply(messages)):
+            if chunk.content:
+                await asyncio.sleep(self.token_latency)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager and chunk.content:
+                await run_manager.on_llm_new_token(chunk.content, chunk=generation)
+            yield generation
@@ -0,0 +1,99 @@
+"""
+Shared helpers for the benchmark management commands
+"""
+import multiprocessing
+import os
+import statistics
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers every request with a small JSON body over keep-alive HTTP/1.1"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = b'{"ok": true}'
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        delay = self.server.response_delay
+        if delay:
+            time.sleep(delay)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(response_delay: float, port_queue):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.daemon_threads = True
+    server.response_delay = response_delay
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class StubHTTPServer:
+    """
+    Local HTTP server standing in for remote APIs during benchmarks.
+
+    Runs in a child process so its accepted connections don't show up in
+    the benchmarking process's socket count.
+    """
+
+    def __init__(self, response_delay: float = 0.0):
+        self.response_delay = response_delay
+        self._process = None
+        self._port = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._port}"
+
+    def __enter__(self):
+        port_queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.response_delay, port_queue), daemon=True
+        )
+        self._process.start()
+        self._port = port_queue.get(timeout=10)
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join()
+
+
+def open_socket_count() -> int:
+    """Count socket file descriptors held by this process"""
+    count = 0
+    fd_dir = '/proc/self/fd'
+    if not os.path.isdir(fd_dir):
+        return -1
+    for fd in os.listdir(fd_dir):
+        try:
+            if os.readlink(os.path.join(fd_dir, fd)).startswith('socket:'):
+                count += 1
+        except OSError:
+            continue
+    return count
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples in milliseconds"""
+    ordered = sorted(samples)
+    return {
+        'mean': statistics.fmean(ordered) * 1000,
+        'p50': ordered[len(ordered) // 2] * 1000,
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
@@ -0,0 +1,76 @@
+"""
+Management command comparing a compiled agent graph per agent with the shared graph registry
+"""
+import gc
+import os
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand
+from cdp_langchain.utils import CdpAgentkitWrapper
+from langchain_openai import ChatOpenAI
+from langgraph.prebuilt import create_react_agent
+from agents.services.chat import (
+    AGENT_SYSTEM_PROMPT,
+    DEFAULT_AGENT_MODEL,
+    AgentGraphRegistry,
+    ConversationContext,
+)
+from agents.services.checkpoint import DjangoCheckpointSaver
+from agents.toolkits import CustomAgentToolkit
+from ._benchmark import summarize
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks per-agent memory and cold-start time for per-agent graphs vs the shared graph'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agents', type=int, default=50, help='Number of agents to initialize')
+
+    def _build_per_agent(self, wrapper: CdpAgentkitWrapper):
+        """Old behaviour: a new LLM client, toolkit and compiled graph for every agent"""
+        llm = ChatOpenAI(model=DEFAULT_AGENT_MODEL)
+        toolkit = CustomAgentToolkit.from_cdp_agentkit_wrapper(wrapper)
+        return create_react_agent(
+            llm,
+            tools=toolkit.get_tools(),
+            checkpointer=DjangoCheckpointSaver(),
+            state_modifier=ConversationContext.as_state_modifier(llm, AGENT_SYSTEM_PROMPT),
+        )
+
+    def _build_shared(self, wrapper: CdpAgentkitWrapper):
+        """New behaviour: every agent reuses the process-wide graph"""
+        return AgentGraphRegistry().get(DEFAULT_AGENT_MODEL)
+
+    def _measure(self, builder, count: int):
+        wrappers = [CdpAgentkitWrapper.model_construct(network_id='base-sepolia') for _ in range(count)]
+        graphs, samples = [], []
+
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for wrapper in wrappers:
+            start = time.perf_counter()
+            graphs.append(builder(wrapper))
+            samples.append(time.perf_counter() - start)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        return samples, retained / count
+
+    def handle(self, *args, **options):
+        count = options['agents']
+        # ChatOpenAI only checks that a key is set; nothing is sent
+        os.environ.setdefault('OPENAI_API_KEY', 'benchmark')
+
+        for label, builder in (
+            ('graph per agent', self._build_per_agent),
+            ('shared graph', self._build_shared),
+        ):
+            samples, per_agent = self._measure(builder, count)
+            stats = summarize(samples)
+            self.stdout.write(self.style.SUCCESS(f"{label} ({count} agents)"))
+            self.stdout.write(
+                f"  init ms: first={samples[0] * 1000:.2f} mean={stats['mean']:.2f} p95={stats['p95']:.2f}"
+            )
+            self.stdout.write(f"  retained memory per agent: {per_agent / 1024:.1f} KiB")
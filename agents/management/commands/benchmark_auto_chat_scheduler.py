@@ -0,0 +1,146 @@
+"""
+Management command comparing a sleeping task per agent with the timing-wheel tick scheduler
+"""
+import asyncio
+import random
+import time
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from langchain_core.messages import HumanMessage
+from agents.backends.fake_llm import FakeChatModel
+from agents.services.auto_chat import AVAILABLE_STRATEGIES
+from agents.services.tick_scheduler import TickScheduler
+from ._benchmark import summarize
+
+
+class _Simulation:
+    """AutoChatStrategy instances iterating against the fake LLM, with concurrency gauges"""
+
+    def __init__(self, agents: int, owners: int, interval: float, llm_latency: float):
+        self.llm = FakeChatModel(latency=llm_latency, reply_words=20)
+        self.strategies = [AVAILABLE_STRATEGIES['default'](None, interval) for _ in range(agents)]
+        self.owners = [i % owners for i in range(agents)]
+        self.interval = interval
+        self.iterations = 0
+        self.running = 0
+        self.max_running = 0
+        self.owner_running = defaultdict(int)
+        self.max_owner_running = 0
+
+    async def iteration(self, index: int):
+        owner = self.owners[index]
+        self.running += 1
+        self.owner_running[owner] += 1
+        self.max_running = max(self.max_running, self.running)
+        self.max_owner_running = max(self.max_owner_running, self.owner_running[owner])
+        try:
+            strategy = self.strategies[index]
+            reply = await self.llm.ainvoke([HumanMessage(content=strategy.generate_message())])
+            strategy.process_response({'response': reply.content})
+            strategy.context['iteration_count'] += 1
+            self.iterations += 1
+        finally:
+            self.running -= 1
+            self.owner_running[owner] -= 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulates thousands of auto-chat agents on the fake LLM, once as a sleeping task per agent '
+        'and once on the timing-wheel scheduler, reporting throughput, concurrency and loop lag'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agents', type=int, default=10000, help='Simulated agents')
+        parser.add_argument('--owners', type=int, default=500, help='Users the agents are spread over')
+        parser.add_argument('--interval', type=float, default=10.0, help='Seconds between iterations of an agent')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run each mode')
+        parser.add_argument('--llm-latency', type=float, default=0.5, help='Fake LLM seconds per call')
+        parser.add_argument('--workers', type=int, default=256, help='Scheduler workers (concurrent LLM turns)')
+        parser.add_argument('--per-owner', type=int, default=8, help='Concurrent LLM turns per user')
+        parser.add_argument('--jitter', type=float, default=0.1, help='Interval jitter as a fraction')
+        parser.add_argument('--modes', nargs='*', default=['tasks', 'wheel'], choices=['tasks', 'wheel'])
+
+    async def _probe_lag(self, stopping: asyncio.Event, samples: list):
+        """Oversleep of a 50ms timer, i.e. how long ready callbacks wait for the loop"""
+        while not stopping.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.05)
+            samples.append(max(0.0, time.perf_counter() - started - 0.05))
+
+    async def _run_tasks(self, simulation: _Simulation, duration: float):
+        """One task per agent sleeping `interval` between iterations, as before"""
+        async def agent(index: int):
+            while True:
+                await simulation.iteration(index)
+                await asyncio.sleep(simulation.interval)
+
+        tasks = [asyncio.create_task(agent(index)) for index in range(len(simulation.strategies))]
+        await asyncio.sleep(duration)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return {}
+
+    async def _run_wheel(self, simulation: _Simulation, duration: float, options):
+        scheduler = TickScheduler(
+            workers=options['workers'], per_owner=options['per_owner'], jitter=options['jitter'],
+        )
+        for index, owner in enumerate(simulation.owners):
+            # Spread first ticks over one interval, as sessions claimed at once would be
+            scheduler.add(
+                index, simulation.interval, lambda index=index: simulation.iteration(index),
+                owner=owner, delay=random.uniform(0, simulation.interval),
+            )
+        stopping = asyncio.Event()
+        running = asyncio.create_task(scheduler.run(stopping))
+        await asyncio.sleep(duration)
+        stopping.set()
+        await running
+        return scheduler.summary()
+
+    async def _run(self, mode: str, options):
+        simulation = _Simulation(options['agents'], options['owners'], options['interval'], options['llm_latency'])
+        lag, stopping = [], asyncio.Event()
+        probe = asyncio.create_task(self._probe_lag(stopping, lag))
+        started_cpu = time.process_time()
+        if mode == 'tasks':
+            summary = await self._run_tasks(simulation, options['duration'])
+        else:
+            summary = await self._run_wheel(simulation, options['duration'], options)
+        cpu = time.process_time() - started_cpu
+        stopping.set()
+        await probe
+        return simulation, summary, lag, cpu
+
+    def handle(self, *args, **options):
+        labels = {'tasks': 'sleeping task per agent', 'wheel': 'timing-wheel scheduler'}
+        for mode in options['modes']:
+            simulation, summary, lag, cpu = asyncio.run(self._run(mode, options))
+            lag_stats = summarize(lag or [0.0])
+            self.stdout.write(self.style.SUCCESS(
+                f"{labels[mode]} ({options['agents']} agents, {options['owners']} users, "
+                f"every {options['interval']:g}s, fake LLM {options['llm_latency']:g}s, {options['duration']:g}s)"
+            ))
+            self.stdout.write(
+                f"  iterations: {simulation.iterations} ({simulation.iterations / options['duration']:.0f}/s), "
+                f"cpu {cpu:.2f}s"
+            )
+            self.stdout.write(
+                f"  concurrent LLM calls: max={simulation.max_running} "
+                f"max per user={simulation.max_owner_running}"
+            )
+            self.stdout.write(
+                f"  loop lag ms: mean={lag_stats['mean']:.1f} p50={lag_stats['p50']:.1f} "
+                f"p95={lag_stats['p95']:.1f} max={max(lag or [0.0]) * 1000:.1f}"
+            )
+            if summary:
+                self.stdout.write(
+                    f"  ticks: fired={summary['fired']} completed={summary['completed']} "
+                    f"skipped={summary['skipped']} merged={summary['merged']} deferred={summary['deferred']} "
+                    f"backlog={summary['backlog']}"
+                )
+                self.stdout.write(
+                    f"  tick lateness ms: p50={summary['lateness_p50_ms']:.0f} "
+                    f"p95={summary['lateness_p95_ms']:.0f} p99={summary['lateness_p99_ms']:.0f}"
+                )
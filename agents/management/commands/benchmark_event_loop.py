@@ -0,0 +1,75 @@
+"""
+Management command comparing a fresh event loop per turn with the shared background loop
+"""
+import asyncio
+import gc
+import time
+import httpx
+from django.core.management.base import BaseCommand
+from core.event_loop import run_sync
+from ._benchmark import StubHTTPServer, open_socket_count, summarize
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks turn latency and open sockets for per-call loops vs the shared background loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--turns', type=int, default=50, help='Number of simulated chat turns')
+        parser.add_argument('--calls', type=int, default=3, help='HTTP calls per turn (LLM round trips)')
+        parser.add_argument('--delay', type=float, default=0.005, help='Stub server response delay in seconds')
+
+    async def _turn(self, client: httpx.AsyncClient, url: str, calls: int):
+        for _ in range(calls):
+            response = await client.post(url, json={'messages': []})
+            response.raise_for_status()
+
+    def _run_per_call_loop(self, url: str, turns: int, calls: int):
+        """Old behaviour: new loop per turn, so the client's pool dies with it"""
+        samples = []
+        for _ in range(turns):
+            start = time.perf_counter()
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                client = httpx.AsyncClient()
+                loop.run_until_complete(self._turn(client, url, calls))
+            finally:
+                loop.close()
+            samples.append(time.perf_counter() - start)
+        return samples, open_socket_count()
+
+    def _run_shared_loop(self, url: str, turns: int, calls: int):
+        """New behaviour: one loop and one pooled client reused for every turn"""
+        async def make_client():
+            return httpx.AsyncClient()
+
+        client = run_sync(make_client())
+        samples = []
+        try:
+            for _ in range(turns):
+                start = time.perf_counter()
+                run_sync(self._turn(client, url, calls))
+                samples.append(time.perf_counter() - start)
+            return samples, open_socket_count()
+        finally:
+            run_sync(client.aclose())
+
+    def handle(self, *args, **options):
+        turns, calls = options['turns'], options['calls']
+
+        with StubHTTPServer(response_delay=options['delay']) as server:
+            url = f"{server.url}/v1/chat/completions"
+
+            for label, runner in (
+                ('new loop per call', self._run_per_call_loop),
+                ('shared background loop', self._run_shared_loop),
+            ):
+                gc.collect()
+                before = open_socket_count()
+                samples, after = runner(url, turns, calls)
+                stats = summarize(samples)
+                self.stdout.write(self.style.SUCCESS(f"{label} ({turns} turns x {calls} calls)"))
+                self.stdout.write(
+                    f"  turn latency ms: mean={stats['mean']:.2f} p50={stats['p50']:.2f} p95={stats['p95']:.2f}"
+                )
+                self.stdout.write(f"  open sockets: before={before} after={after}")
@@ -0,0 +1,75 @@
+"""
+Management command comparing a new HTTP client per call with the pooled client registry
+"""
+import time
+import httpx
+import requests
+from django.core.management.base import BaseCommand
+from core.event_loop import run_sync
+from core.http import HTTPClientRegistry
+from ._benchmark import StubHTTPServer, summarize
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks per-call latency of fresh HTTP clients vs the pooled HTTPClientRegistry clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calls', type=int, default=200, help='Number of requests per client type')
+        parser.add_argument('--delay', type=float, default=0.0, help='Stub server response delay in seconds')
+
+    def _time(self, call, calls: int):
+        samples = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    def _scenarios(self, url: str):
+        """(label, fresh client per call, pooled client) pairs, as the integrations used them"""
+        registry = HTTPClientRegistry()
+
+        def fresh_requests():
+            # TavilyClient: module-level requests.post, new connection every call
+            requests.post(url, json={}).raise_for_status()
+
+        def pooled_requests():
+            registry.session('benchmark').post(url, json={}).raise_for_status()
+
+        def fresh_httpx():
+            # ChatOpenAI per ChatService: a new httpx client per agent
+            with httpx.Client() as client:
+                client.post(url, json={}).raise_for_status()
+
+        def pooled_httpx():
+            registry.client('benchmark').post(url, json={}).raise_for_status()
+
+        async def fresh_async():
+            async with httpx.AsyncClient() as client:
+                (await client.post(url, json={})).raise_for_status()
+
+        async def pooled_async():
+            (await registry.async_client('benchmark').post(url, json={})).raise_for_status()
+
+        return [
+            ('requests', fresh_requests, pooled_requests),
+            ('httpx', fresh_httpx, pooled_httpx),
+            ('httpx async', lambda: run_sync(fresh_async()), lambda: run_sync(pooled_async())),
+        ]
+
+    def handle(self, *args, **options):
+        calls = options['calls']
+
+        with StubHTTPServer(response_delay=options['delay']) as server:
+            url = f"{server.url}/v1/chat/completions"
+
+            for label, fresh, pooled in self._scenarios(url):
+                self.stdout.write(self.style.SUCCESS(f"{label} ({calls} calls)"))
+                results = {}
+                for mode, call in (('new client per call', fresh), ('pooled registry client', pooled)):
+                    results[mode] = stats = summarize(self._time(call, calls))
+                    self.stdout.write(
+                        f"  {mode}: mean={stats['mean']:.3f}ms p50={stats['p50']:.3f}ms p95={stats['p95']:.3f}ms"
+                    )
+                saved = results['new client per call']['mean'] - results['pooled registry client']['mean']
+                self.stdout.write(f"  saved per call: {saved:.3f}ms")
@@ -0,0 +1,104 @@
+"""
+Management command comparing sequential tool calls with the concurrent tool pool
+"""
+import threading
+import time
+from django.core.management.base import BaseCommand
+from langchain_core.messages import AIMessage
+from langgraph.prebuilt import ToolNode
+from core.event_loop import run_sync
+from agents.toolkits import WalletBoundTool
+from ._benchmark import summarize
+
+READ_TOOLS = ['get_token_price', 'get_token_price', 'get_wallet_details', 'get_balance']
+WRITE_TOOLS = ['transfer', 'trade']
+
+
+class _StubWallet:
+    """Stands in for CdpAgentkitWrapper: sleeps per call and tracks overlapping writes"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self.writing = 0
+        self.max_writing = 0
+
+    def run_action(self, func, **kwargs):
+        return func(self, **kwargs)
+
+    def read(self, wallet, **kwargs):
+        time.sleep(self.delay)
+        return 'ok'
+
+    def write(self, wallet, **kwargs):
+        with self._lock:
+            self.writing += 1
+            self.max_writing = max(self.max_writing, self.writing)
+        try:
+            time.sleep(self.delay)
+            return 'ok'
+        finally:
+            with self._lock:
+                self.writing -= 1
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks one ReAct step with several tool calls: sequential vs concurrent with per-wallet write lock'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=20, help='Number of simulated agent steps per scenario')
+        parser.add_argument('--delay', type=float, default=0.05, help='Stub tool latency in seconds')
+
+    def _tools(self, wallet: _StubWallet):
+        tools = {}
+        for name in READ_TOOLS:
+            tools[name] = WalletBoundTool(name=name, description=name, func=wallet.read, read_only=True)
+        for name in WRITE_TOOLS:
+            tools[name] = WalletBoundTool(name=name, description=name, func=wallet.write, read_only=False)
+        return tools
+
+    def _step(self, names):
+        return AIMessage(content='', tool_calls=[
+            {'name': name, 'args': {}, 'id': f'call-{i}'} for i, name in enumerate(names)
+        ])
+
+    def _run_sequential(self, tools, step, config):
+        """Old behaviour: one tool call after another"""
+        for call in step.tool_calls:
+            tools[call['name']].invoke({**call, 'type': 'tool_call'}, config)
+
+    def _run_concurrent(self, node, step, config):
+        """New behaviour: ToolNode fans the calls out over the tool pool"""
+        run_sync(node.ainvoke({'messages': [step]}, config))
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        wallet = _StubWallet(options['delay'])
+        tools = self._tools(wallet)
+        node = ToolNode(list({tool.name: tool for tool in tools.values()}.values()))
+        config = {'configurable': {'cdp_agentkit_wrapper': wallet, 'wallet_key': 'benchmark'}}
+
+        for label, names in (
+            ('read-only step', READ_TOOLS),
+            ('mixed step', READ_TOOLS + WRITE_TOOLS),
+        ):
+            step = self._step(names)
+            self.stdout.write(self.style.SUCCESS(f"{label}: {len(names)} tool calls, {rounds} rounds"))
+            results = {}
+            for mode, run in (
+                ('sequential', lambda: self._run_sequential(tools, step, config)),
+                ('concurrent', lambda: self._run_concurrent(node, step, config)),
+            ):
+                wallet.max_writing = 0
+                samples = []
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    run()
+                    samples.append(time.perf_counter() - start)
+                results[mode] = stats = summarize(samples)
+                self.stdout.write(
+                    f"  {mode}: mean={stats['mean']:.1f}ms p95={stats['p95']:.1f}ms "
+                    f"max concurrent writes={wallet.max_writing}"
+                )
+            saved = results['sequential']['mean'] - results['concurrent']['mean']
+            self.stdout.write(f"  saved per step: {saved:.1f}ms")
@@ -0,0 +1,60 @@
+"""
+Management command comparing prompt sizes with and without tool routing
+"""
+from django.core.management.base import BaseCommand
+from agents.actions import ALL_ACTIONS
+from agents.services.chat import AGENT_SYSTEM_PROMPT, DEFAULT_AGENT_MODEL, AgentGraphRegistry, _get_encoding
+from agents.services.tool_router import ToolRouter
+
+SAMPLE_MESSAGES = [
+    "What's in my wallet?",
+    "Send 0.01 ETH to 0x4bbfd120d9f352a0bed7a014bd67913a2007a878",
+    "Swap 10 USDC for ETH",
+    "What is the price of bitcoin?",
+    "Deploy an NFT collection called Sunsets",
+    "Is 0x4bbfd120d9f352a0bed7a014bd67913a2007a878 a risky address?",
+    "Deposit 5 USDC into the Morpho vault",
+    "Thanks, go ahead",
+]
+
+
+class Command(BaseCommand):
+    help = 'Reports first-call prompt tokens per sample message with the full toolset and with routed tools'
+
+    def add_arguments(self, parser):
+        parser.add_argument('messages', nargs='*', help='Messages to route (defaults to a built-in sample)')
+        parser.add_argument('--allow', nargs='*', default=None, help='Tool allow-list to apply')
+
+    def handle(self, *args, **options):
+        registry = AgentGraphRegistry()
+        router = ToolRouter()
+        encoding = _get_encoding(DEFAULT_AGENT_MODEL)
+
+        def count(text):
+            return len(encoding.encode(text, disallowed_special=())) if encoding else len(text) // 4 + 1
+
+        base = count(AGENT_SYSTEM_PROMPT)
+        full_tools = registry.tool_tokens(DEFAULT_AGENT_MODEL, router.allowed(options['allow']))
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(ALL_ACTIONS)} tools, {registry.tool_tokens(DEFAULT_AGENT_MODEL)} schema tokens; "
+            f"system prompt {base} tokens"
+        ))
+
+        total_full = total_routed = 0
+        for message in options['messages'] or SAMPLE_MESSAGES:
+            selection = router.select(message, allowlist=options['allow'])
+            prompt = base + count(message)
+            full = prompt + full_tools
+            routed = prompt + registry.tool_tokens(DEFAULT_AGENT_MODEL, selection.actions)
+            total_full += full
+            total_routed += routed
+            intents = ', '.join(selection.intents) or '-'
+            self.stdout.write(
+                f"  {message[:48]!r:52} intents={intents:18} tools={len(selection.actions):2} "
+                f"prompt={full}->{routed} ({100 * (full - routed) / full:.0f}% saved)"
+                f"{' fallback' if selection.fallback else ''}"
+            )
+        self.stdout.write(
+            f"  total: {total_full} -> {total_routed} prompt tokens "
+            f"({100 * (total_full - total_routed) / max(total_full, 1):.0f}% saved)"
+        )
@@ -0,0 +1,207 @@
+"""
+Management command load testing the agent API on the offline LLM and CDP backends
+"""
+import itertools
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from agents.models import Agent
+from ._benchmark import summarize
+
+SCENARIOS = ['create', 'chat', 'action', 'auto_chat']
+
+CHAT_MESSAGES = [
+    "What's my wallet address?",
+    "What is my ETH balance?",
+    "Send 0.001 ETH to 0x4bbfd120d9f352a0bed7a014bd67913a2007a878",
+    "Swap 1 USDC for ETH",
+    "What is the price of ethereum?",
+    "Tell me something interesting about onchain agents",
+]
+
+ACTIONS = [
+    ('get_wallet_details', {}),
+    ('get_balance', {'asset_id': 'eth'}),
+    ('request_faucet_funds', {'asset_id': 'eth'}),
+]
+
+# AgentActionThrottle allows 100 requests per user and hour
+MAX_REQUESTS_PER_USER = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Drives agent creation, chat, actions and auto-chat through the HTTP views with the '
+        'fake LLM and CDP backends, reporting throughput and latency percentiles'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agents', type=int, default=20, help='Agents (each with its own user) to create')
+        parser.add_argument('--requests', type=int, default=5, help='Requests per agent and scenario')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+        parser.add_argument('--scenarios', nargs='*', default=SCENARIOS[1:], choices=SCENARIOS[1:],
+                            help='Scenarios to run after creating the agents')
+        parser.add_argument('--llm-latency', type=float, default=0.2, help='Fake LLM seconds per call')
+        parser.add_argument('--token-latency', type=float, default=0.0, help='Fake LLM seconds per streamed word')
+        parser.add_argument('--cdp-latency', type=float, default=0.05, help='Fake CDP seconds per action')
+        parser.add_argument('--stream', action='store_true', help='Use ?stream=true for chat requests')
+        parser.add_argument('--keep', action='store_true', help='Keep the created users and agents')
+
+    def _client(self, user) -> APIClient:
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def _request(self, scenario: str, user, payload):
+        """Issue one request, returning (seconds, ok, detail)"""
+        client = self._client(user)
+        started = time.perf_counter()
+        try:
+            if scenario == 'create':
+                response = client.post(reverse('agents:agent-list'), payload, format='json')
+                ok = response.status_code == 201
+                detail = response.data.get('id') if ok else response.data
+            elif scenario == 'chat':
+                agent_id, message = payload
+                url = reverse('agents:agent-chat', args=[agent_id]) + ('?stream=true' if self.stream else '')
+                response = client.post(url, {'message': message}, format='json')
+                if response.streaming:
+                    # Drain the stream so the whole turn is timed
+                    body = b''.join(response.streaming_content)
+                    ok = response.status_code == 200 and b'"error"' not in body
+                    detail = body[-200:]
+                else:
+                    ok = response.status_code == 200 and 'error' not in response.data
+                    detail = response.data
+            elif scenario == 'action':
+                agent_id, (action_type, parameters) = payload
+                response = client.post(
+                    reverse('agents:agent-actions', args=[agent_id]),
+                    {'action_type': action_type, 'parameters': parameters},
+                    format='json',
+                )
+                ok = response.status_code == 200 and 'error' not in response.data
+                detail = response.data
+            else:
+                response = client.post(
+                    reverse('agents:agent-auto-chat', args=[payload]), {'interval': 1}, format='json',
+                )
+                # Time starting the session up to its first frame, then unsubscribe
+                frames = iter(response.streaming_content)
+                first = next(frames, b'')
+                if isinstance(first, str):
+                    first = first.encode()
+                response.close()
+                ok = response.status_code == 200 and b'"error"' not in first
+                detail = first[:200]
+            return time.perf_counter() - started, ok, detail
+        except Exception as e:
+            return time.perf_counter() - started, False, str(e)
+        finally:
+            close_old_connections()
+
+    def _run(self, scenario: str, jobs, concurrency: int):
+        """Run (user, payload) jobs concurrently, returning results and wall time"""
+        def work(job):
+            try:
+                return self._request(scenario, *job)
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(work, jobs))
+        return results, time.perf_counter() - started
+
+    def _report(self, scenario: str, results, elapsed: float):
+        samples = [seconds for seconds, _, _ in results]
+        errors = [detail for _, ok, detail in results if not ok]
+        stats = summarize(samples)
+        self.stdout.write(
+            f"  {scenario:10} {len(results):5} requests in {elapsed:6.2f}s  {len(results) / elapsed:7.1f} req/s  "
+            f"mean={stats['mean']:.0f}ms p50={stats['p50']:.0f}ms p95={stats['p95']:.0f}ms  errors={len(errors)}"
+        )
+        if errors:
+            self.stdout.write(self.style.WARNING(f"    first error: {str(errors[0])[:300]}"))
+
+    def handle(self, *args, **options):
+        count, per_agent, concurrency = options['agents'], options['requests'], options['concurrency']
+        if per_agent * len(options['scenarios']) + 1 > MAX_REQUESTS_PER_USER:
+            raise CommandError(
+                f"{per_agent} requests x {len(options['scenarios'])} scenarios per agent exceeds the "
+                f"{MAX_REQUESTS_PER_USER}/hour action throttle; use more agents and fewer requests"
+            )
+        self.stream = options['stream']
+
+        with override_settings(
+            AGENT_LLM_BACKEND='fake',
+            AGENT_CDP_BACKEND='fake',
+            AGENT_FAKE_LLM_LATENCY=options['llm_latency'],
+            AGENT_FAKE_LLM_TOKEN_LATENCY=options['token_latency'],
+            AGENT_FAKE_CDP_LATENCY=options['cdp_latency'],
+        ):
+            run = uuid.uuid4().hex[:8]
+            User = get_user_model()
+            users = [
+                User.objects.create_user(username=f'loadtest-{run}-{i}', password=uuid.uuid4().hex)
+                for i in range(count)
+            ]
+            self.stdout.write(self.style.SUCCESS(
+                f"Load test {run}: {count} agents, {per_agent} requests per agent and scenario, "
+                f"concurrency {concurrency}, fake LLM {options['llm_latency']}s, fake CDP {options['cdp_latency']}s"
+            ))
+            try:
+                results, elapsed = self._run('create', [
+                    (user, {'name': f'loadtest-{run}-{i}', 'description': 'Load test agent', 'status': 'active'})
+                    for i, user in enumerate(users)
+                ], concurrency)
+                self._report('create', results, elapsed)
+                agents = [
+                    (user, detail) for user, (_, ok, detail) in zip(users, results) if ok
+                ]
+                if not agents:
+                    raise CommandError("No agent could be created")
+
+                messages = itertools.cycle(CHAT_MESSAGES)
+                actions = itertools.cycle(ACTIONS)
+                payloads = {
+                    'chat': lambda agent_id: (agent_id, next(messages)),
+                    'action': lambda agent_id: (agent_id, next(actions)),
+                    'auto_chat': lambda agent_id: agent_id,
+                }
+                for scenario in options['scenarios']:
+                    # Interleave agents so concurrent requests hit different agents
+                    jobs = [
+                        (user, payloads[scenario](agent_id))
+                        for _ in range(per_agent) for user, agent_id in agents
+                    ]
+                    self._report(scenario, *self._run(scenario, jobs, concurrency))
+
+                self._report_turns([agent_id for _, agent_id in agents])
+            finally:
+                if not options['keep']:
+                    Agent.objects.filter(name__startswith=f'loadtest-{run}-').delete()
+                    User.objects.filter(username__startswith=f'loadtest-{run}-').delete()
+
+    def _report_turns(self, agent_ids):
+        """LLM and tool time recorded by the turns of the run"""
+        from agents.models import ChatMessage
+        totals = defaultdict(float)
+        turns = ChatMessage.objects.filter(agent_id__in=agent_ids, message_type=ChatMessage.MessageType.AI)
+        for values in turns.values('llm_ms', 'tool_ms', 'llm_calls', 'tool_calls', 'prompt_tokens'):
+            for field, value in values.items():
+                totals[field] += value or 0
+        count = turns.count()
+        if count:
+            self.stdout.write(
+                f"  turns: {count}, {totals['llm_calls'] / count:.1f} LLM and {totals['tool_calls'] / count:.1f} "
+                f"tool calls per turn, {totals['llm_ms'] / count:.0f}ms LLM and {totals['tool_ms'] / count:.0f}ms "
+                f"tools per turn, {totals['prompt_tokens'] / count:.0f} prompt tokens per turn"
+            )
@@ -0,0 +1,80 @@
+"""
+Management command running the background worker pool for queued agent jobs
+"""
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from agents.services.jobs import AgentJobQueue
+
+
+class Command(BaseCommand):
+    help = 'Runs queued chat and task jobs (AgentJob) on a pool of worker threads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            default=getattr(settings, 'AGENT_JOB_WORKER_CONCURRENCY', 4),
+            help='Number of jobs run at the same time'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'AGENT_JOB_POLL_INTERVAL', 1.0),
+            help='Seconds between checks for new jobs while idle'
+        )
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is drained')
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        poll_interval = options['poll_interval']
+        queue = AgentJobQueue(worker_id=f"{socket.gethostname()}-{os.getpid()}")
+        heartbeat_interval = queue.lease_ttl / 3
+        stopping = threading.Event()
+
+        def stop(signum, frame):
+            self.stdout.write('Stopping: finishing running jobs, no new jobs will be claimed')
+            stopping.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Worker {queue.worker_id} started with concurrency {concurrency}"
+        ))
+        running = {}
+        last_heartbeat = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='agent-job') as executor:
+            try:
+                while running or not stopping.is_set():
+                    for job_id in [job_id for job_id, future in running.items() if future.done()]:
+                        del running[job_id]
+
+                    if time.monotonic() - last_heartbeat >= heartbeat_interval:
+                        queue.heartbeat(running.keys())
+                        last_heartbeat = time.monotonic()
+
+                    claimed = []
+                    if not stopping.is_set():
+                        queue.recover_expired()
+                        claimed = queue.claim(concurrency - len(running))
+                        for job in claimed:
+                            running[job.pk] = executor.submit(queue.execute, job)
+
+                    if options['once'] and not running and not claimed:
+                        break
+                    close_old_connections()
+                    if stopping.is_set():
+                        time.sleep(0.1)
+                    elif not claimed:
+                        stopping.wait(poll_interval)
+            finally:
+                # Only reached with jobs still running if the loop itself failed
+                queue.release(job_id for job_id, future in running.items() if not future.done())
+
+        self.stdout.write(self.style.SUCCESS(f"Worker {queue.worker_id} stopped"))
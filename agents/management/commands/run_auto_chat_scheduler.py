@@ -0,0 +1,61 @@
+"""
+Management command running the scheduler for auto-chat sessions
+"""
+import asyncio
+import os
+import signal
+import socket
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from agents.services.sessions import AutoChatScheduler
+
+
+class Command(BaseCommand):
+    help = 'Runs active auto-chat sessions (AutoChatSession) on an asyncio event loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-sessions', type=int,
+            default=getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_MAX_SESSIONS', 5000),
+            help='Number of sessions this scheduler runs at the same time'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_POLL_INTERVAL', 1.0),
+            help='Seconds between checks for new and stopped sessions'
+        )
+        parser.add_argument(
+            '--workers', type=int,
+            default=getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_WORKERS', 64),
+            help='Iterations running at the same time'
+        )
+        parser.add_argument(
+            '--per-owner', type=int,
+            default=getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_PER_OWNER', 8),
+            help="Iterations of one user's agents running at the same time"
+        )
+
+    def handle(self, *args, **options):
+        scheduler = AutoChatScheduler(
+            scheduler_id=f"{socket.gethostname()}-{os.getpid()}",
+            max_sessions=max(1, options['max_sessions']),
+            poll_interval=options['poll_interval'],
+            workers=max(1, options['workers']),
+            per_owner=max(1, options['per_owner']),
+        )
+
+        async def main():
+            stopping = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(signum, stopping.set)
+            self.stdout.write(self.style.SUCCESS(
+                f"Scheduler {scheduler.scheduler_id} started, up to {scheduler.max_sessions} sessions, "
+                f"{scheduler.ticks.workers} workers"
+            ))
+            await scheduler.run(stopping)
+
+        asyncio.run(main())
+        self.stdout.write(self.style.SUCCESS(
+            f"Scheduler {scheduler.scheduler_id} stopped, its sessions were handed back"
+        ))
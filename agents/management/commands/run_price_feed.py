@@ -0,0 +1,60 @@
+"""
+Management command storing token prices (TokenPrice) for event-driven trading strategies
+"""
+import random
+import signal
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from agents.backends.fake_cdp import FAKE_PRICES
+from agents.services.auto_chat.data import PriceFetcher
+
+
+class Command(BaseCommand):
+    help = 'Fetches token prices on an interval and stores them as the feed price-triggered strategies watch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float,
+            default=getattr(settings, 'AGENT_PRICE_FEED_INTERVAL', 60),
+            help='Seconds between fetches'
+        )
+        parser.add_argument(
+            '--tokens', nargs='*',
+            default=getattr(settings, 'AGENT_PRICE_FEED_TOKENS', ['ethereum', 'bitcoin']),
+            help='CoinGecko token ids to store'
+        )
+        parser.add_argument(
+            '--source', choices=['coingecko', 'fake'], default='coingecko',
+            help='"fake" stores a random walk from the offline backend prices instead of calling CoinGecko'
+        )
+        parser.add_argument('--volatility', type=float, default=0.5, help='Fake source: percent stdev per step')
+        parser.add_argument('--once', action='store_true', help='Store one set of prices and exit')
+
+    def handle(self, *args, **options):
+        fetcher = PriceFetcher(options['tokens'])
+        stopping = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: stopping.set())
+        walk = {token_id: float(FAKE_PRICES.get(token_id, 1)) for token_id in fetcher.tokens}
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Price feed for {', '.join(fetcher.tokens)} from {options['source']} every {options['interval']:g}s"
+        ))
+        while not stopping.is_set():
+            try:
+                if options['source'] == 'fake':
+                    for token_id in walk:
+                        walk[token_id] *= 1 + random.gauss(0, options['volatility'] / 100)
+                    rows = fetcher.store({token_id: {'usd': round(price, 6)} for token_id, price in walk.items()})
+                else:
+                    rows = fetcher.fetch()
+                self.stdout.write(', '.join(f"{row.token_id}={row.price_usd:.2f}" for row in rows))
+            except Exception as e:
+                self.stderr.write(f"Failed to store prices: {str(e)}")
+            finally:
+                close_old_connections()
+            if options['once']:
+                break
+            stopping.wait(options['interval'])
@@ -0,0 +1,91 @@
+# Generated by Django 4.2.18 on 2026-10-16 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0007_chatmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckpointBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('thread_id', models.CharField(max_length=255)),
+                ('checkpoint_ns', models.CharField(blank=True, default='', max_length=255)),
+                ('channel', models.CharField(max_length=255)),
+                ('version', models.CharField(max_length=64)),
+                ('value_type', models.CharField(max_length=32)),
+                ('value', models.BinaryField(null=True)),
+                ('compressed', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CheckpointWrite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('thread_id', models.CharField(max_length=255)),
+                ('checkpoint_ns', models.CharField(blank=True, default='', max_length=255)),
+                ('checkpoint_id', models.CharField(max_length=64)),
+                ('task_id', models.CharField(max_length=255)),
+                ('task_path', models.CharField(blank=True, default='', max_length=255)),
+                ('idx', models.IntegerField()),
+                ('channel', models.CharField(max_length=255)),
+                ('value_type', models.CharField(max_length=32)),
+                ('value', models.BinaryField(null=True)),
+                ('compressed', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConversationCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('thread_id', models.CharField(max_length=255)),
+                ('checkpoint_ns', models.CharField(blank=True, default='', max_length=255)),
+                ('checkpoint_id', models.CharField(max_length=64)),
+                ('parent_checkpoint_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('checkpoint_type', models.CharField(max_length=32)),
+                ('checkpoint', models.BinaryField(help_text='Serialized checkpoint without channel values')),
+                ('metadata_type', models.CharField(max_length=32)),
+                ('metadata', models.BinaryField()),
+                ('compressed', models.BooleanField(default=False)),
+                ('metadata_compressed', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.RenameIndex(
+            model_name='chatmessage',
+            new_name='agents_chat_agent_i_0cc11f_idx',
+            old_name='agents_chat_agent_i_c8001c_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='chatmessage',
+            new_name='agents_chat_convers_7ac37e_idx',
+            old_name='agents_chat_convers_f21274_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='chatmessage',
+            new_name='agents_chat_created_cc563e_idx',
+            old_name='agents_chat_created_e0c1a5_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='conversationcheckpoint',
+            constraint=models.UniqueConstraint(fields=('thread_id', 'checkpoint_ns', 'checkpoint_id'), name='unique_conversation_checkpoint'),
+        ),
+        migrations.AddConstraint(
+            model_name='checkpointwrite',
+            constraint=models.UniqueConstraint(fields=('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'), name='unique_checkpoint_write'),
+        ),
+        migrations.AddConstraint(
+            model_name='checkpointblob',
+            constraint=models.UniqueConstraint(fields=('thread_id', 'checkpoint_ns', 'channel', 'version'), name='unique_checkpoint_blob'),
+        ),
+    ]
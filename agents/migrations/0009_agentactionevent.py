@@ -0,0 +1,36 @@
+# Generated by Django 4.2.18 on 2026-10-16 23:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0008_conversationcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentaction',
+            name='event_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of events in the action event log'),
+        ),
+        migrations.CreateModel(
+            name='AgentActionEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField()),
+                ('payload', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('action', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='agents.agentaction')),
+            ],
+            options={
+                'ordering': ['sequence'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='agentactionevent',
+            constraint=models.UniqueConstraint(fields=('action', 'sequence'), name='unique_action_event_sequence'),
+        ),
+    ]
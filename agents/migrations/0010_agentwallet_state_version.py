@@ -0,0 +1,18 @@
+# Generated by Django 4.2.18 on 2026-10-16 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0009_agentactionevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentwallet',
+            name='state_version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented whenever a tool that changes wallet state runs'),
+        ),
+    ]
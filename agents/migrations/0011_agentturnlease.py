@@ -0,0 +1,22 @@
+# Generated by Django 4.2.18 on 2026-10-16 23:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0010_agentwallet_state_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgentTurnLease',
+            fields=[
+                ('agent', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='turn_lease', serialize=False, to='agents.agent')),
+                ('owner', models.CharField(max_length=64)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+    ]
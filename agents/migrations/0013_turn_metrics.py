@@ -0,0 +1,123 @@
+# Generated by Django 4.2.18 on 2026-10-16 23:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0012_agentjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgentActionSpan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('llm', 'LLM'), ('summary', 'Context summary'), ('tool', 'Tool')], max_length=10)),
+                ('name', models.CharField(max_length=100)),
+                ('duration_ms', models.FloatField()),
+                ('prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('completion_tokens', models.PositiveIntegerField(default=0)),
+                ('error', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='completion_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='latency_ms',
+            field=models.FloatField(blank=True, help_text='Wall time of the turn', null=True),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='llm_calls',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='llm_ms',
+            field=models.FloatField(blank=True, help_text='Time spent in LLM calls', null=True),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='persistence_ms',
+            field=models.FloatField(blank=True, help_text='Time spent writing messages and checkpoints', null=True),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='prompt_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='tool_calls',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='tool_ms',
+            field=models.FloatField(blank=True, help_text='Time spent in tool calls', null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='completion_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='latency_ms',
+            field=models.FloatField(blank=True, help_text='Wall time of the turn', null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='llm_calls',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='llm_ms',
+            field=models.FloatField(blank=True, help_text='Time spent in LLM calls', null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='persistence_ms',
+            field=models.FloatField(blank=True, help_text='Time spent writing messages and checkpoints', null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='prompt_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='tool_calls',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='tool_ms',
+            field=models.FloatField(blank=True, help_text='Time spent in tool calls', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['agent', 'message_type', 'created_at'], name='agents_chat_agent_i_8e337b_idx'),
+        ),
+        migrations.AddField(
+            model_name='agentactionspan',
+            name='action',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spans', to='agents.agentaction'),
+        ),
+        migrations.AddIndex(
+            model_name='agentactionspan',
+            index=models.Index(fields=['kind', 'name', 'created_at'], name='agents_agen_kind_d0b67f_idx'),
+        ),
+    ]
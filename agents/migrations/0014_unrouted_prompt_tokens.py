@@ -0,0 +1,23 @@
+# Generated by Django 4.2.18 on 2026-10-16 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0013_turn_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentaction',
+            name='unrouted_prompt_tokens',
+            field=models.PositiveIntegerField(blank=True, help_text='Estimated prompt tokens with every tool bound', null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='unrouted_prompt_tokens',
+            field=models.PositiveIntegerField(blank=True, help_text='Estimated prompt tokens with every tool bound', null=True),
+        ),
+    ]
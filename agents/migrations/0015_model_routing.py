@@ -0,0 +1,43 @@
+# Generated by Django 4.2.18 on 2026-10-17 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0014_unrouted_prompt_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentaction',
+            name='escalated',
+            field=models.BooleanField(default=False, help_text='Moved to a stronger model after a failed tool call'),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='model',
+            field=models.CharField(blank=True, default='', help_text='Model that answered the turn', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='agentaction',
+            name='routing_ms',
+            field=models.FloatField(blank=True, help_text='Time spent picking the model and tools', null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='escalated',
+            field=models.BooleanField(default=False, help_text='Moved to a stronger model after a failed tool call'),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='model',
+            field=models.CharField(blank=True, default='', help_text='Model that answered the turn', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='routing_ms',
+            field=models.FloatField(blank=True, help_text='Time spent picking the model and tools', null=True),
+        ),
+    ]
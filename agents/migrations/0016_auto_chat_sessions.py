@@ -0,0 +1,41 @@
+# Generated by Django 4.2.18 on 2026-10-17 00:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0015_model_routing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutoChatSession',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('message', models.TextField()),
+                ('interval', models.PositiveIntegerField(default=10)),
+                ('strategy', models.CharField(blank=True, max_length=50)),
+                ('conversation_id', models.UUIDField(default=uuid.uuid4)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('stopped', 'Stopped'), ('completed', 'Completed'), ('failed', 'Failed')], default='active', max_length=20)),
+                ('iterations', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True)),
+                ('scheduler_id', models.CharField(blank=True, max_length=64)),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Lease renewed by the scheduler running the session', null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('action', models.OneToOneField(blank=True, help_text='Action whose event log holds the session output', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='auto_chat_session', to='agents.agentaction')),
+                ('agent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='auto_chat_sessions', to='agents.agent')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'locked_until'], name='agents_auto_status_14a202_idx'), models.Index(fields=['agent', 'created_at'], name='agents_auto_agent_i_bfc243_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.18 on 2026-10-17 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0016_auto_chat_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='autochatsession',
+            name='strategy_state',
+            field=models.JSONField(blank=True, default=dict, help_text='Strategy snapshot restored when another scheduler takes the session over'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.18 on 2026-10-17 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0017_auto_chat_strategy_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='autochatsession',
+            name='strategy_config',
+            field=models.JSONField(blank=True, default=dict, help_text="Validated against the strategy's config schema"),
+        ),
+    ]
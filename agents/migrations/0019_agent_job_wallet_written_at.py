@@ -0,0 +1,18 @@
+# Generated by Django 4.2.18 on 2026-10-17 00:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0018_auto_chat_strategy_config'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentjob',
+            name='wallet_written_at',
+            field=models.DateTimeField(blank=True, help_text='First state-changing tool call; such a job is never run again', null=True),
+        ),
+    ]
@@ -61,7 +61,32 @@ class Agent(TimeStampedModel):
         # Call parent delete
         return super().delete(*args, **kwargs)
 
-class AgentAction(TimeStampedModel):
+class TurnMetricsModel(models.Model):
+    """
+    Abstract base with per-turn timing and token usage columns.
+
+    Null when not measured (human messages, rows from before they existed).
+    """
+    latency_ms = models.FloatField(null=True, blank=True, help_text='Wall time of the turn')
+    llm_ms = models.FloatField(null=True, blank=True, help_text='Time spent in LLM calls')
+    tool_ms = models.FloatField(null=True, blank=True, help_text='Time spent in tool calls')
+    persistence_ms = models.FloatField(null=True, blank=True, help_text='Time spent writing messages and checkpoints')
+    llm_calls = models.PositiveIntegerField(null=True, blank=True)
+    tool_calls = models.PositiveIntegerField(null=True, blank=True)
+    prompt_tokens = models.PositiveIntegerField(null=True, blank=True)
+    completion_tokens = models.PositiveIntegerField(null=True, blank=True)
+    unrouted_prompt_tokens = models.PositiveIntegerField(
+        null=True, blank=True, help_text='Estimated prompt tokens with every tool bound'
+    )
+    routing_ms = models.FloatField(null=True, blank=True, help_text='Time spent picking the model and tools')
+    model = models.CharField(max_length=100, blank=True, default='', help_text='Model that answered the turn')
+    escalated = models.BooleanField(default=False, help_text='Moved to a stronger model after a failed tool call')
+
+    class Meta:
+        abstract = True
+
+
+class AgentAction(TurnMetricsModel, TimeStampedModel):
     """Model for tracking agent actions and their results"""
     agent = models.ForeignKey(Agent, on_delete=models.CASCADE, related_name='actions')
     action_type = models.CharField(max_length=100)
@@ -73,6 +98,7 @@ class AgentAction(TimeStampedModel):
         default=Status.PENDING
     )
     error_message = models.TextField(blank=True)
+    event_count = models.PositiveIntegerField(default=0, help_text='Number of events in the action event log')
 
     class Meta:
         ordering = ['-created_at']
@@ -80,6 +106,160 @@ class AgentAction(TimeStampedModel):
     def __str__(self):
         return f"{self.agent.name} - {self.action_type} ({self.status})"
 
+    def rebuild_result(self):
+        """Return the result with streamed events restored under 'responses'"""
+        if not self.event_count:
+            return self.result
+        if 'events' in getattr(self, '_prefetched_objects_cache', {}):
+            # Loaded with prefetch_related('events') for a list of actions
+            responses = [event.payload for event in self.events.all()]
+        else:
+            responses = list(self.events.order_by('sequence').values_list('payload', flat=True))
+        return {**(self.result or {}), 'responses': responses}
+
+
+class AgentActionEvent(models.Model):
+    """Append-only log of events streamed by an action"""
+    action = models.ForeignKey(AgentAction, on_delete=models.CASCADE, related_name='events')
+    sequence = models.PositiveIntegerField()
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['sequence']
+        constraints = [
+            models.UniqueConstraint(fields=['action', 'sequence'], name='unique_action_event_sequence')
+        ]
+
+    def __str__(self):
+        return f"{self.action_id} #{self.sequence}"
+
+
+class AgentActionSpan(models.Model):
+    """Timing of one LLM or tool call made during an action"""
+    class SpanKind(models.TextChoices):
+        LLM = 'llm', 'LLM'
+        SUMMARY = 'summary', 'Context summary'
+        TOOL = 'tool', 'Tool'
+
+    action = models.ForeignKey(AgentAction, on_delete=models.CASCADE, related_name='spans')
+    kind = models.CharField(max_length=10, choices=SpanKind.choices)
+    name = models.CharField(max_length=100)
+    duration_ms = models.FloatField()
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    completion_tokens = models.PositiveIntegerField(default=0)
+    error = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['kind', 'name', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.action_id} {self.kind}:{self.name} {self.duration_ms:.1f}ms"
+
+
+class AgentTurnLease(models.Model):
+    """Cross-process lock held by the process running an agent's current turn"""
+    agent = models.OneToOneField(Agent, on_delete=models.CASCADE, primary_key=True, related_name='turn_lease')
+    owner = models.CharField(max_length=64)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Turn lease for agent {self.agent_id} until {self.expires_at}"
+
+
+class AgentJob(TimeStampedModel):
+    """Chat or task request queued for the background worker pool"""
+    class JobType(models.TextChoices):
+        CHAT = 'chat', 'Chat'
+        TASK = 'task', 'Task'
+
+    class JobStatus(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    agent = models.ForeignKey(Agent, on_delete=models.CASCADE, related_name='jobs')
+    job_type = models.CharField(max_length=10, choices=JobType.choices)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.QUEUED)
+    result = models.JSONField(null=True, blank=True)
+    error_message = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    worker_id = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True, help_text='Lease renewed by the worker running the job')
+    wallet_written_at = models.DateTimeField(
+        null=True, blank=True, help_text='First state-changing tool call; such a job is never run again'
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['agent', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.agent_id} - {self.job_type} job {self.id} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.JobStatus.COMPLETED, self.JobStatus.FAILED)
+
+
+class AutoChatSession(TimeStampedModel):
+    """Autonomous chat loop of an agent, run by the auto-chat scheduler"""
+    class SessionStatus(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        STOPPED = 'stopped', 'Stopped'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    agent = models.ForeignKey(Agent, on_delete=models.CASCADE, related_name='auto_chat_sessions')
+    action = models.OneToOneField(
+        AgentAction, on_delete=models.SET_NULL, null=True, blank=True, related_name='auto_chat_session',
+        help_text='Action whose event log holds the session output'
+    )
+    message = models.TextField()
+    interval = models.PositiveIntegerField(default=10)
+    strategy = models.CharField(max_length=50, blank=True)
+    strategy_config = models.JSONField(default=dict, blank=True, help_text="Validated against the strategy's config schema")
+    conversation_id = models.UUIDField(default=uuid.uuid4)
+    status = models.CharField(max_length=20, choices=SessionStatus.choices, default=SessionStatus.ACTIVE)
+    iterations = models.PositiveIntegerField(default=0)
+    strategy_state = models.JSONField(
+        default=dict, blank=True, help_text='Strategy snapshot restored when another scheduler takes the session over'
+    )
+    error_message = models.TextField(blank=True)
+    scheduler_id = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True, help_text='Lease renewed by the scheduler running the session')
+    started_at = models.DateTimeField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'locked_until']),
+            models.Index(fields=['agent', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.agent_id} - auto-chat session {self.id} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status != self.SessionStatus.ACTIVE
+
+
 class AgentWallet(TimeStampedModel):
     """Model for managing agent wallet configurations"""
     agent = models.OneToOneField(Agent, on_delete=models.CASCADE, related_name='wallet')
@@ -88,6 +268,10 @@ class AgentWallet(TimeStampedModel):
     address = models.CharField(max_length=255)
     configuration = models.JSONField(default=dict)
     is_active = models.BooleanField(default=True)
+    state_version = models.PositiveIntegerField(
+        default=0,
+        help_text='Incremented whenever a tool that changes wallet state runs'
+    )
 
     class Meta:
         ordering = ['-created_at']
@@ -125,7 +309,7 @@ class PriceCache(TimeStampedModel):
             models.Index(fields=['expires_at'])
         ]
 
-class ChatMessage(TimeStampedModel):
+class ChatMessage(TurnMetricsModel, TimeStampedModel):
     """Model for storing chat messages between users and agents"""
     class MessageType(models.TextChoices):
         HUMAN = 'human', 'Human'
@@ -145,8 +329,74 @@ class ChatMessage(TimeStampedModel):
         indexes = [
             models.Index(fields=['agent', 'conversation_id']),
             models.Index(fields=['conversation_id']),
-            models.Index(fields=['created_at'])
+            models.Index(fields=['created_at']),
+            models.Index(fields=['agent', 'message_type', 'created_at'])
+        ]
+
+    def __str__(self):
+        return f"{self.agent.name} - {self.message_type} ({self.created_at})"
+
+class ConversationCheckpoint(TimeStampedModel):
+    """LangGraph checkpoint for one step of a conversation thread"""
+    thread_id = models.CharField(max_length=255)
+    checkpoint_ns = models.CharField(max_length=255, blank=True, default='')
+    checkpoint_id = models.CharField(max_length=64)
+    parent_checkpoint_id = models.CharField(max_length=64, null=True, blank=True)
+    checkpoint_type = models.CharField(max_length=32)
+    checkpoint = models.BinaryField(help_text='Serialized checkpoint without channel values')
+    metadata_type = models.CharField(max_length=32)
+    metadata = models.BinaryField()
+    compressed = models.BooleanField(default=False)
+    metadata_compressed = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['thread_id', 'checkpoint_ns', 'checkpoint_id'],
+                name='unique_conversation_checkpoint'
+            )
         ]
 
     def __str__(self):
-        return f"{self.agent.name} - {self.message_type} ({self.created_at})"
\ No newline at end of file
+        return f"{self.thread_id} - {self.checkpoint_id}"
+
+
+class CheckpointBlob(TimeStampedModel):
+    """Channel value referenced by checkpoints, stored once per channel version"""
+    thread_id = models.CharField(max_length=255)
+    checkpoint_ns = models.CharField(max_length=255, blank=True, default='')
+    channel = models.CharField(max_length=255)
+    version = models.CharField(max_length=64)
+    value_type = models.CharField(max_length=32)
+    value = models.BinaryField(null=True)
+    compressed = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['thread_id', 'checkpoint_ns', 'channel', 'version'],
+                name='unique_checkpoint_blob'
+            )
+        ]
+
+
+class CheckpointWrite(TimeStampedModel):
+    """Pending write recorded by a task against a checkpoint"""
+    thread_id = models.CharField(max_length=255)
+    checkpoint_ns = models.CharField(max_length=255, blank=True, default='')
+    checkpoint_id = models.CharField(max_length=64)
+    task_id = models.CharField(max_length=255)
+    task_path = models.CharField(max_length=255, blank=True, default='')
+    idx = models.IntegerField()
+    channel = models.CharField(max_length=255)
+    value_type = models.CharField(max_length=32)
+    value = models.BinaryField(null=True)
+    compressed = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'],
+                name='unique_checkpoint_write'
+            )
+        ]
@@ -2,7 +2,7 @@
 Serializers for the agents app
 """
 from rest_framework import serializers
-from .models import Agent, AgentAction, AgentWallet, ChatMessage
+from .models import Agent, AgentAction, AgentJob, AgentWallet, AutoChatSession, ChatMessage
 
 
 class AgentWalletSerializer(serializers.ModelSerializer):
@@ -19,12 +19,42 @@ class AgentActionSerializer(serializers.ModelSerializer):
     """
     Serializer for agent actions
     """
+    result = serializers.SerializerMethodField()
+
     class Meta:
         model = AgentAction
         fields = ['id', 'agent', 'action_type', 'parameters', 'result', 
-                 'status', 'error_message', 'created_at']
+                 'status', 'error_message', 'latency_ms', 'llm_ms', 'tool_ms',
+                 'persistence_ms', 'prompt_tokens', 'completion_tokens', 'unrouted_prompt_tokens',
+                 'routing_ms', 'model', 'escalated', 'created_at']
         read_only_fields = ['result', 'status', 'error_message']
 
+    def get_result(self, obj):
+        """Expose streamed events under 'responses' as before"""
+        return obj.rebuild_result()
+
+
+class AgentJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for queued chat and task jobs
+    """
+    class Meta:
+        model = AgentJob
+        fields = ['id', 'agent', 'job_type', 'payload', 'status', 'result', 'error_message',
+                 'attempts', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+
+class AutoChatSessionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for scheduled auto-chat sessions
+    """
+    class Meta:
+        model = AutoChatSession
+        fields = ['id', 'agent', 'action', 'message', 'interval', 'strategy', 'strategy_config', 'conversation_id', 'status',
+                 'iterations', 'error_message', 'created_at', 'started_at', 'last_run_at', 'finished_at']
+        read_only_fields = fields
+
 
 class ChatMessageSerializer(serializers.ModelSerializer):
     """
@@ -42,8 +72,8 @@ class AgentSerializer(serializers.ModelSerializer):
     Serializer for agents
     """
     wallet = AgentWalletSerializer(read_only=True)
-    recent_actions = AgentActionSerializer(many=True, read_only=True, source='actions')
-    recent_messages = ChatMessageSerializer(many=True, read_only=True, source='chat_messages')
+    recent_actions = serializers.SerializerMethodField()
+    recent_messages = serializers.SerializerMethodField()
 
     class Meta:
         model = Agent
@@ -51,11 +81,25 @@ class AgentSerializer(serializers.ModelSerializer):
                  'wallet_address', 'wallet', 'recent_actions', 'recent_messages', 'created_at']
         read_only_fields = ['wallet_address']
 
-    def to_representation(self, instance):
-        """
-        Limit the number of recent actions and messages shown
-        """
-        data = super().to_representation(instance)
-        data['recent_actions'] = data['recent_actions'][:5]  # Only show 5 most recent actions
-        data['recent_messages'] = data['recent_messages'][:10]  # Show 10 most recent messages
-        return data
\ No newline at end of file
+    def validate_configuration(self, value):
+        """Reject a tool allow-list naming unknown tools, which would leave the agent without tools"""
+        from .actions import ALL_ACTIONS
+
+        allowlist = (value or {}).get('tool_allowlist')
+        if allowlist is None:
+            return value
+        if not isinstance(allowlist, list) or not all(isinstance(name, str) for name in allowlist):
+            raise serializers.ValidationError("tool_allowlist must be a list of tool names")
+        unknown = sorted(set(allowlist) - {action.name for action in ALL_ACTIONS})
+        if unknown:
+            raise serializers.ValidationError(f"Unknown tools in tool_allowlist: {', '.join(unknown)}")
+        return value
+
+    def get_recent_actions(self, obj):
+        """The 5 most recent actions, with their events in one query"""
+        actions = obj.actions.prefetch_related('events')[:5]
+        return AgentActionSerializer(actions, many=True).data
+
+    def get_recent_messages(self, obj):
+        """The agent's first 10 messages in ChatMessage ordering"""
+        return ChatMessageSerializer(obj.chat_messages.all()[:10], many=True).data
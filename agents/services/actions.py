@@ -1,13 +1,16 @@
 """
 Action-related services for agents.
 """
+from contextlib import nullcontext
 from typing import Dict, Any, List, Optional
+from django.conf import settings
 from django.db import transaction
 from core.exceptions import AgentConfigurationError
 from cdp_agentkit_core.actions import CDP_ACTIONS
 from cdp_langchain.agent_toolkits import CdpToolkit
 from cdp_langchain.utils import CdpAgentkitWrapper
 from ..models import AgentAction
+from ..toolkits import ToolConcurrency
 from .base import BaseAgentService
 import logging
 
@@ -71,8 +74,10 @@ class ActionService(BaseAgentService):
         )
 
         try:
-            # Execute the action
-            result = tool.run(parameters)
+            # Execute the action; state-changing actions run one at a time per wallet
+            read_only = action_type in getattr(settings, 'AGENT_READ_ONLY_TOOLS', [])
+            with nullcontext() if read_only else ToolConcurrency().wallet_lock(self.agent.id):
+                result = tool.run(parameters)
             
             # Update action record with success
             action.status = 'completed'
@@ -2,14 +2,25 @@
 Auto-chat strategy system.
 """
 from .base import AutoChatStrategy
-from .trading import TradingStrategy
-from .creative import CreativeStrategy
-
-# Register available strategies
-AVAILABLE_STRATEGIES = {
-    'trading': TradingStrategy,
-    'creative': CreativeStrategy,
-    'default': AutoChatStrategy
+from .registry import StrategyRegistry
+from .schemas import StrategyConfig
+
+# Registered strategies by name; each is imported the first time a session uses it
+AVAILABLE_STRATEGIES = StrategyRegistry()
+
+_LAZY = {
+    'TradingStrategy': 'trading',
+    'CreativeStrategy': 'creative',
 }
 
-__all__ = ['AutoChatStrategy', 'TradingStrategy', 'CreativeStrategy', 'AVAILABLE_STRATEGIES']
+
+def __getattr__(name):
+    if name in _LAZY:
+        return AVAILABLE_STRATEGIES.get(_LAZY[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    'AutoChatStrategy', 'TradingStrategy', 'CreativeStrategy', 'AVAILABLE_STRATEGIES',
+    'StrategyRegistry', 'StrategyConfig',
+]
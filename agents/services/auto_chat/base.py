@@ -4,19 +4,27 @@ Base auto-chat strategy.
 from typing import Dict, Any, Optional, Generator
 from abc import ABC, abstractmethod
 import logging
+from django.conf import settings
+from ..telemetry import ToolInvocations
+from .context import HistoryBuffer, HistoryEntry
+from .schemas import StrategyConfig
 
 logger = logging.getLogger(__name__)
 
 class AutoChatStrategy(ABC):
     """Base class for auto-chat strategies."""
+    config_schema = StrategyConfig
     
-    def __init__(self, agent, interval: int = 30):
+    def __init__(self, agent, interval: int = 30, config: Optional[StrategyConfig] = None):
         """Initialize the strategy."""
         self.agent = agent
         self.interval = interval
+        self.config = config if config is not None else self.config_schema.model_construct(interval=interval)
         self._stop = False
+        self.tools = ToolInvocations()
+        # Newest iterations only; a long-running strategy must not grow with its runtime
+        self.history = HistoryBuffer(getattr(settings, 'AGENT_AUTO_CHAT_HISTORY_SIZE', 50))
         self.context = {
-            'conversation_history': [],
             'iteration_count': 0,
             'last_message_id': None,
             'current_conversation_id': None
@@ -34,10 +42,18 @@ class AutoChatStrategy(ABC):
             "Choose an action or set of actions and execute it that highlights your abilities."
         )
         
+    def observe_tools(self, tools: ToolInvocations):
+        """Receive the tool calls of the last turn, with their arguments and decoded results, before process_response."""
+        self.tools = tools
+
     def process_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Process the response from the agent."""
         return response
         
+    def should_wake(self) -> bool:
+        """Check if this tick should run an iteration; event-driven strategies stay idle until triggered."""
+        return True
+
     def should_continue(self) -> bool:
         """Check if the strategy should continue running."""
         return not self._stop
@@ -53,3 +69,24 @@ class AutoChatStrategy(ABC):
     def update_context(self, data: Dict[str, Any]):
         """Update strategy context."""
         self.context.update(data)
+
+    def remember(self, note: str = ''):
+        """Add the iteration just processed to the history."""
+        self.history.append(HistoryEntry(
+            self.context.get('iteration_count', 0),
+            self.context.get('last_message_id'),
+            tools=(invocation.name for invocation in self.tools),
+            note=note
+        ))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Compact JSON state to persist, so restore() can resume the strategy after a restart."""
+        return {
+            'iteration_count': self.context.get('iteration_count', 0),
+            'history': self.history.snapshot()
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        """Resume from a snapshot()."""
+        self.context['iteration_count'] = state.get('iteration_count', 0)
+        self.history.restore(state.get('history') or {})
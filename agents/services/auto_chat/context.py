@@ -0,0 +1,170 @@
+"""
+Bounded state auto-chat strategies keep between iterations.
+"""
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class HistoryEntry:
+    """One iteration as a strategy remembers it; the reply itself is the ChatMessage under parent_id"""
+    __slots__ = ('iteration', 'parent_id', 'timestamp', 'tools', 'note')
+
+    def __init__(
+        self,
+        iteration: int,
+        parent_id: Any = None,
+        timestamp: Optional[float] = None,
+        tools: Iterable[str] = (),
+        note: str = '',
+    ):
+        self.iteration = iteration
+        self.parent_id = parent_id
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.tools = tuple(tools)
+        self.note = note
+
+    def as_list(self) -> List[Any]:
+        parent_id = self.parent_id if self.parent_id is None or isinstance(self.parent_id, int) else str(self.parent_id)
+        return [self.iteration, parent_id, self.timestamp, list(self.tools), self.note]
+
+    @classmethod
+    def from_list(cls, values: List[Any]) -> "HistoryEntry":
+        iteration, parent_id, timestamp, tools, note = values
+        return cls(iteration, parent_id, timestamp, tools, note)
+
+
+class HistoryBuffer:
+    """
+    The newest `size` HistoryEntry records in a fixed ring.
+
+    Appending to a full buffer overwrites the oldest record, so a strategy
+    running for days holds as much as one running for minutes; `total`
+    counts every record appended.
+    """
+    __slots__ = ('size', 'total', '_entries')
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self.total = 0
+        self._entries: List[Optional[HistoryEntry]] = [None] * self.size
+
+    def append(self, entry: HistoryEntry):
+        self._entries[self.total % self.size] = entry
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.size)
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        """Oldest first"""
+        for index in range(self.total - len(self), self.total):
+            yield self._entries[index % self.size]
+
+    def latest(self) -> Optional[HistoryEntry]:
+        return self._entries[(self.total - 1) % self.size] if self.total else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'total': self.total, 'entries': [entry.as_list() for entry in self]}
+
+    def restore(self, snapshot: Dict[str, Any]):
+        entries = (snapshot.get('entries') or [])[-self.size:]
+        self._entries = [None] * self.size
+        # Keep the ring positions the entries had, so total stays the count ever appended
+        self.total = max(snapshot.get('total', 0), len(entries)) - len(entries)
+        for values in entries:
+            self.append(HistoryEntry.from_list(values))
+
+
+class _PriceRing:
+    __slots__ = ('timestamps', 'prices', 'changes', 'count')
+
+    def __init__(self, size: int):
+        self.timestamps = array('d', bytes(8 * size))
+        self.prices = array('d', bytes(8 * size))
+        self.changes = array('d', bytes(8 * size))
+        self.count = 0
+
+
+class PriceSeries:
+    """
+    Recent USD prices of the tokens a strategy watches, as numeric rings.
+
+    Each token keeps its newest `size` samples of timestamp, price and 24h
+    change in preallocated double arrays rather than a quote dict per
+    sample.
+    """
+    __slots__ = ('size', '_rings')
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._rings: Dict[str, _PriceRing] = {}
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._rings
+
+    def __bool__(self) -> bool:
+        return bool(self._rings)
+
+    @property
+    def tokens(self) -> List[str]:
+        return list(self._rings)
+
+    def record(self, token_id: str, usd: float, change: float = 0.0, timestamp: Optional[float] = None):
+        ring = self._rings.get(token_id)
+        if ring is None:
+            ring = self._rings[token_id] = _PriceRing(self.size)
+        index = ring.count % self.size
+        ring.timestamps[index] = time.time() if timestamp is None else timestamp
+        ring.prices[index] = usd
+        ring.changes[index] = change or 0.0
+        ring.count += 1
+
+    def record_quotes(self, quotes: Dict[str, Dict[str, Any]], timestamp: Optional[float] = None):
+        """Record CoinGecko-style quotes ({token: {'usd': ..., 'usd_24h_change': ...}})"""
+        for token_id, quote in quotes.items():
+            if isinstance(quote, dict) and quote.get('usd') is not None:
+                self.record(token_id, float(quote['usd']), float(quote.get('usd_24h_change') or 0.0), timestamp)
+
+    def _indexes(self, ring: _PriceRing) -> range:
+        return range(max(0, ring.count - self.size), ring.count)
+
+    def latest(self, token_id: str) -> Optional[Tuple[float, float, float]]:
+        """(timestamp, usd, 24h change) of a token's newest sample"""
+        ring = self._rings.get(token_id)
+        if ring is None or not ring.count:
+            return None
+        index = (ring.count - 1) % self.size
+        return ring.timestamps[index], ring.prices[index], ring.changes[index]
+
+    def prices(self, token_id: str) -> List[float]:
+        """A token's stored prices, oldest first"""
+        ring = self._rings.get(token_id)
+        if ring is None:
+            return []
+        return [ring.prices[index % self.size] for index in self._indexes(ring)]
+
+    def quotes(self) -> Dict[str, Dict[str, float]]:
+        """Newest sample per token in the quote shape strategies format"""
+        quotes = {}
+        for token_id in self._rings:
+            _, usd, change = self.latest(token_id)
+            quotes[token_id] = {'usd': usd, 'usd_24h_change': change}
+        return quotes
+
+    def snapshot(self) -> Dict[str, List[List[float]]]:
+        snapshot = {}
+        for token_id, ring in self._rings.items():
+            indexes = [index % self.size for index in self._indexes(ring)]
+            snapshot[token_id] = [
+                [ring.timestamps[i] for i in indexes],
+                [ring.prices[i] for i in indexes],
+                [ring.changes[i] for i in indexes],
+            ]
+        return snapshot
+
+    def restore(self, snapshot: Dict[str, List[List[float]]]):
+        self._rings = {}
+        for token_id, (timestamps, prices, changes) in (snapshot or {}).items():
+            for timestamp, usd, change in list(zip(timestamps, prices, changes))[-self.size:]:
+                self.record(token_id, usd, change, timestamp)
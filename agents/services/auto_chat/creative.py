@@ -3,54 +3,45 @@ Creative auto-chat strategy for evolving conversations.
 """
 from typing import Dict, Any, Optional
 from .base import AutoChatStrategy
+from .schemas import CreativeConfig
 import logging
 
 logger = logging.getLogger(__name__)
 
 class CreativeStrategy(AutoChatStrategy):
     """Creative strategy for evolving autonomous conversations."""
+    config_schema = CreativeConfig
     
-    def __init__(self, agent, interval: int = 30):
+    def __init__(self, agent, interval: int = 30, config: Optional[CreativeConfig] = None):
         """Initialize the creative strategy."""
-        super().__init__(agent, interval)
+        super().__init__(agent, interval, config)
         self.context.update({
-            'conversation_history': [],
             'iteration_count': 0,
-            'max_iterations': 5,
+            'max_iterations': self.config.max_iterations,
             'original_message': None,
             'completed_actions': set()
         })
 
+    # Tool calls that complete each step of the creative run
+    TOOL_ACTIONS = {
+        'get_token_price': 'price_check',
+        'get_wallet_details': 'wallet_check',
+        'request_faucet_funds': 'wallet_check',
+        'search_web': 'web_search',
+        'deploy_token': 'token_deployment',
+    }
+
     def generate_message(self, context: Optional[Dict[str, Any]] = None) -> str:
-        """Generate the next message based on conversation history and original request."""
+        """Generate the next message based on the actions completed so far and the original request."""
         ctx = context or self.get_context()
         
         # Store original message on first iteration
-        if self.context['iteration_count'] == 0:
+        if not self.context.get('original_message'):
             self.context['original_message'] = ctx.get('original_message')
-            return self.context['original_message']
             
         self.context['iteration_count'] += 1
-        history = ctx.get('conversation_history', [])
         completed = ctx.get('completed_actions', set())
 
-        if not history:
-            return self.context['original_message']
-
-        # Analyze last response to track completed actions
-        last_response = history[-1]
-        last_content = last_response.get('content', '')
-        
-        # Track completed actions based on response content
-        if 'get_token_price' in last_content:
-            completed.add('price_check')
-        if 'wallet' in last_content:
-            completed.add('wallet_check')
-        if 'search_web' in last_content:
-            completed.add('web_search')
-        if 'deploy_token' in last_content:
-            completed.add('token_deployment')
-
         # Build follow-up prompt based on remaining actions
         remaining = []
         if 'price_check' not in completed:
@@ -82,18 +73,15 @@ class CreativeStrategy(AutoChatStrategy):
                     if original_msg:
                         self.context['original_message'] = original_msg
 
-                # Process messages
-                messages = response.get('messages', [])
-                if not messages and isinstance(response.get('response'), dict):
-                    messages = response['response'].get('messages', [])
-                
-                if messages:
-                    # Store the last AI message
-                    last_message = messages[-1]
-                    history = self.context.get('conversation_history', [])
-                    history.append(last_message)
-                    self.update_context({'conversation_history': history})
-                    response['conversation_history'] = history
+                # Track completed actions from the tools that ran this turn
+                completed = self.context['completed_actions']
+                for invocation in self.tools:
+                    action = self.TOOL_ACTIONS.get(invocation.name)
+                    if action and invocation.ok:
+                        completed.add(action)
+
+                self.remember()
+                response['completed_actions'] = sorted(completed)
                     
             return response
             
@@ -104,6 +92,20 @@ class CreativeStrategy(AutoChatStrategy):
                 "original_response": response
             }
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Persisted state, with the actions completed so far."""
+        return {
+            **super().snapshot(),
+            'original_message': self.context.get('original_message'),
+            'completed_actions': sorted(self.context['completed_actions'])
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        """Resume from a snapshot()."""
+        super().restore(state)
+        self.context['original_message'] = state.get('original_message') or self.context.get('original_message')
+        self.context['completed_actions'] = set(state.get('completed_actions') or ())
+
     def should_continue(self) -> bool:
         """Determine if the conversation should continue."""
         return (
@@ -0,0 +1,6 @@
+"""
+Market data used by auto-chat strategies.
+"""
+from .price_fetcher import PriceFetcher
+
+__all__ = ['PriceFetcher']
@@ -0,0 +1,112 @@
+"""
+Stored token price feed (TokenPrice rows) filled from CoinGecko.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from ....models import TokenPrice
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _decimal(value) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(value))
+
+
+class PriceFetcher:
+    """
+    Writes token quotes to TokenPrice and reads them back.
+
+    The stored rows are the price feed strategies watch: one running feed
+    (`manage.py run_price_feed`) serves every agent, instead of each agent
+    asking CoinGecko through the LLM. Reads fall back to fetching when a
+    token's latest row is older than AGENT_PRICE_FEED_MAX_AGE seconds.
+    """
+
+    def __init__(self, tokens: Optional[Iterable[str]] = None):
+        self.tokens = list(tokens or getattr(settings, 'AGENT_PRICE_FEED_TOKENS', ['ethereum', 'bitcoin']))
+        self.max_age = getattr(settings, 'AGENT_PRICE_FEED_MAX_AGE', 300)
+
+    def _quote(self, tokens: List[str]) -> Dict[str, Dict[str, Any]]:
+        """CoinGecko simple price quotes for tokens"""
+        from ....actions.price_action import get_coingecko_client
+        return get_coingecko_client().get_price(
+            ids=','.join(tokens),
+            vs_currencies='usd,eth',
+            include_market_cap=True,
+            include_24hr_vol=True,
+            include_24hr_change=True,
+        ) or {}
+
+    def store(self, quotes: Dict[str, Dict[str, Any]], timestamp=None) -> List[TokenPrice]:
+        """Save CoinGecko-style quotes ({token: {'usd': ...}}) as TokenPrice rows"""
+        timestamp = timestamp or timezone.now()
+        rows = [
+            TokenPrice(
+                token_id=token_id,
+                price_usd=_decimal(quote['usd']),
+                price_eth=_decimal(quote.get('eth')),
+                market_cap_usd=_decimal(quote.get('usd_market_cap')),
+                volume_24h_usd=_decimal(quote.get('usd_24h_vol')),
+                change_24h=_decimal(round(quote['usd_24h_change'], 2)) if quote.get('usd_24h_change') is not None else None,
+                timestamp=timestamp,
+            )
+            for token_id, quote in quotes.items() if quote.get('usd') is not None
+        ]
+        return TokenPrice.objects.bulk_create(rows)
+
+    def fetch(self, tokens: Optional[List[str]] = None) -> List[TokenPrice]:
+        """Fetch current quotes and store them"""
+        return self.store(self._quote(tokens or self.tokens))
+
+    def latest(self) -> Dict[str, TokenPrice]:
+        """Newest stored row for each token that has one"""
+        latest = {}
+        for token_id in self.tokens:
+            row = TokenPrice.objects.filter(token_id=token_id).order_by('-timestamp').first()
+            if row is not None:
+                latest[token_id] = row
+        return latest
+
+    @staticmethod
+    def as_quote(row: TokenPrice) -> Dict[str, Any]:
+        """A row in the CoinGecko quote shape the strategies format"""
+        return {
+            'usd': float(row.price_usd),
+            'eth': float(row.price_eth) if row.price_eth is not None else None,
+            'usd_market_cap': float(row.market_cap_usd) if row.market_cap_usd is not None else None,
+            'usd_24h_vol': float(row.volume_24h_usd) if row.volume_24h_usd is not None else None,
+            'usd_24h_change': float(row.change_24h) if row.change_24h is not None else 0.0,
+            'last_updated_at': int(row.timestamp.timestamp()),
+        }
+
+    def get_latest_prices(self) -> Dict[str, Any]:
+        """Latest quote per token, fetching the ones missing or stale"""
+        try:
+            latest = self.latest()
+            cutoff = timezone.now() - timedelta(seconds=self.max_age)
+            stale = [token_id for token_id in self.tokens if token_id not in latest or latest[token_id].timestamp < cutoff]
+            if stale:
+                for row in self.fetch(stale):
+                    latest[row.token_id] = row
+            return {
+                "success": True,
+                "data": {token_id: self.as_quote(row) for token_id, row in latest.items()},
+                "timestamp": timezone.now().isoformat(),
+            }
+        except Exception as e:
+            logger.error(f"Failed to get latest prices: {str(e)}")
+            return {"success": False, "error": f"Failed to get latest prices: {str(e)}"}
+
+    def get_historical_prices(self, token_id: str, start_time=None, end_time=None) -> QuerySet:
+        """Stored rows of a token between start_time and end_time, oldest first"""
+        rows = TokenPrice.objects.filter(token_id=token_id)
+        if start_time is not None:
+            rows = rows.filter(timestamp__gte=start_time)
+        if end_time is not None:
+            rows = rows.filter(timestamp__lte=end_time)
+        return rows.order_by('timestamp')
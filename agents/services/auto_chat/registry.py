@@ -0,0 +1,149 @@
+"""
+Registry of auto-chat strategies, imported on first use.
+"""
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Dict, Iterator, List, Optional, Type
+from django.conf import settings
+from django.utils.module_loading import import_string
+from pydantic import ValidationError
+from core.exceptions import AgentConfigurationError
+from .base import AutoChatStrategy
+from .schemas import StrategyConfig
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Built-in strategies; schemas are named separately so validating a config imports no strategy
+DEFAULT_STRATEGIES = {
+    'default': {
+        'class': 'agents.services.auto_chat.base.AutoChatStrategy',
+        'config': 'agents.services.auto_chat.schemas.StrategyConfig',
+    },
+    'trading': {
+        'class': 'agents.services.auto_chat.trading.TradingStrategy',
+        'config': 'agents.services.auto_chat.schemas.TradingConfig',
+    },
+    'creative': {
+        'class': 'agents.services.auto_chat.creative.CreativeStrategy',
+        'config': 'agents.services.auto_chat.schemas.CreativeConfig',
+    },
+}
+
+
+class StrategyRegistry:
+    """
+    Auto-chat strategies by name, each imported the first time it is used.
+
+    Names come from DEFAULT_STRATEGIES, then the entry points of installed
+    packages in the AGENT_AUTO_CHAT_STRATEGY_ENTRY_POINTS group, then
+    AGENT_AUTO_CHAT_STRATEGIES, later sources overriding earlier ones and
+    None removing a name. An entry is the dotted path of a strategy class,
+    or a dict with that 'class' and optionally its 'config' schema, so a
+    heavy strategy costs nothing until a session runs it and validating
+    its config imports only the schema.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._specs = None
+                    instance._classes: Dict[str, Type[AutoChatStrategy]] = {}
+                    instance._schemas: Dict[str, Type[StrategyConfig]] = {}
+                    cls._instance = instance
+        return cls._instance
+
+    def _discover(self) -> Dict[str, Dict[str, Any]]:
+        specs = {name: dict(spec) for name, spec in DEFAULT_STRATEGIES.items()}
+        group = getattr(settings, 'AGENT_AUTO_CHAT_STRATEGY_ENTRY_POINTS', '')
+        if group:
+            for entry_point in entry_points(group=group):
+                specs[entry_point.name] = {'entry_point': entry_point}
+        for name, spec in getattr(settings, 'AGENT_AUTO_CHAT_STRATEGIES', {}).items():
+            if spec is None:
+                specs.pop(name, None)
+            else:
+                specs[name] = {'class': spec} if isinstance(spec, str) else dict(spec)
+        return specs
+
+    @property
+    def specs(self) -> Dict[str, Dict[str, Any]]:
+        if self._specs is None:
+            with self._lock:
+                if self._specs is None:
+                    self._specs = self._discover()
+        return self._specs
+
+    def reset(self):
+        """Forget discovered and loaded strategies, e.g. after the settings changed"""
+        with self._lock:
+            self._specs = None
+            self._classes.clear()
+            self._schemas.clear()
+
+    def names(self) -> List[str]:
+        return list(self.specs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def _spec(self, name: str) -> Dict[str, Any]:
+        spec = self.specs.get(name)
+        if spec is None:
+            raise AgentConfigurationError(f"Unknown auto-chat strategy: {name}")
+        return spec
+
+    def get(self, name: str) -> Type[AutoChatStrategy]:
+        """The strategy class, importing it on first use"""
+        strategy_class = self._classes.get(name)
+        if strategy_class is None:
+            spec = self._spec(name)
+            try:
+                strategy_class = spec['entry_point'].load() if 'entry_point' in spec else import_string(spec['class'])
+            except Exception as e:
+                raise AgentConfigurationError(f"Failed to load auto-chat strategy {name}: {str(e)}")
+            if not (isinstance(strategy_class, type) and issubclass(strategy_class, AutoChatStrategy)):
+                raise AgentConfigurationError(f"Auto-chat strategy {name} is not an AutoChatStrategy")
+            self._classes[name] = strategy_class
+            logger.info(f"Loaded auto-chat strategy {name}")
+        return strategy_class
+
+    __getitem__ = get
+
+    def config_schema(self, name: str) -> Type[StrategyConfig]:
+        """The strategy's config schema, without importing the strategy when the entry names one"""
+        schema = self._schemas.get(name)
+        if schema is None:
+            spec = self._spec(name)
+            try:
+                schema = import_string(spec['config']) if spec.get('config') else self.get(name).config_schema
+            except ImportError as e:
+                raise AgentConfigurationError(f"Failed to load config schema of auto-chat strategy {name}: {str(e)}")
+            self._schemas[name] = schema
+        return schema
+
+    def validate(self, name: str, config: Optional[Dict[str, Any]] = None, interval: Optional[int] = None) -> StrategyConfig:
+        """A session's strategy config, checked against the strategy's schema"""
+        if config is not None and not isinstance(config, dict):
+            raise AgentConfigurationError("Auto-chat strategy config must be an object")
+        config = dict(config or {})
+        if interval is not None:
+            config['interval'] = interval
+        try:
+            return self.config_schema(name).model_validate(config)
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'config'}: {error['msg']}" for error in e.errors()
+            )
+            raise AgentConfigurationError(f"Invalid {name} strategy config: {errors}")
+
+    def create(self, name: str, agent, interval: int, config: Optional[Dict[str, Any]] = None) -> AutoChatStrategy:
+        """A strategy instance for a session"""
+        return self.get(name)(agent, interval, self.validate(name, config, interval))
@@ -0,0 +1,26 @@
+"""
+Config schemas of the auto-chat strategies.
+
+Kept apart from the strategy modules so a web worker validates a session's
+config without importing the strategy (and whatever heavy libraries it uses).
+"""
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class StrategyConfig(BaseModel):
+    """Settings of one auto-chat session, validated before it starts"""
+    model_config = ConfigDict(extra='forbid')
+
+    interval: int = Field(10, ge=1, le=86400)
+    max_iterations: Optional[int] = Field(None, ge=1)
+
+
+class TradingConfig(StrategyConfig):
+    """Trading strategy settings"""
+    tokens: List[str] = Field(default_factory=lambda: ['ethereum', 'bitcoin'], min_length=1, max_length=20)
+
+
+class CreativeConfig(StrategyConfig):
+    """Creative strategy settings"""
+    max_iterations: int = Field(5, ge=1, le=50)
@@ -1,25 +1,53 @@
 from typing import Dict, Any, Optional
 from datetime import timedelta
+from django.conf import settings
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from .base import AutoChatStrategy
-import json
+from .context import PriceSeries
+from .schemas import TradingConfig
+from .triggers import PriceTrigger
 import logging
 
 logger = logging.getLogger(__name__)
 
 class TradingStrategy(AutoChatStrategy):
     """Trading strategy for auto-chat."""
+    config_schema = TradingConfig
     
-    def __init__(self, agent, interval: int = 30):
+    def __init__(self, agent, interval: int = 30, config: Optional[TradingConfig] = None):
         """Initialize the trading strategy."""
-        super().__init__(agent, interval)
+        super().__init__(agent, interval, config)
         self.context.update({
             'last_trade_check': None,
             'position': None,
-            'monitoring_tokens': ['ethereum', 'bitcoin'],
-            'last_parent_id': None
+            'monitoring_tokens': list(self.config.tokens),
+            'last_parent_id': None,
+            'trigger_reason': None
         })
-        
+        # Prices seen by this strategy, a fixed number of samples per token
+        self.prices = PriceSeries(getattr(settings, 'AGENT_AUTO_CHAT_PRICE_SAMPLES', 256))
+
+        # "price" mode runs only when the stored price feed triggers, "interval" on every tick
+        trigger_configuration = (getattr(agent, 'configuration', None) or {}).get('trading_trigger') or {}
+        mode = trigger_configuration.get('mode', getattr(settings, 'AGENT_TRADING_TRIGGER_MODE', 'interval'))
+        self.trigger = (
+            PriceTrigger.from_configuration(self.context['monitoring_tokens'], trigger_configuration)
+            if mode == 'price' else None
+        )
+
+    def should_wake(self) -> bool:
+        """In price mode, run only when a monitored token moved, volatility spiked or the idle time ran out."""
+        if self.trigger is None:
+            return True
+        reason = self.trigger.check()
+        if reason is None:
+            return False
+        logger.info(f"Trading strategy triggered: {reason}")
+        self.update_context({'trigger_reason': reason})
+        self.prices.record_quotes(self.trigger.latest)
+        return True
+
     def _format_price_data(self, price_data: Dict[str, Any]) -> str:
         """Format price data into a readable message."""
         result = []
@@ -30,13 +58,29 @@ class TradingStrategy(AutoChatStrategy):
                 f"{token_id.title()}: ${price_usd:,.2f} "
                 f"(24h change: {change_24h:+.2f}%)"
             )
-        return "\\n".join(result)
+        return "\n".join(result)
 
     def generate_message(self, context: Optional[Dict[str, Any]] = None) -> str:
         """Generate the next trading message based on market conditions."""
         ctx = context or self.get_context()
         token_list = ",".join(ctx.get('monitoring_tokens', ['ethereum', 'bitcoin']))
-        
+        self.context['iteration_count'] += 1
+
+        if ctx.get('trigger_reason'):
+            # Woken by the price feed: hand over what moved and the stored prices
+            latest = self._format_price_data(self.prices.quotes()) if self.prices else 'none stored yet'
+            return (
+                f"Market update: {ctx['trigger_reason']}.\n"
+                f"Latest stored prices:\n{latest}\n"
+                f"1. Check our wallet balance\n"
+                f"2. Use get_token_price only for tokens of {token_list} missing above\n"
+                f"3. Based on this move and our current position, decide to:\n"
+                f"   a. Enter a new position\n"
+                f"   b. Exit current position\n"
+                f"   c. Hold current position\n"
+                f"Explain your reasoning and execute any necessary actions."
+            )
+
         message = (
             f"Let's analyze our trading position and current market conditions.\\n"
             f"1. Check our wallet balance\\n"
@@ -49,28 +93,43 @@ class TradingStrategy(AutoChatStrategy):
         )
         return message
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Persisted state, with the price samples, position and trigger baseline."""
+        last_trade_check = self.context.get('last_trade_check')
+        return {
+            **super().snapshot(),
+            'prices': self.prices.snapshot(),
+            'position': self.context.get('position'),
+            'last_trade_check': last_trade_check.isoformat() if last_trade_check else None,
+            'reference': self.trigger.reference if self.trigger is not None else {}
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        """Resume from a snapshot()."""
+        super().restore(state)
+        self.prices.restore(state.get('prices'))
+        last_trade_check = state.get('last_trade_check')
+        self.update_context({
+            'position': state.get('position'),
+            'last_trade_check': parse_datetime(last_trade_check) if last_trade_check else None
+        })
+        if self.trigger is not None:
+            self.trigger.reference.update(state.get('reference') or {})
+
     def process_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Process the agent's response and track trading activity."""
         try:
             current_time = timezone.now()
             
-            # Extract messages
-            messages = response.get('messages', [])
-            if not messages and isinstance(response.get('response'), dict):
-                messages = response['response'].get('messages', [])
-            
-            # Process price data
+            # Price quotes from this turn's get_token_price calls, keyed by the token asked for
             price_data = {}
-            for msg in messages:
-                if msg.get('type') == 'tool' and 'get_token_price' in str(msg.get('content', '')):
-                    try:
-                        content = json.loads(msg['content'])
-                        if content.get('success') and content.get('data'):
-                            price_data.update(content['data'])
-                    except:
-                        continue
+            for invocation in self.tools.named('get_token_price'):
+                result = invocation.result
+                if invocation.ok and isinstance(result, dict) and result.get('data'):
+                    price_data[invocation.args.get('token_id', 'unknown')] = result['data']
             
             # Update context and response with price data
+            market_data = None
             if price_data:
                 formatted_prices = self._format_price_data(price_data)
                 market_data = {
@@ -78,48 +137,25 @@ class TradingStrategy(AutoChatStrategy):
                     'timestamp': current_time.isoformat(),
                     'formatted': formatted_prices
                 }
-                self.update_context({'market_data': market_data})
+                self.prices.record_quotes(price_data, current_time.timestamp())
                 response['market_data'] = market_data
             
-                # Track trade actions
-                for msg in messages:
-                    if msg.get('type') == 'tool' and 'trade' in str(msg.get('content', '')):
-                        try:
-                            trade_content = json.loads(msg['content'])
-                            if trade_content.get('success'):
-                                position = {
-                                    'action': 'trade',
-                                    'details': trade_content,
-                                    'timestamp': current_time.isoformat()
-                                }
-                                self.update_context({
-                                    'position': position,
-                                    'last_trade_check': current_time
-                                })
-                        except:
-                            continue
+            # Track trade actions
+            position = None
+            trade = self.tools.latest('trade')
+            if trade is not None and trade.ok:
+                position = {
+                    'action': 'trade',
+                    'details': {'args': trade.args, 'result': trade.result},
+                    'timestamp': current_time.isoformat()
+                }
+                self.update_context({
+                    'position': position,
+                    'last_trade_check': current_time
+                })
+                response['position_update'] = position
 
-                # Process and store messages
-                if messages:
-                    last_message = messages[-1]
-                    history = self.context.get('conversation_history', [])
-                    history.append({
-                        'message': last_message,
-                        'message_id': self.context.get('last_message_id'),
-                        'iteration': self.context['iteration_count'],
-                        'market_data': market_data if price_data else None,
-                        'position': position if 'position' in locals() else None
-                    })
-                    self.update_context({'conversation_history': history})
-                    
-                    # Update response with latest message only
-                    response = {
-                        'message': last_message,
-                        'iteration': self.context['iteration_count'],
-                        'conversation_id': self.context.get('current_conversation_id'),
-                        'market_data': market_data if price_data else None,
-                        'position_update': position if 'position' in locals() else None
-                    }
+            self.remember(self.context.get('trigger_reason') or '')
 
             return response
             
@@ -0,0 +1,122 @@
+"""
+Price triggers deciding when a trading iteration is worth an LLM call.
+"""
+import statistics
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from ...models import TokenPrice
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PriceTrigger:
+    """
+    Watches the stored price feed (TokenPrice) for a set of tokens.
+
+    check() names a reason to wake the LLM when a token moved at least
+    `move_threshold` percent from its price at the last wake, when the
+    standard deviation of its returns between stored samples over the
+    last `volatility_window` seconds rises to `volatility_threshold`
+    percent, or when `max_idle` seconds passed without waking. Otherwise
+    it returns None, and when no new rows were stored it costs a single
+    aggregate query.
+    """
+
+    def __init__(
+        self,
+        tokens: List[str],
+        move_threshold: float = 2.0,
+        volatility_threshold: float = 1.0,
+        volatility_window: int = 3600,
+        max_idle: int = 3600,
+    ):
+        self.tokens = list(tokens)
+        self.move_threshold = move_threshold
+        self.volatility_threshold = volatility_threshold
+        self.volatility_window = volatility_window
+        self.max_idle = max_idle
+        self.reference: Dict[str, float] = {}
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.volatile = set()
+        self.last_wake = None
+        self.last_seen = None
+
+    @classmethod
+    def from_configuration(cls, tokens: List[str], configuration: Optional[Dict[str, Any]] = None) -> "PriceTrigger":
+        """Trigger with an agent's `trading_trigger` configuration over the settings defaults"""
+        configuration = configuration or {}
+        return cls(
+            tokens,
+            move_threshold=float(configuration.get(
+                'move_threshold', getattr(settings, 'AGENT_TRADING_TRIGGER_MOVE_THRESHOLD', 2.0))),
+            volatility_threshold=float(configuration.get(
+                'volatility_threshold', getattr(settings, 'AGENT_TRADING_TRIGGER_VOLATILITY_THRESHOLD', 1.0))),
+            volatility_window=int(configuration.get(
+                'volatility_window', getattr(settings, 'AGENT_TRADING_TRIGGER_VOLATILITY_WINDOW', 3600))),
+            max_idle=int(configuration.get(
+                'max_idle', getattr(settings, 'AGENT_TRADING_TRIGGER_MAX_IDLE', 3600))),
+        )
+
+    def _series(self, now) -> Dict[str, List[TokenPrice]]:
+        """Stored rows per token over the volatility window, oldest first"""
+        series = defaultdict(list)
+        rows = TokenPrice.objects.filter(
+            token_id__in=self.tokens, timestamp__gte=now - timedelta(seconds=self.volatility_window)
+        ).order_by('timestamp')
+        for row in rows:
+            series[row.token_id].append(row)
+        return series
+
+    def _reasons(self, series: Dict[str, List[TokenPrice]]) -> List[str]:
+        reasons = []
+        for token_id, rows in series.items():
+            price = float(rows[-1].price_usd)
+            reference = self.reference.setdefault(token_id, price)
+            if reference and abs(price - reference) / reference * 100 >= self.move_threshold:
+                reasons.append(f"{token_id} moved {(price - reference) / reference * 100:+.2f}% since the last check")
+
+            prices = [float(row.price_usd) for row in rows]
+            returns = [(b - a) / a for a, b in zip(prices, prices[1:]) if a]
+            volatility = statistics.pstdev(returns) * 100 if len(returns) >= 2 else 0.0
+            # Only crossing the threshold wakes, not staying above it
+            if volatility >= self.volatility_threshold:
+                if token_id not in self.volatile:
+                    self.volatile.add(token_id)
+                    reasons.append(
+                        f"{token_id} volatility rose to {volatility:.2f}% over the last "
+                        f"{self.volatility_window // 60} minutes"
+                    )
+            else:
+                self.volatile.discard(token_id)
+        return reasons
+
+    def check(self, now=None) -> Optional[str]:
+        """Why the strategy should run now, or None to stay idle"""
+        from .data import PriceFetcher
+        now = now or timezone.now()
+        if self.last_wake is None:
+            # Armed by the session's first iteration
+            self.last_wake = now
+
+        reasons = []
+        newest = TokenPrice.objects.filter(token_id__in=self.tokens).aggregate(newest=Max('timestamp'))['newest']
+        if newest is not None and (self.last_seen is None or newest > self.last_seen):
+            self.last_seen = newest
+            series = self._series(now)
+            self.latest = {token_id: PriceFetcher.as_quote(rows[-1]) for token_id, rows in series.items()}
+            reasons = self._reasons(series)
+
+        idle = (now - self.last_wake).total_seconds()
+        if not reasons and idle >= self.max_idle:
+            reasons.append(f"no update for {int(idle // 60)} minutes")
+        if not reasons:
+            return None
+
+        self.last_wake = now
+        self.reference.update({token_id: quote['usd'] for token_id, quote in self.latest.items()})
+        return "; ".join(reasons)
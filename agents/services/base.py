@@ -20,8 +20,9 @@ class BaseAgentService:
         if not agent_model:
             raise AgentConfigurationError("Agent model is required")
             
-        # Include agentkit in cache key to ensure proper service separation
-        cache_key = (agent_model.id, id(agentkit) if agentkit else None)
+        # Include the service class and agentkit in the cache key so that e.g.
+        # ChatService and ActionService of one agent stay separate instances
+        cache_key = (cls, agent_model.id, id(agentkit) if agentkit else None)
         
         if cache_key in cls._instance_cache:
             instance = cls._instance_cache[cache_key]
@@ -1,31 +1,66 @@
 """
 Chat-related services for agents.
 """
-import asyncio
 import json
 import time
-from typing import Dict, Any, Optional, Generator, Union
+from typing import Dict, Any, List, Optional, Generator, AsyncGenerator, Sequence, Tuple, Union
 import uuid
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import tiktoken
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import F
+from core.event_loop import BackgroundEventLoop, run_sync
 from core.exceptions import AgentConfigurationError
 from cdp_langchain.utils import CdpAgentkitWrapper
 from langchain_core.messages import (
     HumanMessage, 
     AIMessage,
     ToolMessage,
+    SystemMessage,
     BaseMessage
 )
-from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.constants import TAG_NOSTREAM
 from langgraph.prebuilt import create_react_agent
-from ..models import AgentAction, ChatMessage
+from ..models import AgentAction, AgentWallet, ChatMessage
 from .base import BaseAgentService
+from .checkpoint import DjangoCheckpointSaver
+from .concurrency import AgentTurnController
+from .events import ActionEventLog
+from .fast_path import FastPathAnswer, IntentFastPath
+from .model_router import EscalatingChatModel, ModelChoice, ModelRouter
+from .response_cache import ResponseCache
+from .streaming import coalesce_tokens
+from .telemetry import TurnMetrics
+from .tool_router import ToolRouter, ToolSelection
 from .auto_chat import AVAILABLE_STRATEGIES
+from ..actions import ALL_ACTIONS
+from ..backends import chat_model
 from ..toolkits import CustomAgentToolkit
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_AGENT_MODEL = "gpt-4o-mini"
+
+AGENT_SYSTEM_PROMPT = (
+    "You are a helpful agent that can interact onchain using the Coinbase Developer Platform AgentKit. "
+    "You are empowered to interact onchain using your tools. If you ever need funds, you can request "
+    "them from the faucet if you are on network ID 'base-sepolia'. If not, you can provide your wallet "
+    "details and request funds from the user. Before executing your first action, get the wallet details "
+    "to see what network you're on. If there is a 5XX (internal) HTTP error code, ask the user to try "
+    "again later. If someone asks you to do something you can't do with your currently available tools, "
+    "you must say so, and encourage them to implement it themselves using the CDP SDK + Agentkit, "
+    "recommend they go to docs.cdp.coinbase.com for more information. Be concise and helpful with your "
+    "responses. Refrain from restating your tools' descriptions unless it is explicitly requested."
+)
+
 def serialize_langchain_message(msg: Union[Dict, BaseMessage, Any]) -> Dict[str, Any]:
     """Helper function to serialize LangChain messages"""
     if isinstance(msg, (HumanMessage, AIMessage, ToolMessage)):
@@ -81,61 +116,546 @@ def serialize_langchain_message(msg: Union[Dict, BaseMessage, Any]) -> Dict[str,
             return str(msg)
 
 
+@lru_cache(maxsize=None)
+def _get_encoding(model_name: Optional[str]):
+    """Load the tiktoken encoding for a model, or None if it is unavailable"""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name or "")
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, estimating token counts: {str(e)}")
+        return None
+
+
+class ConversationContext:
+    """
+    Fits a conversation thread into a token budget before each model call.
+
+    The most recent turns are kept verbatim. Older turns are folded into a
+    rolling summary cached per thread, so a summary is only regenerated once
+    the verbatim part outgrows the budget. Oversized tool outputs are
+    truncated. The checkpointed thread itself is never modified.
+    """
+
+    SUMMARY_PROMPT = (
+        "You maintain the running summary of a conversation between a user and an onchain agent. "
+        "Update the summary with the new messages. Keep wallet addresses, networks, token amounts, "
+        "transaction hashes, the user's goals and any unfinished tasks. Be concise."
+    )
+
+    # Keep summary tokens out of the user-facing token stream
+    SUMMARY_CONFIG = {"tags": [TAG_NOSTREAM]}
+
+    # Per-message overhead of the chat format, as counted by OpenAI
+    MESSAGE_OVERHEAD_TOKENS = 4
+
+    def __init__(
+        self,
+        llm,
+        system_prompt: str,
+        max_tokens: int = None,
+        tool_output_max_tokens: int = None,
+        summary_max_tokens: int = None,
+    ):
+        self.llm = llm
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens or getattr(settings, 'AGENT_CONTEXT_TOKEN_BUDGET', 8000)
+        self.tool_output_max_tokens = tool_output_max_tokens or getattr(
+            settings, 'AGENT_CONTEXT_TOOL_OUTPUT_MAX_TOKENS', 1000
+        )
+        self.summary_max_tokens = summary_max_tokens or getattr(settings, 'AGENT_CONTEXT_SUMMARY_MAX_TOKENS', 500)
+        self.summary_timeout = getattr(settings, 'AGENT_CONTEXT_SUMMARY_TIMEOUT', 7 * 24 * 3600)
+        self._encoding = _get_encoding(getattr(llm, 'model_name', None))
+        self._system_tokens = self.count_tokens(self.system_prompt) + self.MESSAGE_OVERHEAD_TOKENS
+
+    @staticmethod
+    def _text(msg: BaseMessage) -> str:
+        """Plain text content of a message"""
+        if isinstance(msg.content, str):
+            return msg.content
+        return "".join(
+            part if isinstance(part, str) else str(part.get("text", ""))
+            for part in msg.content
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens in a string"""
+        if self._encoding is None:
+            return len(text) // 4 + 1
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def message_tokens(self, msg: BaseMessage) -> int:
+        """Count the tokens a message adds to the prompt"""
+        tokens = self.count_tokens(self._text(msg)) + self.MESSAGE_OVERHEAD_TOKENS
+        for call in getattr(msg, 'tool_calls', None) or []:
+            tokens += self.count_tokens(call.get("name", "") + json.dumps(call.get("args", {})))
+        return tokens
+
+    def _truncate(self, text: str, limit: int) -> str:
+        """Cut text down to `limit` tokens, noting how much was dropped"""
+        if self._encoding is None:
+            if len(text) <= limit * 4:
+                return text
+            return f"{text[:limit * 4]}\n... [truncated {(len(text) - limit * 4) // 4} tokens]"
+
+        tokens = self._encoding.encode(text, disallowed_special=())
+        if len(tokens) <= limit:
+            return text
+        return f"{self._encoding.decode(tokens[:limit])}\n... [truncated {len(tokens) - limit} tokens]"
+
+    def _cap_tool_outputs(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """Truncate tool outputs longer than the per-output limit"""
+        capped = []
+        for msg in messages:
+            if isinstance(msg, ToolMessage):
+                text = self._text(msg)
+                truncated = self._truncate(text, self.tool_output_max_tokens)
+                if truncated is not text:
+                    msg = msg.model_copy(update={"content": truncated})
+            capped.append(msg)
+        return capped
+
+    @staticmethod
+    def _cache_key(config: Optional[RunnableConfig]) -> Optional[str]:
+        thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+        return f"agent-context-summary:{thread_id}" if thread_id else None
+
+    @staticmethod
+    def _resume(entry: Optional[Dict[str, Any]], messages: List[BaseMessage]) -> Tuple[Optional[str], int]:
+        """Return the cached summary and fold point if they still match the thread"""
+        if not entry:
+            return None, 0
+        folded = entry["folded"]
+        if 0 < folded <= len(messages) and messages[folded - 1].id == entry["last_id"]:
+            return entry["summary"], folded
+        return None, 0
+
+    def _fold_point(self, messages: List[BaseMessage], start: int, counts: List[int]) -> int:
+        """
+        Pick the first turn to keep verbatim.
+
+        Folds down to half the available budget so the summary is reused
+        for the next few turns instead of being regenerated on every one.
+        """
+        target = (self.max_tokens - self._system_tokens - self.summary_max_tokens) // 2
+        turn_starts = [i for i in range(start + 1, len(messages)) if isinstance(messages[i], HumanMessage)]
+        if not turn_starts:
+            return start
+
+        kept = sum(counts)
+        position = start
+        for turn_start in turn_starts:
+            kept -= sum(counts[position - start:turn_start - start])
+            position = turn_start
+            if kept <= target:
+                break
+        return position
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+        """Split messages into batches small enough to summarize in one call"""
+        chunks, chunk, size = [], [], 0
+        limit = max(self.max_tokens - self.summary_max_tokens, self.tool_output_max_tokens)
+        for msg in messages:
+            tokens = self.message_tokens(msg)
+            if chunk and size + tokens > limit:
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(msg)
+            size += tokens
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _summary_request(self, summary: Optional[str], messages: List[BaseMessage]) -> List[BaseMessage]:
+        transcript = "\n".join(f"{msg.type}: {self._text(msg)}" for msg in messages)
+        return [
+            SystemMessage(content=self.SUMMARY_PROMPT),
+            HumanMessage(content=f"Current summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"),
+        ]
+
+    def _build(self, summary: Optional[str], messages: List[BaseMessage]) -> List[BaseMessage]:
+        """Assemble the prompt sent to the model"""
+        prompt = [SystemMessage(content=self.system_prompt)]
+        if summary:
+            prompt.append(SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+        return prompt + messages
+
+    def _plan(
+        self, messages: List[BaseMessage], entry: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[str], int, int, List[BaseMessage]]:
+        """
+        Decide which messages to fold into the summary.
+
+        Returns the current summary, the cached fold point, the new fold
+        point and the (tool-capped) messages after the cached fold point.
+        """
+        summary, start = self._resume(entry, messages)
+        recent = self._cap_tool_outputs(messages[start:])
+        counts = [self.message_tokens(msg) for msg in recent]
+
+        available = self.max_tokens - self._system_tokens
+        if summary:
+            available -= self.summary_max_tokens
+        if sum(counts) <= available:
+            return summary, start, start, recent
+
+        end = self._fold_point(messages, start, counts)
+        return summary, start, end, recent
+
+    @staticmethod
+    def _entry(messages: List[BaseMessage], folded: int, summary: str) -> Dict[str, Any]:
+        return {"folded": folded, "last_id": messages[folded - 1].id, "summary": summary}
+
+    def trim(self, state: Dict[str, Any], config: RunnableConfig) -> List[BaseMessage]:
+        """Return the messages to send to the model for this step"""
+        messages = state["messages"]
+        key = self._cache_key(config)
+        summary, start, end, recent = self._plan(messages, cache.get(key) if key else None)
+
+        if end > start:
+            try:
+                for chunk in self._chunks(recent[:end - start]):
+                    reply = self.llm.invoke(self._summary_request(summary, chunk), config=self.SUMMARY_CONFIG)
+                    summary = self._text(reply)
+                if key:
+                    cache.set(key, self._entry(messages, end, summary), self.summary_timeout)
+            except Exception as e:
+                logger.warning(f"Conversation summary failed, dropping older turns: {str(e)}")
+
+        return self._build(summary, recent[end - start:])
+
+    async def atrim(self, state: Dict[str, Any], config: RunnableConfig) -> List[BaseMessage]:
+        """Async version of trim"""
+        messages = state["messages"]
+        key = self._cache_key(config)
+        summary, start, end, recent = self._plan(messages, await cache.aget(key) if key else None)
+
+        if end > start:
+            try:
+                for chunk in self._chunks(recent[:end - start]):
+                    reply = await self.llm.ainvoke(self._summary_request(summary, chunk), config=self.SUMMARY_CONFIG)
+                    summary = self._text(reply)
+                if key:
+                    await cache.aset(key, self._entry(messages, end, summary), self.summary_timeout)
+            except Exception as e:
+                logger.warning(f"Conversation summary failed, dropping older turns: {str(e)}")
+
+        return self._build(summary, recent[end - start:])
+
+    @classmethod
+    def from_config(cls, llm, system_prompt: str, config: RunnableConfig) -> "ConversationContext":
+        """Build a context using the limits passed in config["configurable"]["context_limits"]"""
+        limits = ((config or {}).get("configurable") or {}).get("context_limits") or {}
+        return cls(llm, system_prompt, **limits)
+
+    @classmethod
+    def as_state_modifier(cls, llm, system_prompt: str) -> RunnableLambda:
+        """LangGraph state modifier applying each run's own context limits"""
+        def trim(state: Dict[str, Any], config: RunnableConfig) -> List[BaseMessage]:
+            return cls.from_config(llm, system_prompt, config).trim(state, config)
+
+        async def atrim(state: Dict[str, Any], config: RunnableConfig) -> List[BaseMessage]:
+            return await cls.from_config(llm, system_prompt, config).atrim(state, config)
+
+        return RunnableLambda(trim, afunc=atrim, name="ConversationContext")
+
+
+class AgentGraphRegistry:
+    """
+    Process-wide cache of compiled agent graphs.
+
+    Building the toolkit and compiling the ReAct graph is identical for
+    every agent except for the wallet, so one graph is built per model,
+    escalation model and toolset and shared. Each run binds its own wallet
+    and context limits through the run config (see ChatService._thread_config).
+    At most AGENT_GRAPH_CACHE_SIZE graphs are kept, least recently used
+    first out; async callers build missing graphs on a worker thread
+    through aget, so compiling never blocks the event loop.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._graphs = OrderedDict()
+                    instance._tool_tokens = {}
+                    # Serializes builds, so lookups never wait on a compile
+                    instance._build_lock = threading.Lock()
+                    instance.max_graphs = getattr(settings, 'AGENT_GRAPH_CACHE_SIZE', 64)
+                    cls._instance = instance
+        return cls._instance
+
+    @classmethod
+    def build(cls, model: str, actions: Sequence = ALL_ACTIONS, escalate_to: Optional[str] = None):
+        """Compile a new agent graph (uncached)"""
+        llm = chat_model(model)
+        toolkit = CustomAgentToolkit.from_actions(actions)
+        agent_tuple = create_react_agent(
+            # Move the turn to the stronger model once a tool call failed
+            EscalatingChatModel(llm, chat_model(escalate_to)) if escalate_to else llm,
+            tools=toolkit.get_tools(),
+            # Conversation state lives in the database, keyed per conversation
+            checkpointer=DjangoCheckpointSaver(),
+            # Fit the thread into the agent's token budget before each model call
+            state_modifier=ConversationContext.as_state_modifier(llm, AGENT_SYSTEM_PROMPT),
+        )
+        # Handle both tuple and direct return cases
+        return agent_tuple[0] if isinstance(agent_tuple, tuple) else agent_tuple
+
+    @staticmethod
+    def _key(model: str, actions: Sequence, escalate_to: Optional[str]) -> Tuple:
+        return model, escalate_to, tuple(action.name for action in actions)
+
+    def _cached(self, key: Tuple):
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is not None:
+                self._graphs.move_to_end(key)
+            return graph
+
+    def get(self, model: str = DEFAULT_AGENT_MODEL, actions: Sequence = ALL_ACTIONS, escalate_to: Optional[str] = None):
+        """Return the shared graph for a model, escalation model and toolset, building it once"""
+        key = self._key(model, actions, escalate_to)
+        graph = self._cached(key)
+        if graph is None:
+            with self._build_lock:
+                graph = self._cached(key)
+                if graph is None:
+                    logger.info(
+                        f"Compiling agent graph for model {model} with {len(actions)} tools"
+                        f"{f', escalating to {escalate_to}' if escalate_to else ''}"
+                    )
+                    graph = self.build(model, actions, escalate_to)
+                    with self._lock:
+                        self._graphs[key] = graph
+                        while len(self._graphs) > self.max_graphs:
+                            self._graphs.popitem(last=False)
+        return graph
+
+    async def aget(self, model: str = DEFAULT_AGENT_MODEL, actions: Sequence = ALL_ACTIONS, escalate_to: Optional[str] = None):
+        """Async version of get, compiling a missing graph off the event loop"""
+        graph = self._cached(self._key(model, actions, escalate_to))
+        if graph is None:
+            graph = await sync_to_async(self.get, thread_sensitive=False)(model, actions, escalate_to)
+        return graph
+
+    def tool_tokens(self, model: str = DEFAULT_AGENT_MODEL, actions: Sequence = ALL_ACTIONS) -> int:
+        """Prompt tokens the toolset's schemas add to every model call"""
+        with self._lock:
+            missing = [action for action in actions if (model, action.name) not in self._tool_tokens]
+        if missing:
+            # Encoded outside the lock, so graph lookups do not wait on it
+            encoding = _get_encoding(model)
+            counted = {}
+            for tool in CustomAgentToolkit.from_actions(missing).get_tools():
+                schema = json.dumps(convert_to_openai_tool(tool))
+                counted[(model, tool.name)] = (
+                    len(encoding.encode(schema, disallowed_special=())) if encoding else len(schema) // 4 + 1
+                )
+            with self._lock:
+                self._tool_tokens.update(counted)
+        with self._lock:
+            return sum(self._tool_tokens[(model, action.name)] for action in actions)
+
+
+class AutoChatRun:
+    """State an auto-chat loop carries from one iteration to the next"""
+
+    def __init__(self, strategy, message: str, interval: int, strategy_name: Optional[str], conversation_id, parent_msg: ChatMessage, action: AgentAction):
+        self.strategy = strategy
+        self.message = message
+        self.interval = interval
+        self.strategy_name = strategy_name
+        self.conversation_id = conversation_id
+        self.parent_msg = parent_msg
+        self.action = action
+        # Subscribers replay missed iterations from the newest events kept
+        self.events = ActionEventLog(action, retain=getattr(settings, 'AGENT_AUTO_CHAT_REPLAY_BUFFER', 500))
+        self.totals = TurnMetrics()
+        self.iterations = 0
+        self.finished = False
+
+
 class ChatService(BaseAgentService):
     """Service for managing agent chat functionality."""
     
     def __init__(self, agent_model, agentkit: Optional[CdpAgentkitWrapper] = None):
         """Initialize chat service"""
         super().__init__(agent_model, agentkit)
-        self._toolkit = None
-        self._llm = None
         self._agent_executor = None
-        self._config = None
-        self._strategy = None
 
     def _ensure_agent_initialized(self):
         """Ensure agent components are initialized"""
         if self._agent_executor is None:
             try:
-                # Initialize LLM if needed
-                if self._llm is None:
-                    self._llm = ChatOpenAI(model="gpt-4o-mini")
-
-                # Initialize toolkit if needed
-                if self._toolkit is None:
-                    if not self.agentkit:
-                        raise AgentConfigurationError("CDP Agentkit wrapper not initialized")
-                    self._toolkit = CustomAgentToolkit.from_cdp_agentkit_wrapper(self.agentkit)
-
-                # Initialize memory and config
-                memory = MemorySaver()
-                self._config = {"configurable": {"thread_id": f"Agent-{self.agent.id}-Chat"}}
-
-                # Create ReAct agent
-                agent_tuple = create_react_agent(
-                    self._llm,
-                    tools=self._toolkit.get_tools(),
-                    checkpointer=memory,
-                    state_modifier=(
-                        "You are a helpful agent that can interact onchain using the Coinbase Developer Platform AgentKit. "
-                        "You are empowered to interact onchain using your tools. If you ever need funds, you can request "
-                        "them from the faucet if you are on network ID 'base-sepolia'. If not, you can provide your wallet "
-                        "details and request funds from the user. Before executing your first action, get the wallet details "
-                        "to see what network you're on. If there is a 5XX (internal) HTTP error code, ask the user to try "
-                        "again later. If someone asks you to do something you can't do with your currently available tools, "
-                        "you must say so, and encourage them to implement it themselves using the CDP SDK + Agentkit, "
-                        "recommend they go to docs.cdp.coinbase.com for more information. Be concise and helpful with your "
-                        "responses. Refrain from restating your tools' descriptions unless it is explicitly requested."
-                    ),
-                )
-                
-                # Handle both tuple and direct return cases
-                self._agent_executor = agent_tuple[0] if isinstance(agent_tuple, tuple) else agent_tuple
+                # Tools are bound to this agent's wallet through the run config
+                if not self.agentkit:
+                    raise AgentConfigurationError("CDP Agentkit wrapper not initialized")
+
+                self._agent_executor = AgentGraphRegistry().get(DEFAULT_AGENT_MODEL)
+
+            except Exception as e:
+                self._log_error("Failed to initialize agent components", e)
+                raise AgentConfigurationError(f"Failed to initialize agent components: {str(e)}")
+
+    async def _aensure_agent_initialized(self):
+        """Async version of _ensure_agent_initialized, compiling the graph off the event loop"""
+        if self._agent_executor is None:
+            try:
+                if not self.agentkit:
+                    raise AgentConfigurationError("CDP Agentkit wrapper not initialized")
+
+                self._agent_executor = await AgentGraphRegistry().aget(DEFAULT_AGENT_MODEL)
 
             except Exception as e:
                 self._log_error("Failed to initialize agent components", e)
                 raise AgentConfigurationError(f"Failed to initialize agent components: {str(e)}")
 
+    def _context_limits(self) -> Dict[str, int]:
+        """Per-agent overrides of the conversation context limits"""
+        configuration = self.agent.configuration or {}
+        limits = {
+            'max_tokens': configuration.get('context_token_budget'),
+            'tool_output_max_tokens': configuration.get('context_tool_output_max_tokens'),
+            'summary_max_tokens': configuration.get('context_summary_max_tokens'),
+        }
+        return {key: value for key, value in limits.items() if value}
+
+    def _thread_config(self, conversation_id, metrics: Optional[TurnMetrics] = None) -> Dict[str, Any]:
+        """Build the LangGraph run config for a conversation thread"""
+        config = {
+            "configurable": {
+                "thread_id": f"Agent-{self.agent.id}-{conversation_id}",
+                "agent_id": self.agent.id,
+                "cdp_agentkit_wrapper": self.agentkit,
+                "wallet_key": self.agent.id,
+                "context_limits": self._context_limits(),
+                "on_wallet_write": self._on_wallet_write,
+                "turn_metrics": metrics,
+            }
+        }
+        if metrics is not None:
+            config["callbacks"] = [metrics]
+        return config
+
+    def _route(self, message: str, metrics: Optional[TurnMetrics] = None) -> Tuple[ToolSelection, ModelChoice]:
+        """The tools and model this message needs"""
+        started = time.perf_counter()
+        configuration = self.agent.configuration or {}
+        selection = ToolRouter().select(
+            message,
+            allowlist=configuration.get('tool_allowlist'),
+            routing=configuration.get('tool_routing', getattr(settings, 'AGENT_TOOL_ROUTING_ENABLED', True)),
+        )
+        choice = ModelRouter().choose(message, selection, configuration, self.agent.id)
+        routing_ms = (time.perf_counter() - started) * 1000
+
+        registry = AgentGraphRegistry()
+        if metrics is not None:
+            metrics.route(
+                choice.model,
+                routing_ms,
+                registry.tool_tokens(choice.model) - registry.tool_tokens(choice.model, selection.actions)
+            )
+        logger.debug(
+            f"Agent {self.agent.id} routed to {choice.model} {choice.reasons} with {len(selection.actions)} tools "
+            f"for intents {selection.intents}{' (fallback)' if selection.fallback else ''}"
+        )
+        return selection, choice
+
+    def _graph_for(
+        self,
+        message: str,
+        metrics: Optional[TurnMetrics] = None,
+        route: Optional[Tuple[ToolSelection, ModelChoice]] = None,
+    ):
+        """The shared graph with the model and tools this message needs"""
+        selection, choice = route or self._route(message, metrics)
+        return AgentGraphRegistry().get(choice.model, selection.actions, escalate_to=choice.escalate_to)
+
+    async def _agraph_for(self, message: str, metrics: Optional[TurnMetrics] = None):
+        """Async version of _graph_for, routing off the event loop"""
+        # Routing reads the failure counters from the cache and may count tool schema tokens
+        selection, choice = await sync_to_async(self._route, thread_sensitive=False)(message, metrics)
+        return await AgentGraphRegistry().aget(choice.model, selection.actions, escalate_to=choice.escalate_to)
+
+    async def _afast_path(self, message: str, config: RunnableConfig) -> Optional[FastPathAnswer]:
+        """Answer a simple request with one tool call and no LLM, if the fast path handles it"""
+        enabled = (self.agent.configuration or {}).get(
+            'fast_path', getattr(settings, 'AGENT_FAST_PATH_ENABLED', True)
+        )
+        if not enabled:
+            return None
+        allowed = ToolRouter().allowed((self.agent.configuration or {}).get('tool_allowlist'))
+        answer = await IntentFastPath().aanswer(message, config, {action.name for action in allowed})
+        if answer is not None:
+            metrics = TurnMetrics.from_config(config)
+            if metrics is not None:
+                metrics.route('fast_path', 0)
+            # Record the exchange in the thread like a normal turn
+            await self._agent_executor.aupdate_state(config, {"messages": answer.messages}, as_node="agent")
+        return answer
+
+    async def _updates(self, message: str, config: RunnableConfig, metrics: Optional[TurnMetrics] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Graph update chunks for a turn, from the fast path when it answers"""
+        answer = await self._afast_path(message, config)
+        if answer is not None:
+            for chunk in answer.updates():
+                yield chunk
+            return
+        graph = await self._agraph_for(message, metrics)
+        async for chunk in graph.astream(
+            {"messages": [HumanMessage(content=message)]},
+            config
+        ):
+            yield chunk
+
+    def _on_wallet_write(self, tool_name: str):
+        """Bump the wallet state version after a state-changing tool ran"""
+        AgentWallet.objects.filter(agent_id=self.agent.id).update(state_version=F('state_version') + 1)
+        logger.debug(f"Wallet state changed by {tool_name} for agent {self.agent.id}")
+
+    def _response_cache_key(self, message: str, route: Tuple[ToolSelection, ModelChoice]) -> Optional[str]:
+        """Cache key for a prompt answered with the routed model and tools, or None if the cache is off"""
+        enabled = (self.agent.configuration or {}).get(
+            'response_cache', getattr(settings, 'AGENT_RESPONSE_CACHE_ENABLED', False)
+        )
+        if not enabled:
+            return None
+
+        selection, choice = route
+        wallet_version = AgentWallet.objects.filter(agent_id=self.agent.id).values_list(
+            'state_version', flat=True
+        ).first() or 0
+        return ResponseCache.make_key(
+            self.agent.id,
+            message,
+            wallet_version,
+            [choice.model, choice.escalate_to or '', *selection.names]
+        )
+
+    @staticmethod
+    def _is_read_only_turn(result: Dict[str, Any]) -> bool:
+        """True if the last turn called tools and every one of them was read-only"""
+        messages = result.get("messages", []) if isinstance(result, dict) else []
+        turn_start = max(
+            (i for i, msg in enumerate(messages) if isinstance(msg, HumanMessage)),
+            default=0
+        )
+        tool_names = [
+            call["name"]
+            for msg in messages[turn_start:]
+            if isinstance(msg, AIMessage)
+            for call in msg.tool_calls
+        ]
+        read_only_tools = set(getattr(settings, 'AGENT_READ_ONLY_TOOLS', []))
+        return bool(tool_names) and all(name in read_only_tools for name in tool_names)
+
     def _process_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Process and format the response from the agent"""
         try:
@@ -158,266 +678,628 @@ class ChatService(BaseAgentService):
             logger.error(f"Error processing response: {str(e)}")
             return {"error": "Failed to process response"}
 
-    @transaction.atomic
+    def _coalesce_key(self, message: str, conversation_id: Optional[str]) -> Optional[tuple]:
+        """Key under which identical pending messages share one turn, if enabled"""
+        enabled = (self.agent.configuration or {}).get(
+            'coalesce_messages', getattr(settings, 'AGENT_TURN_COALESCE', False)
+        )
+        # Without a conversation each message starts its own thread, so nothing to share
+        if not enabled or not conversation_id:
+            return None
+        return (str(conversation_id), message.strip())
+
     def chat_sync(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Process a chat message synchronously, one turn at a time per agent"""
+        return AgentTurnController().run(
+            self.agent.id,
+            lambda: self._chat_sync(message, conversation_id),
+            coalesce_key=self._coalesce_key(message, conversation_id)
+        )
+
+    def _chat_sync(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
         """Process a chat message synchronously"""
         self._ensure_agent_initialized()
+        metrics = TurnMetrics()
         
-        # Create action record
-        action = AgentAction.objects.create(
-            agent=self.agent,
-            action_type="chat_message",
-            parameters={"message": message},
-            status="pending"
-        )
-        
-        # Create human message record
-        human_msg = ChatMessage.objects.create(
-            agent=self.agent,
-            message_type=ChatMessage.MessageType.HUMAN,
-            content=message,
-            conversation_id=conversation_id or uuid.uuid4()  # Create new conversation if none provided
-        )
+        with metrics.persisting():
+            # Create action record
+            action = AgentAction.objects.create(
+                agent=self.agent,
+                action_type="chat_message",
+                parameters={"message": message},
+                status="pending"
+            )
+            
+            # Create human message record
+            human_msg = ChatMessage.objects.create(
+                agent=self.agent,
+                message_type=ChatMessage.MessageType.HUMAN,
+                content=message,
+                conversation_id=conversation_id or uuid.uuid4()  # Create new conversation if none provided
+            )
 
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                # Run the agent
-                result = loop.run_until_complete(
-                    self._agent_executor.ainvoke(
+            config = self._thread_config(human_msg.conversation_id, metrics)
+            route = self._route(message, metrics)
+            graph = self._graph_for(message, route=route)
+            answer = run_sync(self._afast_path(message, config))
+            cache_key = None if answer else self._response_cache_key(message, route)
+            cached = ResponseCache().get(cache_key) if cache_key else None
+
+            if answer:
+                serialized_result = self._process_response({"messages": answer.messages})
+                metadata = {**serialized_result, "fast_path": answer.intent}
+            elif cached:
+                entry, age = cached
+                serialized_result = entry["result"]
+                metadata = {**serialized_result, "cache_hit": True, "cache_age": round(age, 3)}
+
+                # Keep the thread consistent so follow-up turns see this exchange
+                run_sync(
+                    graph.aupdate_state(
+                        config,
+                        {"messages": [
+                            HumanMessage(content=message),
+                            AIMessage(content=entry["answer"])
+                        ]},
+                        as_node="agent"
+                    )
+                )
+            else:
+                # Run the agent on the shared background loop
+                result = run_sync(
+                    graph.ainvoke(
                         {"messages": [HumanMessage(content=message)]},
-                        self._config
+                        config
                     )
                 )
-                
+
                 # Serialize and process the result
                 serialized_result = self._process_response(result)
-                
-                # Create AI message record
+                metadata = serialized_result
+
+                if cache_key and 'error' not in serialized_result and self._is_read_only_turn(result):
+                    ResponseCache().set(cache_key, {
+                        "result": serialized_result,
+                        "answer": result["messages"][-1].content
+                    })
+            
+            # Create AI message record
+            with metrics.persisting():
                 ChatMessage.objects.create(
                     agent=self.agent,
                     message_type=ChatMessage.MessageType.AI,
                     content=serialized_result.get('response', ''),
-                    metadata=serialized_result,
+                    metadata=metadata,
                     parent_message=human_msg,
-                    conversation_id=human_msg.conversation_id
+                    conversation_id=human_msg.conversation_id,
+                    **metrics.fields()
                 )
-                
-                # Update action record with success
-                action.status = "completed"
-                action.result = serialized_result
-                action.save()
-                
-                return serialized_result
-                
-            finally:
-                loop.close()
+            
+            # Update action record with success
+            action.status = "completed"
+            action.result = serialized_result
+            metrics.record(action)
+            
+            return serialized_result
                 
         except Exception as e:
             # Update action record with error
             action.status = "error"
             action.error_message = str(e)
-            action.save()
+            metrics.record(action)
             
             self._log_error("Chat failed", e)
             raise AgentConfigurationError(f"Chat processing error: {str(e)}")
 
-    @transaction.atomic
     def stream_chat_sync(self, message: str, conversation_id: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
+        """Stream chat responses synchronously, holding the agent's turn until the stream ends"""
+        with AgentTurnController().turn(self.agent.id):
+            yield from self._stream_chat_sync(message, conversation_id)
+
+    @transaction.atomic
+    def _stream_chat_sync(self, message: str, conversation_id: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
         """Stream chat responses synchronously"""
         self._ensure_agent_initialized()
+        metrics = TurnMetrics()
 
-        # Create action record
-        action = AgentAction.objects.create(
-            agent=self.agent,
-            action_type="chat_message",
-            parameters={"message": message},
-            status="pending",
-            result={"responses": []}
-        )
-        
-        # Create human message record
-        human_msg = ChatMessage.objects.create(
-            agent=self.agent,
-            message_type=ChatMessage.MessageType.HUMAN,
-            content=message,
-            conversation_id=conversation_id or uuid.uuid4()
-        )
+        with metrics.persisting():
+            # Create action record
+            action = AgentAction.objects.create(
+                agent=self.agent,
+                action_type="chat_message",
+                parameters={"message": message},
+                status="pending"
+            )
+            events = ActionEventLog(action)
+            
+            # Create human message record
+            human_msg = ChatMessage.objects.create(
+                agent=self.agent,
+                message_type=ChatMessage.MessageType.HUMAN,
+                content=message,
+                conversation_id=conversation_id or uuid.uuid4()
+            )
 
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # Create async generator
+            async def generate():
+                async for chunk in self._updates(
+                    message,
+                    self._thread_config(human_msg.conversation_id, metrics),
+                    metrics
+                ):
+                    # Serialize and process the chunk
+                    processed_chunk = self._process_response(chunk)
+                    if "error" not in processed_chunk:
+                        yield processed_chunk
             
-            try:
-                # Create async generator
-                async def generate():
-                    async for chunk in self._agent_executor.stream(
-                        {"messages": [HumanMessage(content=message)]},
-                        self._config
-                    ):
-                        # Serialize and process the chunk
-                        processed_chunk = self._process_response(chunk)
-                        if "error" not in processed_chunk:
-                            yield processed_chunk
-                
-                # Run the generator in the loop
-                gen = generate()
-                while True:
-                    try:
-                        chunk = loop.run_until_complete(gen.__anext__())
-                        # Update action record
-                        action.result["responses"].append(chunk)
-                        action.save()
-                        yield chunk
-                    except StopAsyncIteration:
-                        break
-
-                # Mark action as completed
-                action.status = "completed"
-                action.save()
-                
-            finally:
-                loop.close()
+            # Drive the generator on the shared background loop
+            for chunk in BackgroundEventLoop().iterate(generate()):
+                # Append to the action's event log
+                with metrics.persisting():
+                    events.append(chunk)
+                yield chunk
+
+            # Mark action as completed
+            with metrics.persisting():
+                events.flush()
+            action.status = "completed"
+            action.result = events.summary()
+            metrics.record(action)
                 
         except Exception as e:
             # Update action record with error
+            events.flush()
             action.status = "error"
+            action.result = events.summary()
             action.error_message = str(e)
-            action.save()
+            metrics.record(action)
             
             self._log_error("Chat stream failed", e)
             yield {"error": str(e)}
 
-    def stream_auto_chat(self, message: str, interval: int = 10, strategy_name: str = None, conversation_id: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
-        """Stream autonomous chat responses synchronously with interval"""
+        finally:
+            # Persist buffered events if the client disconnected mid-stream
+            events.flush()
+
+    async def _token_events(self, message: str, conversation_id, metrics: Optional[TurnMetrics] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield LLM tokens and tool results as they are produced"""
+        config = self._thread_config(conversation_id, metrics)
+        answer = await self._afast_path(message, config)
+        if answer is not None:
+            for event in answer.token_events():
+                yield event
+            return
+
+        graph = await self._agraph_for(message, metrics)
+        async for msg, metadata in graph.astream(
+            {"messages": [HumanMessage(content=message)]},
+            config,
+            stream_mode="messages"
+        ):
+            if isinstance(msg, ToolMessage):
+                yield {"type": "tool", "name": msg.name, "content": msg.content}
+            elif isinstance(msg, AIMessage) and isinstance(msg.content, str) and msg.content:
+                yield {"type": "token", "content": msg.content}
+
+    def _token_frames(self, message: str, conversation_id, metrics: Optional[TurnMetrics] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Token events coalesced into SSE-sized frames"""
+        return coalesce_tokens(self._token_events(message, conversation_id, metrics))
+
+    def stream_chat_tokens(self, message: str, conversation_id: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
+        """Stream the reply token by token, holding the agent's turn until the stream ends"""
+        with AgentTurnController().turn(self.agent.id):
+            yield from self._stream_chat_tokens(message, conversation_id)
+
+    def _stream_chat_tokens(self, message: str, conversation_id: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
+        """Stream the reply token by token, coalesced into small frames"""
         self._ensure_agent_initialized()
+        metrics = TurnMetrics()
 
-        try:
-            # Initialize strategy if specified
-            if strategy_name and strategy_name in AVAILABLE_STRATEGIES:
-                self._strategy = AVAILABLE_STRATEGIES[strategy_name](self.agent, interval)
-            elif not self._strategy:
-                self._strategy = AVAILABLE_STRATEGIES['default'](self.agent, interval)
-            
-            # Generate new conversation ID if not provided
-            conv_id = conversation_id or uuid.uuid4()
-
-            # Initialize strategy context
-            self._strategy.update_context({
-                'original_message': message,
-                'iteration_count': 0,
-                'current_conversation_id': conv_id,
-                'last_message_id': None
-            })
-            
-            # Create initial human message
+        with metrics.persisting():
+            # Create action record
+            action = AgentAction.objects.create(
+                agent=self.agent,
+                action_type="chat_message",
+                parameters={"message": message, "stream": "tokens"},
+                status="pending"
+            )
+
+            # Create human message record
             human_msg = ChatMessage.objects.create(
                 agent=self.agent,
                 message_type=ChatMessage.MessageType.HUMAN,
                 content=message,
-                conversation_id=conv_id,
-                metadata={'auto_chat': True, 'strategy': strategy_name}
+                conversation_id=conversation_id or uuid.uuid4()
             )
-            
-            action = AgentAction.objects.create(
+
+        try:
+            # Text after the last tool result is the final answer
+            answer_parts = []
+            frame_count = 0
+            for frame in BackgroundEventLoop().iterate(self._token_frames(message, human_msg.conversation_id, metrics)):
+                if frame["type"] == "tool":
+                    answer_parts = []
+                else:
+                    answer_parts.append(frame["content"])
+                frame_count += 1
+                yield frame
+
+            response = "".join(answer_parts)
+            with metrics.persisting():
+                ChatMessage.objects.create(
+                    agent=self.agent,
+                    message_type=ChatMessage.MessageType.AI,
+                    content=response,
+                    metadata={"response": response, "stream": "tokens"},
+                    parent_message=human_msg,
+                    conversation_id=human_msg.conversation_id,
+                    **metrics.fields()
+                )
+
+            action.status = "completed"
+            action.result = {"response": response, "frames": frame_count}
+            metrics.record(action)
+
+            yield {"type": "done", "response": response, "conversation_id": str(human_msg.conversation_id)}
+
+        except Exception as e:
+            # Update action record with error
+            action.status = "error"
+            action.error_message = str(e)
+            metrics.record(action)
+
+            self._log_error("Chat token stream failed", e)
+            yield {"error": str(e)}
+
+    async def achat(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of chat_sync, one turn at a time per agent"""
+        return await AgentTurnController().arun(
+            self.agent.id,
+            lambda: self._achat(message, conversation_id),
+            coalesce_key=self._coalesce_key(message, conversation_id)
+        )
+
+    async def _achat(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Process a chat message natively on the caller's event loop"""
+        await self._aensure_agent_initialized()
+        metrics = TurnMetrics()
+
+        with metrics.persisting():
+            # Create action record
+            action = await AgentAction.objects.acreate(
                 agent=self.agent,
-                action_type="auto_chat",
-                parameters={
-                    "message": message, 
-                    "interval": interval,
-                    "strategy": strategy_name
-                },
-                status="pending",
-                result={"responses": []}
+                action_type="chat_message",
+                parameters={"message": message},
+                status="pending"
             )
 
-            while True:
-                try:
-                    # Use the strategy's generate_message with context
-                    current_message = message if self._strategy.context['iteration_count'] == 0 else self._strategy.generate_message()
-                    
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    try:
-                        result = loop.run_until_complete(
-                            self._agent_executor.ainvoke(
-                                {"messages": [HumanMessage(content=current_message)]},
-                                self._config
-                            )
-                        )
-                        
-                        # Process and yield the result
-                        processed_result = self._process_response(result)
-                        
-                        # Process through strategy if available
-                        if self._strategy:
-                            processed_result = self._strategy.process_response(processed_result)
-                            
-                        # Create AI message for auto-chat response
-                        ai_msg = ChatMessage.objects.create(
-                            agent=self.agent,
-                            message_type=ChatMessage.MessageType.AI,
-                            content=processed_result.get('response', ''),
-                            metadata={
-                                **processed_result,
-                                'auto_chat': True,
-                                'strategy': strategy_name,
-                                'iteration': self._strategy.context.get('iteration_count', 0)
-                            },
-                            parent_message=ChatMessage.objects.get(id=self._strategy.context['last_message_id']) if self._strategy.context.get('last_message_id') else human_msg,
-                            conversation_id=conv_id
-                        )
-                        
-                        # Update last message id in context
-                        self._strategy.update_context({'last_message_id': ai_msg.id})
-                        
-                        # Only yield the latest message, not the entire history
-                        response_data = {
-                            'response': {
-                                'type': 'ai',
-                                'content': processed_result.get('response', ''),
-                                'metadata': {
-                                    'auto_chat': True,
-                                    'strategy': strategy_name,
-                                    'iteration': self._strategy.context.get('iteration_count', 0)
-                                },
-                                'conversation_id': str(conv_id)
-                            }
-                        }
-                        
-                        # Add to action history
-                        action.result["responses"].append(response_data)
-                        action.save()
-                        
-                        # Yield only the latest response
-                        yield response_data
-                        
-                        # Check if strategy wants to continue
-                        if self._strategy and not self._strategy.should_continue():
-                            break
-                        
-                    finally:
-                        loop.close()
-
-                    # Wait for the specified interval
-                    time.sleep(interval)
-                    
-                except Exception as e:
-                    logger.error(f"Auto-chat iteration failed: {str(e)}")
-                    yield {"error": f"Auto-chat iteration failed: {str(e)}"}
-                    break
-
-            # Mark action as completed after breaking from the loop
+            # Create human message record
+            human_msg = await ChatMessage.objects.acreate(
+                agent=self.agent,
+                message_type=ChatMessage.MessageType.HUMAN,
+                content=message,
+                conversation_id=conversation_id or uuid.uuid4()
+            )
+
+        try:
+            config = self._thread_config(human_msg.conversation_id, metrics)
+            answer = await self._afast_path(message, config)
+            if answer:
+                serialized_result = self._process_response({"messages": answer.messages})
+                metadata = {**serialized_result, "fast_path": answer.intent}
+            else:
+                graph = await self._agraph_for(message, metrics)
+                result = await graph.ainvoke(
+                    {"messages": [HumanMessage(content=message)]},
+                    config
+                )
+
+                # Serialize and process the result
+                serialized_result = self._process_response(result)
+                metadata = serialized_result
+
+            # Create AI message record
+            with metrics.persisting():
+                await ChatMessage.objects.acreate(
+                    agent=self.agent,
+                    message_type=ChatMessage.MessageType.AI,
+                    content=serialized_result.get('response', ''),
+                    metadata=metadata,
+                    parent_message=human_msg,
+                    conversation_id=human_msg.conversation_id,
+                    **metrics.fields()
+                )
+
+            # Update action record with success
             action.status = "completed"
-            action.save()
+            action.result = serialized_result
+            await metrics.arecord(action)
+
+            return serialized_result
 
         except Exception as e:
+            # Update action record with error
             action.status = "error"
             action.error_message = str(e)
-            action.save()
-            
-            self._log_error("Auto-chat failed", e)
+            await metrics.arecord(action)
+
+            self._log_error("Chat failed", e)
+            raise AgentConfigurationError(f"Chat processing error: {str(e)}")
+
+    async def astream_chat(self, message: str, conversation_id: Optional[str] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Async version of stream_chat_sync, holding the agent's turn until the stream ends"""
+        async with AgentTurnController().aturn(self.agent.id):
+            async for chunk in self._astream_chat(message, conversation_id):
+                yield chunk
+
+    async def _astream_chat(self, message: str, conversation_id: Optional[str] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream chat responses natively on the caller's event loop"""
+        await self._aensure_agent_initialized()
+        metrics = TurnMetrics()
+
+        with metrics.persisting():
+            # Create action record
+            action = await AgentAction.objects.acreate(
+                agent=self.agent,
+                action_type="chat_message",
+                parameters={"message": message},
+                status="pending"
+            )
+            events = ActionEventLog(action)
+
+            # Create human message record
+            human_msg = await ChatMessage.objects.acreate(
+                agent=self.agent,
+                message_type=ChatMessage.MessageType.HUMAN,
+                content=message,
+                conversation_id=conversation_id or uuid.uuid4()
+            )
+
+        try:
+            async for chunk in self._updates(
+                message,
+                self._thread_config(human_msg.conversation_id, metrics),
+                metrics
+            ):
+                # Serialize and process the chunk
+                processed_chunk = self._process_response(chunk)
+                if "error" in processed_chunk:
+                    continue
+
+                # Append to the action's event log
+                with metrics.persisting():
+                    await events.aappend(processed_chunk)
+                yield processed_chunk
+
+            # Mark action as completed
+            with metrics.persisting():
+                await events.aflush()
+            action.status = "completed"
+            action.result = events.summary()
+            await metrics.arecord(action)
+
+        except Exception as e:
+            # Update action record with error
+            await events.aflush()
+            action.status = "error"
+            action.result = events.summary()
+            action.error_message = str(e)
+            await metrics.arecord(action)
+
+            self._log_error("Chat stream failed", e)
             yield {"error": str(e)}
+
+        finally:
+            # Persist buffered events if the client disconnected mid-stream
+            await events.aflush()
+
+    async def astream_chat_tokens(self, message: str, conversation_id: Optional[str] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Async version of stream_chat_tokens, holding the agent's turn until the stream ends"""
+        async with AgentTurnController().aturn(self.agent.id):
+            async for chunk in self._astream_chat_tokens(message, conversation_id):
+                yield chunk
+
+    async def _astream_chat_tokens(self, message: str, conversation_id: Optional[str] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream the reply token by token natively on the caller's event loop"""
+        await self._aensure_agent_initialized()
+        metrics = TurnMetrics()
+
+        with metrics.persisting():
+            # Create action record
+            action = await AgentAction.objects.acreate(
+                agent=self.agent,
+                action_type="chat_message",
+                parameters={"message": message, "stream": "tokens"},
+                status="pending"
+            )
+
+            # Create human message record
+            human_msg = await ChatMessage.objects.acreate(
+                agent=self.agent,
+                message_type=ChatMessage.MessageType.HUMAN,
+                content=message,
+                conversation_id=conversation_id or uuid.uuid4()
+            )
+
+        try:
+            # Text after the last tool result is the final answer
+            answer_parts = []
+            frame_count = 0
+            async for frame in self._token_frames(message, human_msg.conversation_id, metrics):
+                if frame["type"] == "tool":
+                    answer_parts = []
+                else:
+                    answer_parts.append(frame["content"])
+                frame_count += 1
+                yield frame
+
+            response = "".join(answer_parts)
+            with metrics.persisting():
+                await ChatMessage.objects.acreate(
+                    agent=self.agent,
+                    message_type=ChatMessage.MessageType.AI,
+                    content=response,
+                    metadata={"response": response, "stream": "tokens"},
+                    parent_message=human_msg,
+                    conversation_id=human_msg.conversation_id,
+                    **metrics.fields()
+                )
+
+            action.status = "completed"
+            action.result = {"response": response, "frames": frame_count}
+            await metrics.arecord(action)
+
+            yield {"type": "done", "response": response, "conversation_id": str(human_msg.conversation_id)}
+
+        except Exception as e:
+            # Update action record with error
+            action.status = "error"
+            action.error_message = str(e)
+            await metrics.arecord(action)
+
+            self._log_error("Chat token stream failed", e)
+            yield {"error": str(e)}
+
+    async def aopen_auto_chat(
+        self,
+        message: str,
+        interval: int = 10,
+        strategy_name: str = None,
+        conversation_id: Optional[str] = None,
+        action: Optional[AgentAction] = None,
+        strategy_config: Optional[Dict[str, Any]] = None,
+    ) -> "AutoChatRun":
+        """
+        Set up an auto-chat loop whose iterations run through aauto_chat_step.
+
+        Events are appended to `action` if given (a scheduled session's
+        action), else to a new auto_chat action. strategy_config is
+        validated against the strategy's config schema.
+        """
+        await self._aensure_agent_initialized()
+
+        # Each run owns its strategy: the service is shared by every session of the agent.
+        # The first session of a strategy imports its module; keep that off the event loop
+        strategy = await sync_to_async(AVAILABLE_STRATEGIES.create)(
+            strategy_name or 'default', self.agent, interval, strategy_config
+        )
+
+        # Generate new conversation ID if not provided
+        conv_id = conversation_id or uuid.uuid4()
+
+        # Initialize strategy context
+        strategy.update_context({
+            'original_message': message,
+            'iteration_count': 0,
+            'current_conversation_id': conv_id,
+            'last_message_id': None
+        })
+
+        # Create initial human message
+        parent_msg = await ChatMessage.objects.acreate(
+            agent=self.agent,
+            message_type=ChatMessage.MessageType.HUMAN,
+            content=message,
+            conversation_id=conv_id,
+            metadata={'auto_chat': True, 'strategy': strategy_name}
+        )
+
+        action = action or await AgentAction.objects.acreate(
+            agent=self.agent,
+            action_type="auto_chat",
+            parameters={
+                "message": message,
+                "interval": interval,
+                "strategy": strategy_name
+            },
+            status="pending"
+        )
+        return AutoChatRun(strategy, message, interval, strategy_name, conv_id, parent_msg, action)
+
+    async def aauto_chat_step(self, run: "AutoChatRun") -> Optional[Dict[str, Any]]:
+        """
+        Run one auto-chat iteration, setting run.finished when the strategy stops.
+
+        Returns None without calling the LLM when an event-driven strategy
+        has nothing to react to on this tick.
+        """
+        strategy = run.strategy
+        if run.iterations and not await sync_to_async(strategy.should_wake)():
+            return None
+
+        # Use the strategy's generate_message with context
+        current_message = run.message if run.iterations == 0 else strategy.generate_message()
+
+        # Take the agent's turn for this iteration only, so chats can interleave
+        async with AgentTurnController().aturn(self.agent.id):
+            metrics = TurnMetrics()
+            graph = await self._agraph_for(current_message, metrics)
+            result = await graph.ainvoke(
+                {"messages": [HumanMessage(content=current_message)]},
+                self._thread_config(run.conversation_id, metrics)
+            )
+
+        # Process through strategy, handing it the turn's tool calls as captured
+        strategy.observe_tools(metrics.tools)
+        processed_result = strategy.process_response(self._process_response(result))
+        iteration = strategy.context.get('iteration_count', 0)
+
+        # Create AI message for auto-chat response
+        with metrics.persisting():
+            run.parent_msg = await ChatMessage.objects.acreate(
+                agent=self.agent,
+                message_type=ChatMessage.MessageType.AI,
+                content=processed_result.get('response', ''),
+                metadata={
+                    **processed_result,
+                    'auto_chat': True,
+                    'strategy': run.strategy_name,
+                    'iteration': iteration
+                },
+                parent_message=run.parent_msg,
+                conversation_id=run.conversation_id,
+                **metrics.fields()
+            )
+        await metrics.asave_spans(run.action)
+        run.totals.merge(metrics)
+
+        # Update last message id in context
+        strategy.update_context({'last_message_id': run.parent_msg.id})
+
+        # Only return the latest message, not the entire history
+        response_data = {
+            'response': {
+                'type': 'ai',
+                'content': processed_result.get('response', ''),
+                'metadata': {
+                    'auto_chat': True,
+                    'strategy': run.strategy_name,
+                    'iteration': iteration
+                },
+                'conversation_id': str(run.conversation_id)
+            }
+        }
+
+        # Add to action history
+        await run.events.aappend(response_data)
+        run.iterations += 1
+
+        # Check if strategy wants to continue
+        max_iterations = strategy.config.max_iterations
+        if not strategy.should_continue() or (max_iterations and run.iterations >= max_iterations):
+            run.finished = True
+        else:
+            # Persist this iteration before waiting
+            await run.events.aflush()
+        return response_data
+
+    async def aclose_auto_chat(self, run: "AutoChatRun", error: Optional[str] = None):
+        """Persist the loop's events and settle its action"""
+        await run.events.aflush()
+        run.action.status = "error" if error else "completed"
+        run.action.result = run.events.summary()
+        if error:
+            run.action.error_message = error
+        await run.totals.arecord(run.action)
@@ -0,0 +1,361 @@
+"""
+Database-backed LangGraph checkpointer for agent conversations.
+"""
+import random
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Dict, Optional, Tuple
+from django.conf import settings
+from django.db.models import Q
+from core.event_loop import run_db
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.serde.types import TASKS, ChannelProtocol
+from ..models import CheckpointBlob, CheckpointWrite, ConversationCheckpoint
+from .telemetry import TurnMetrics
+import logging
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Blob ids per delete, below SQLite's bound parameter limit
+PRUNE_BATCH_SIZE = 500
+
+
+class DjangoCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    Checkpoint saver storing LangGraph state in the database.
+
+    Channel values are stored once per channel version rather than copied
+    into every checkpoint, and payloads above a size threshold are
+    zstd-compressed when AGENT_CHECKPOINT_COMPRESSION is enabled. Nothing is
+    cached in memory: every lookup reads only the rows of the requested
+    thread, so resident memory does not grow with the number of agents or
+    conversations. Each thread keeps its newest AGENT_CHECKPOINT_KEEP
+    checkpoints; older ones are deleted with their writes and the channel
+    values only they referenced.
+    """
+
+    def __init__(self, *, serde=None):
+        super().__init__(serde=serde)
+        self.compress = getattr(settings, 'AGENT_CHECKPOINT_COMPRESSION', True) and zstandard is not None
+        self.compress_min_bytes = getattr(settings, 'AGENT_CHECKPOINT_COMPRESSION_MIN_BYTES', 1024)
+        self.keep = getattr(settings, 'AGENT_CHECKPOINT_KEEP', 20)
+
+    def _dump(self, value: Any) -> Tuple[str, bytes, bool]:
+        """Serialize a value, compressing it if it is large enough"""
+        type_, data = self.serde.dumps_typed(value)
+        if self.compress and len(data) >= self.compress_min_bytes:
+            return type_, zstandard.ZstdCompressor().compress(data), True
+        return type_, data, False
+
+    def _load(self, type_: str, data: Optional[bytes], compressed: bool) -> Any:
+        """Deserialize a value written by _dump"""
+        data = bytes(data) if data is not None else b''
+        if compressed:
+            data = zstandard.ZstdDecompressor().decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    def _load_channel_values(self, thread_id: str, checkpoint_ns: str, versions: Dict[str, Any]) -> Dict[str, Any]:
+        """Load the channel values referenced by a checkpoint's channel versions"""
+        if not versions:
+            return {}
+
+        query = Q()
+        for channel, version in versions.items():
+            query |= Q(channel=channel, version=str(version))
+
+        blobs = CheckpointBlob.objects.filter(query, thread_id=thread_id, checkpoint_ns=checkpoint_ns)
+        return {
+            blob.channel: self._load(blob.value_type, blob.value, blob.compressed)
+            for blob in blobs
+            if blob.value_type != 'empty'
+        }
+
+    def _build_tuple(self, row: ConversationCheckpoint, metadata: Optional[CheckpointMetadata] = None) -> CheckpointTuple:
+        """Assemble a CheckpointTuple from a stored checkpoint row"""
+        checkpoint = self._load(row.checkpoint_type, row.checkpoint, row.compressed)
+        checkpoint['channel_values'] = self._load_channel_values(
+            row.thread_id, row.checkpoint_ns, checkpoint.get('channel_versions', {})
+        )
+
+        if row.parent_checkpoint_id:
+            sends = CheckpointWrite.objects.filter(
+                thread_id=row.thread_id,
+                checkpoint_ns=row.checkpoint_ns,
+                checkpoint_id=row.parent_checkpoint_id,
+                channel=TASKS
+            ).order_by('task_path', 'task_id', 'idx')
+            checkpoint['pending_sends'] = [self._load(w.value_type, w.value, w.compressed) for w in sends]
+        else:
+            checkpoint['pending_sends'] = []
+
+        writes = CheckpointWrite.objects.filter(
+            thread_id=row.thread_id,
+            checkpoint_ns=row.checkpoint_ns,
+            checkpoint_id=row.checkpoint_id
+        ).order_by('task_id', 'idx')
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint=checkpoint,
+            metadata=metadata if metadata is not None else self._load(row.metadata_type, row.metadata, row.metadata_compressed),
+            pending_writes=[
+                (w.task_id, w.channel, self._load(w.value_type, w.value, w.compressed)) for w in writes
+            ],
+            parent_config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.parent_checkpoint_id,
+                }
+            } if row.parent_checkpoint_id else None,
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get the requested checkpoint, or the latest one for the thread"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        rows = ConversationCheckpoint.objects.filter(thread_id=thread_id, checkpoint_ns=checkpoint_ns)
+        if checkpoint_id := get_checkpoint_id(config):
+            rows = rows.filter(checkpoint_id=checkpoint_id)
+
+        row = rows.order_by('-checkpoint_id').first()
+        return self._build_tuple(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints newest first, optionally filtered by metadata"""
+        rows = ConversationCheckpoint.objects.all()
+        if config:
+            rows = rows.filter(thread_id=config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                rows = rows.filter(checkpoint_ns=checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                rows = rows.filter(checkpoint_id=checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            rows = rows.filter(checkpoint_id__lt=before_id)
+
+        for row in rows.order_by('thread_id', 'checkpoint_ns', '-checkpoint_id').iterator():
+            if limit is not None and limit <= 0:
+                break
+
+            metadata = self._load(row.metadata_type, row.metadata, row.metadata_compressed)
+            if filter and not all(metadata.get(key) == value for key, value in filter.items()):
+                continue
+
+            if limit is not None:
+                limit -= 1
+            yield self._build_tuple(row, metadata)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint and the channel values that changed in it"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        stored = checkpoint.copy()
+        stored.pop("pending_sends", None)
+        values = stored.pop("channel_values", {})
+
+        blobs = []
+        for channel, version in new_versions.items():
+            if channel in values:
+                value_type, value, compressed = self._dump(values[channel])
+            else:
+                value_type, value, compressed = 'empty', None, False
+            blobs.append(CheckpointBlob(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                channel=channel,
+                version=str(version),
+                value_type=value_type,
+                value=value,
+                compressed=compressed
+            ))
+        if blobs:
+            CheckpointBlob.objects.bulk_create(blobs, ignore_conflicts=True)
+
+        checkpoint_type, checkpoint_data, checkpoint_compressed = self._dump(stored)
+        metadata_type, metadata_data, metadata_compressed = self._dump(metadata)
+
+        # One upsert statement: a select-then-insert fails on SQLite while another thread writes
+        ConversationCheckpoint.objects.bulk_create(
+            [ConversationCheckpoint(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=config["configurable"].get("checkpoint_id"),
+                checkpoint_type=checkpoint_type,
+                checkpoint=checkpoint_data,
+                metadata_type=metadata_type,
+                metadata=metadata_data,
+                compressed=checkpoint_compressed,
+                metadata_compressed=metadata_compressed,
+            )],
+            update_conflicts=True,
+            unique_fields=['thread_id', 'checkpoint_ns', 'checkpoint_id'],
+            update_fields=[
+                'parent_checkpoint_id', 'checkpoint_type', 'checkpoint', 'metadata_type', 'metadata',
+                'compressed', 'metadata_compressed', 'updated_at',
+            ],
+        )
+
+        if self.keep:
+            self._prune(thread_id, checkpoint_ns)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> int:
+        """Delete the thread's checkpoints older than its newest `keep`, with their writes and unreferenced blobs"""
+        rows = ConversationCheckpoint.objects.filter(thread_id=thread_id, checkpoint_ns=checkpoint_ns)
+        oldest_kept = rows.order_by('-checkpoint_id')[self.keep - 1:self.keep].first()
+        if oldest_kept is None:
+            return 0
+        deleted, _ = rows.filter(checkpoint_id__lt=oldest_kept.checkpoint_id).delete()
+        if not deleted:
+            return 0
+
+        CheckpointWrite.objects.filter(
+            thread_id=thread_id, checkpoint_ns=checkpoint_ns, checkpoint_id__lt=oldest_kept.checkpoint_id
+        ).delete()
+        # Keep exactly the channel values some remaining checkpoint references
+        referenced = set()
+        for row in rows.only('checkpoint_type', 'checkpoint', 'compressed'):
+            versions = self._load(row.checkpoint_type, row.checkpoint, row.compressed).get('channel_versions', {})
+            referenced.update((channel, str(version)) for channel, version in versions.items())
+        stale = [
+            pk for pk, channel, version in CheckpointBlob.objects.filter(
+                thread_id=thread_id, checkpoint_ns=checkpoint_ns
+            ).values_list('pk', 'channel', 'version')
+            if (channel, version) not in referenced
+        ]
+        for start in range(0, len(stale), PRUNE_BATCH_SIZE):
+            CheckpointBlob.objects.filter(pk__in=stale[start:start + PRUNE_BATCH_SIZE]).delete()
+        logger.debug(f"Pruned {deleted} checkpoints of thread {thread_id}")
+        return deleted
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store intermediate writes for a checkpoint"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, data, compressed = self._dump(value)
+            rows.append(CheckpointWrite(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint_id,
+                task_id=task_id,
+                task_path=task_path,
+                idx=WRITES_IDX_MAP.get(channel, idx),
+                channel=channel,
+                value_type=value_type,
+                value=data,
+                compressed=compressed
+            ))
+        if not rows:
+            return
+
+        # Special channels (errors, interrupts) overwrite, regular writes are first-wins
+        if all(write[0] in WRITES_IDX_MAP for write in writes):
+            CheckpointWrite.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'],
+                update_fields=['channel', 'value_type', 'value', 'compressed']
+            )
+        else:
+            CheckpointWrite.objects.bulk_create(rows, ignore_conflicts=True)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Async version of get_tuple"""
+        return await run_db(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async version of list"""
+        items = await run_db(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async version of put"""
+        with TurnMetrics.timing(config):
+            return await run_db(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async version of put_writes"""
+        with TurnMetrics.timing(config):
+            await run_db(self.put_writes, config, writes, task_id, task_path)
+
+    def get_next_version(self, current: Optional[str], channel: ChannelProtocol) -> str:
+        """Generate monotonically increasing, sortable channel versions"""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
@@ -0,0 +1,426 @@
+"""
+Per-agent turn serialization and request coalescing.
+"""
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from datetime import timedelta
+from statistics import median
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+from core.event_loop import run_db
+from core.exceptions import AgentConfigurationError
+from ..models import AgentTurnLease
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _AgentTurnState:
+    """Queue and metrics for one agent's turns in this process"""
+
+    def __init__(self, sample_size: int):
+        self.condition = threading.Condition()
+        self.next_ticket = 0
+        self.serving = 0
+        self.abandoned = set()
+        self.waiting = 0
+        self.running = False
+        self.max_waiting = 0
+        self.turns = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.wait_times = deque(maxlen=sample_size)
+        self.inflight: Dict[Hashable, Future] = {}
+        # Async waiters by ticket; each wakes its coroutine and returns False if its loop is gone
+        self.wakers: Dict[int, Callable[[], bool]] = {}
+        self.last_used = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        """No turn queued, running or being coalesced"""
+        return self.serving == self.next_ticket and not self.running and not self.inflight
+
+    def advance(self):
+        """Hand the turn to the next ticket still waiting for it"""
+        self.serving += 1
+        while True:
+            while self.serving in self.abandoned:
+                self.abandoned.discard(self.serving)
+                self.serving += 1
+            waker = self.wakers.pop(self.serving, None)
+            if waker is None or waker():
+                break
+            self.serving += 1
+        self.condition.notify_all()
+
+
+class AgentTurnController:
+    """
+    Runs an agent's turns one at a time, in arrival order.
+
+    Within a process turns queue on a ticket lock per agent, so they run
+    first come, first served. Across processes a lease row in
+    AgentTurnLease is held for the duration of the turn and renewed by a
+    heartbeat thread; waiting processes poll for it, so cross-process order
+    is not strictly FIFO. A lease whose holder died is taken over once it
+    expires. Queues of agents idle for AGENT_TURN_STATE_IDLE_TTL seconds
+    are dropped.
+
+    Async callers wait for their ticket on a future rather than a thread,
+    so a long queue behind a busy agent parks no executor threads; their
+    lease and database calls run briefly on worker threads.
+
+    Identical pending messages can be coalesced: callers passing the same
+    coalesce key while a turn for it is queued or running wait for that
+    turn and receive its result instead of running their own.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._states = {}
+                    instance._held: Dict[str, int] = {}
+                    instance._heartbeat = None
+                    instance._heartbeat_pid = None
+                    instance._swept = time.monotonic()
+                    instance.queue_timeout = getattr(settings, 'AGENT_TURN_QUEUE_TIMEOUT', 300)
+                    instance.lease_enabled = getattr(settings, 'AGENT_TURN_LEASE_ENABLED', True)
+                    instance.lease_ttl = getattr(settings, 'AGENT_TURN_LEASE_TTL', 60)
+                    instance.poll_interval = getattr(settings, 'AGENT_TURN_LEASE_POLL_INTERVAL', 0.1)
+                    instance.sample_size = getattr(settings, 'AGENT_TURN_METRICS_SAMPLE_SIZE', 1000)
+                    instance.state_idle_ttl = getattr(settings, 'AGENT_TURN_STATE_IDLE_TTL', 600)
+                    cls._instance = instance
+        return cls._instance
+
+    def _sweep(self, now: float):
+        """Forget the queues of agents idle for state_idle_ttl; called under self._lock"""
+        self._swept = now
+        for agent_id, state in list(self._states.items()):
+            with state.condition:
+                if state.idle and now - state.last_used >= self.state_idle_ttl:
+                    del self._states[agent_id]
+
+    def _state_locked(self, agent_id: int) -> _AgentTurnState:
+        now = time.monotonic()
+        if now - self._swept >= self.state_idle_ttl:
+            self._sweep(now)
+        state = self._states.get(agent_id)
+        if state is None:
+            state = self._states[agent_id] = _AgentTurnState(self.sample_size)
+        state.last_used = now
+        return state
+
+    def _state(self, agent_id: int) -> _AgentTurnState:
+        with self._lock:
+            return self._state_locked(agent_id)
+
+    def _try_lease(self, agent_id: int, owner: str) -> bool:
+        """Take the agent's cross-process lease if it is free or expired"""
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=self.lease_ttl)
+        try:
+            if AgentTurnLease.objects.filter(agent_id=agent_id, expires_at__lt=now).update(
+                owner=owner, expires_at=expires_at
+            ):
+                return True
+            with transaction.atomic():
+                AgentTurnLease.objects.create(agent_id=agent_id, owner=owner, expires_at=expires_at)
+            return True
+        except IntegrityError:
+            return False
+        except DatabaseError as e:
+            # e.g. a locked SQLite database; try again on the next poll
+            logger.warning(f"Failed to take turn lease of agent {agent_id}: {str(e)}")
+            return False
+
+    def _renew_leases(self):
+        """Heartbeat keeping the leases of turns running in this process from expiring"""
+        while True:
+            time.sleep(max(self.lease_ttl / 3, self.poll_interval))
+            with self._lock:
+                owners = list(self._held)
+            if not owners:
+                continue
+            try:
+                close_old_connections()
+                AgentTurnLease.objects.filter(owner__in=owners).update(
+                    expires_at=timezone.now() + timedelta(seconds=self.lease_ttl)
+                )
+            except Exception as e:
+                logger.warning(f"Failed to renew {len(owners)} turn leases: {str(e)}")
+
+    def _hold(self, agent_id: int, owner: str):
+        with self._lock:
+            self._held[owner] = agent_id
+            # Started per process, so forked workers get their own
+            if self._heartbeat is None or self._heartbeat_pid != os.getpid():
+                self._heartbeat = threading.Thread(target=self._renew_leases, name='agent-turn-heartbeat', daemon=True)
+                self._heartbeat_pid = os.getpid()
+                self._heartbeat.start()
+
+    def _enqueue(self, agent_id: int) -> Tuple[_AgentTurnState, int]:
+        # The ticket is taken under the registry lock, so an idle sweep never drops a queue in use
+        with self._lock:
+            state = self._state_locked(agent_id)
+            with state.condition:
+                ticket = state.next_ticket
+                state.next_ticket += 1
+                state.waiting += 1
+                state.max_waiting = max(state.max_waiting, state.waiting)
+        return state, ticket
+
+    def _queue_timeout(self, agent_id: int) -> AgentConfigurationError:
+        return AgentConfigurationError(f"Timed out waiting for agent {agent_id} to finish its current turn")
+
+    def _lease_timeout(self, state: _AgentTurnState, agent_id: int) -> AgentConfigurationError:
+        with state.condition:
+            state.timeouts += 1
+        return AgentConfigurationError(f"Timed out waiting for agent {agent_id} lease held by another process")
+
+    def _started(self, state: _AgentTurnState, start: float):
+        with state.condition:
+            state.running = True
+            state.turns += 1
+            state.wait_times.append(time.monotonic() - start)
+
+    def acquire(self, agent_id: int, timeout: Optional[float] = None) -> str:
+        """Block until it is this caller's turn; returns a token for release()"""
+        timeout = self.queue_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        start = time.monotonic()
+        state, ticket = self._enqueue(agent_id)
+
+        with state.condition:
+            try:
+                while state.serving != ticket:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        state.abandoned.add(ticket)
+                        state.timeouts += 1
+                        raise self._queue_timeout(agent_id)
+                    state.condition.wait(remaining)
+            finally:
+                state.waiting -= 1
+
+        owner = uuid.uuid4().hex
+        try:
+            if self.lease_enabled:
+                while not self._try_lease(agent_id, owner):
+                    if time.monotonic() >= deadline:
+                        raise self._lease_timeout(state, agent_id)
+                    time.sleep(self.poll_interval)
+                self._hold(agent_id, owner)
+        except BaseException:
+            # Hand the turn on, or every later turn of the agent waits for this one
+            with state.condition:
+                state.advance()
+            raise
+
+        self._started(state, start)
+        return owner
+
+    async def aacquire(self, agent_id: int, timeout: Optional[float] = None) -> str:
+        """Async version of acquire, waiting on a future instead of a thread"""
+        timeout = self.queue_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        start = time.monotonic()
+        state, ticket = self._enqueue(agent_id)
+
+        loop = asyncio.get_running_loop()
+        served = loop.create_future()
+
+        def wake() -> bool:
+            try:
+                loop.call_soon_threadsafe(lambda: served.done() or served.set_result(None))
+                return True
+            except RuntimeError:
+                # The waiter's loop was closed
+                return False
+
+        with state.condition:
+            if state.serving == ticket:
+                served.set_result(None)
+            else:
+                state.wakers[ticket] = wake
+        try:
+            await asyncio.wait_for(served, max(0.0, deadline - time.monotonic()))
+        except BaseException as e:
+            with state.condition:
+                state.wakers.pop(ticket, None)
+                if state.serving == ticket:
+                    # Handed the turn just as the wait ended
+                    state.advance()
+                else:
+                    state.abandoned.add(ticket)
+                if isinstance(e, asyncio.TimeoutError):
+                    state.timeouts += 1
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._queue_timeout(agent_id) from None
+            raise
+        finally:
+            with state.condition:
+                state.waiting -= 1
+
+        owner = uuid.uuid4().hex
+        try:
+            if self.lease_enabled:
+                while not await run_db(self._try_lease, agent_id, owner):
+                    if time.monotonic() >= deadline:
+                        raise self._lease_timeout(state, agent_id)
+                    await asyncio.sleep(self.poll_interval)
+                self._hold(agent_id, owner)
+        except BaseException:
+            with state.condition:
+                state.advance()
+            raise
+
+        self._started(state, start)
+        return owner
+
+    def _drop_lease(self, agent_id: int, owner: str):
+        with self._lock:
+            self._held.pop(owner, None)
+        AgentTurnLease.objects.filter(agent_id=agent_id, owner=owner).delete()
+
+    def _finished(self, agent_id: int):
+        state = self._state(agent_id)
+        with state.condition:
+            state.running = False
+            state.advance()
+
+    def release(self, agent_id: int, owner: str):
+        """Finish the current turn and wake the next one"""
+        try:
+            if self.lease_enabled:
+                self._drop_lease(agent_id, owner)
+        finally:
+            self._finished(agent_id)
+
+    async def arelease(self, agent_id: int, owner: str):
+        """Async version of release"""
+        try:
+            if self.lease_enabled:
+                await run_db(self._drop_lease, agent_id, owner)
+        finally:
+            self._finished(agent_id)
+
+    @contextmanager
+    def turn(self, agent_id: int):
+        """Hold the agent's turn for the duration of the block"""
+        owner = self.acquire(agent_id)
+        try:
+            yield
+        finally:
+            self.release(agent_id, owner)
+
+    @asynccontextmanager
+    async def aturn(self, agent_id: int):
+        """Async version of turn"""
+        loop = asyncio.get_running_loop()
+        pending = asyncio.ensure_future(self.aacquire(agent_id))
+        try:
+            owner = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # The acquire runs on; give the turn back once it lands
+            def give_back(future):
+                if not future.cancelled() and future.exception() is None:
+                    loop.create_task(self.arelease(agent_id, future.result()))
+            pending.add_done_callback(give_back)
+            raise
+
+        try:
+            yield
+        finally:
+            await self.arelease(agent_id, owner)
+
+    def _join(self, state: _AgentTurnState, key: Hashable):
+        """Return (future, is_leader) for a coalesce key"""
+        with state.condition:
+            future = state.inflight.get(key)
+            if future is not None:
+                state.coalesced += 1
+                return future, False
+            future = state.inflight[key] = Future()
+            return future, True
+
+    def _settle(self, state: _AgentTurnState, key: Hashable, future: Future, result=None, error=None):
+        with state.condition:
+            state.inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run(self, agent_id: int, func: Callable[[], Any], coalesce_key: Optional[Hashable] = None) -> Any:
+        """Run func as one of the agent's turns, optionally sharing an identical pending turn"""
+        if coalesce_key is None:
+            with self.turn(agent_id):
+                return func()
+
+        state = self._state(agent_id)
+        future, leader = self._join(state, coalesce_key)
+        if not leader:
+            return future.result()
+
+        try:
+            with self.turn(agent_id):
+                result = func()
+        except BaseException as e:
+            self._settle(state, coalesce_key, future, error=e)
+            raise
+        self._settle(state, coalesce_key, future, result=result)
+        return result
+
+    async def arun(
+        self, agent_id: int, func: Callable[[], Awaitable[Any]], coalesce_key: Optional[Hashable] = None
+    ) -> Any:
+        """Async version of run"""
+        if coalesce_key is None:
+            async with self.aturn(agent_id):
+                return await func()
+
+        state = self._state(agent_id)
+        future, leader = self._join(state, coalesce_key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            async with self.aturn(agent_id):
+                result = await func()
+        except BaseException as e:
+            self._settle(state, coalesce_key, future, error=e)
+            raise
+        self._settle(state, coalesce_key, future, result=result)
+        return result
+
+    def metrics(self, agent_id: int) -> Dict[str, Any]:
+        """Queue depth, wait times and coalescing counters for this process"""
+        state = self._state(agent_id)
+        with state.condition:
+            waits = sorted(state.wait_times)
+            return {
+                "queue_depth": state.waiting,
+                "running": state.running,
+                "max_queue_depth": state.max_waiting,
+                "turns": state.turns,
+                "coalesced": state.coalesced,
+                "timeouts": state.timeouts,
+                "wait_ms": {
+                    "mean": sum(waits) / len(waits) * 1000 if waits else 0.0,
+                    "p50": median(waits) * 1000 if waits else 0.0,
+                    "p95": waits[int(0.95 * (len(waits) - 1))] * 1000 if waits else 0.0,
+                    "max": waits[-1] * 1000 if waits else 0.0,
+                },
+            }
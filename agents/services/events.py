@@ -0,0 +1,98 @@
+"""
+Buffered, append-only event log for streamed agent actions.
+"""
+import time
+from typing import Any, Dict, List
+from django.conf import settings
+from ..models import AgentAction, AgentActionEvent
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ActionEventLog:
+    """
+    Collects events for one AgentAction and writes them with bulk_create.
+
+    Each flush inserts only the new rows and bumps the action's
+    event_count, so a long stream costs O(n) bytes written instead of
+    re-saving an ever-growing result blob on every chunk. With `retain`
+    set only about the newest `retain` events are kept, so a stream that
+    never ends stays a bounded replay buffer; sequences keep counting up.
+    """
+
+    def __init__(self, action: AgentAction, flush_size: int = None, flush_interval: float = None, retain: int = None):
+        self.action = action
+        self.flush_size = flush_size or getattr(settings, 'AGENT_EVENT_FLUSH_SIZE', 20)
+        self.flush_interval = flush_interval if flush_interval is not None else getattr(
+            settings, 'AGENT_EVENT_FLUSH_INTERVAL', 1.0
+        )
+        self.count = action.event_count
+        self.retain = retain
+        # Prune in steps of a tenth of the buffer rather than on every flush
+        self._pruned = max(0, self.count - retain) if retain else 0
+        self.last_payload = None
+        self._buffer: List[AgentActionEvent] = []
+        self._last_flush = time.monotonic()
+
+    def _add(self, payload: Dict[str, Any]) -> bool:
+        """Buffer an event and report whether a flush is due"""
+        self.count += 1
+        self.last_payload = payload
+        self._buffer.append(AgentActionEvent(action=self.action, sequence=self.count, payload=payload))
+        return (
+            len(self._buffer) >= self.flush_size or
+            time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def _take(self) -> List[AgentActionEvent]:
+        events, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        self.action.event_count = self.count
+        return events
+
+    def _prune_through(self) -> int:
+        """Sequence to delete events up to, or 0 while the buffer has room"""
+        if not self.retain:
+            return 0
+        floor = self.count - self.retain
+        if floor - self._pruned < max(1, self.retain // 10):
+            return 0
+        self._pruned = floor
+        return floor
+
+    def append(self, payload: Dict[str, Any]):
+        """Add an event, flushing if the buffer is full or stale"""
+        if self._add(payload):
+            self.flush()
+
+    def flush(self):
+        """Write buffered events and update the action's counter"""
+        if not self._buffer:
+            return
+        events = self._take()
+        AgentActionEvent.objects.bulk_create(events)
+        AgentAction.objects.filter(pk=self.action.pk).update(event_count=self.count)
+        floor = self._prune_through()
+        if floor:
+            AgentActionEvent.objects.filter(action_id=self.action.pk, sequence__lte=floor).delete()
+
+    async def aappend(self, payload: Dict[str, Any]):
+        """Async version of append"""
+        if self._add(payload):
+            await self.aflush()
+
+    async def aflush(self):
+        """Async version of flush"""
+        if not self._buffer:
+            return
+        events = self._take()
+        await AgentActionEvent.objects.abulk_create(events)
+        await AgentAction.objects.filter(pk=self.action.pk).aupdate(event_count=self.count)
+        floor = self._prune_through()
+        if floor:
+            await AgentActionEvent.objects.filter(action_id=self.action.pk, sequence__lte=floor).adelete()
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact result stored on the action row"""
+        return {"last_response": self.last_payload}
@@ -0,0 +1,225 @@
+"""
+Deterministic answers to simple chat requests that map to one tool call.
+"""
+import re
+import threading
+import uuid
+from typing import Any, Callable, Collection, Dict, List, Optional
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from ..actions import ALL_ACTIONS
+from ..toolkits import CustomAgentToolkit
+import logging
+
+logger = logging.getLogger(__name__)
+
+# CoinGecko ids of common ticker symbols
+COINGECKO_IDS = {
+    'btc': 'bitcoin',
+    'eth': 'ethereum',
+    'weth': 'weth',
+    'usdc': 'usd-coin',
+    'usdt': 'tether',
+    'dai': 'dai',
+    'sol': 'solana',
+    'matic': 'matic-network',
+    'pol': 'polygon-ecosystem-token',
+    'op': 'optimism',
+    'arb': 'arbitrum',
+    'link': 'chainlink',
+    'uni': 'uniswap',
+    'aave': 'aave',
+    'doge': 'dogecoin',
+    'cbbtc': 'coinbase-wrapped-btc',
+}
+
+# Tickers and CoinGecko ids the bare "<token> price" and "how much is <token>" forms accept,
+# so "gas price" or "floor price" never become a price lookup; other names need "price of X"
+_KNOWN_TOKENS = "|".join(
+    re.escape(token) for token in sorted({*COINGECKO_IDS, *COINGECKO_IDS.values()}, key=len, reverse=True)
+)
+
+_ASK = r"(?:(?:what(?:'?s| is)|show(?: me)?|get|check|tell me)\s+)?(?:my\s+|the\s+|our\s+)?"
+
+
+def _wallet_reply(match: re.Match, output: Any) -> Optional[str]:
+    found = re.search(r"Wallet: (\S+) on network: (\S+) with default address: (\S+)", str(output))
+    if not found:
+        return None
+    wallet_id, network_id, address = found.groups()
+    return f"Your wallet address is {address} on {network_id} (wallet {wallet_id})."
+
+
+def _balance_args(match: re.Match) -> Dict[str, Any]:
+    return {"asset_id": (match.group('asset') or match.group('asset_of') or 'eth').lower()}
+
+
+def _balance_reply(match: re.Match, output: Any) -> Optional[str]:
+    lines = [line.strip() for line in str(output).splitlines()[1:] if ':' in line]
+    if not str(output).startswith("Balances for wallet") or not lines:
+        return None
+    asset = _balance_args(match)["asset_id"].upper()
+    return f"Your {asset} balance:\n" + "\n".join(f"- {line}" for line in lines)
+
+
+def _token(match: re.Match) -> str:
+    return (match.group('token') or match.group('ticker') or match.group('worth')).strip().lower()
+
+
+def _price_args(match: re.Match) -> Dict[str, Any]:
+    token = _token(match)
+    return {"token_id": COINGECKO_IDS.get(token, token.replace(' ', '-')), "vs_currencies": "usd"}
+
+
+def _price_reply(match: re.Match, output: Any) -> Optional[str]:
+    if not isinstance(output, dict) or not output.get("success"):
+        return None
+    data = output.get("data") or {}
+    if data.get("usd") is None:
+        return None
+    reply = f"{_token(match).upper()} is ${data['usd']:,} USD"
+    change = data.get("usd_24h_change")
+    if change is not None:
+        reply += f" ({change:+.2f}% in the last 24h)"
+    return reply + "."
+
+
+class FastPathIntent:
+    """One entry of the pattern table: a message pattern, its tool call and reply template"""
+
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        tool: str,
+        reply: Callable[[re.Match, Any], Optional[str]],
+        args: Callable[[re.Match], Dict[str, Any]] = lambda match: {},
+    ):
+        self.name = name
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+        self.tool = tool
+        self.reply = reply
+        self.args = args
+
+
+FAST_PATH_INTENTS = [
+    FastPathIntent(
+        'wallet_address',
+        _ASK + r"(?:wallet\s+)?(?:address|addy)|" + _ASK + r"wallet(?:\s+details)?",
+        'get_wallet_details',
+        _wallet_reply,
+    ),
+    FastPathIntent(
+        'balance',
+        _ASK + r"(?:(?P<asset>eth|usdc|weth|cbbtc)\s+)?(?:wallet\s+)?balance(?:\s+(?:of|in|for)\s+(?P<asset_of>eth|usdc|weth|cbbtc))?",
+        'get_balance',
+        _balance_reply,
+        _balance_args,
+    ),
+    FastPathIntent(
+        'price',
+        _ASK + r"(?:current\s+)?price\s+(?:of|for)\s+(?P<token>[a-z][a-z0-9.-]{1,20}(?: [a-z0-9.-]{1,20})?)"
+        r"|" + _ASK + rf"(?:current\s+)?(?P<ticker>{_KNOWN_TOKENS})\s+price"
+        r"|how much is\s+(?:(?:one|1)\s+)?" + rf"(?P<worth>{_KNOWN_TOKENS})(?:\s+worth)?",
+        'get_token_price',
+        _price_reply,
+        _price_args,
+    ),
+]
+
+
+class FastPathAnswer:
+    """A templated reply and the messages recording it in the conversation thread"""
+
+    def __init__(self, intent: str, reply: str, messages: List[BaseMessage]):
+        self.intent = intent
+        self.reply = reply
+        self.messages = messages
+
+    def updates(self) -> List[Dict[str, Any]]:
+        """The turn as graph update chunks, like astream() of the agent"""
+        call, result, reply = self.messages[1:]
+        return [
+            {"agent": {"messages": [call]}},
+            {"tools": {"messages": [result]}},
+            {"agent": {"messages": [reply]}},
+        ]
+
+    def token_events(self) -> List[Dict[str, Any]]:
+        """The turn as token stream events"""
+        result = self.messages[2]
+        return [
+            {"type": "tool", "name": result.name, "content": result.content},
+            {"type": "token", "content": self.reply},
+        ]
+
+
+class IntentFastPath:
+    """
+    Answers simple requests ("balance?", "wallet address?", "price of X")
+    with a direct tool call and a reply template, skipping the LLM.
+
+    Only whole messages matching the pattern table are handled, and only
+    with tools the agent's allow-list permits. When the
+    tool fails or its output does not fit the template, None is returned
+    and the caller runs a normal agent turn.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._tools = {
+                        tool.name: tool for tool in CustomAgentToolkit.from_actions(ALL_ACTIONS).get_tools()
+                    }
+                    cls._instance = instance
+        return cls._instance
+
+    @staticmethod
+    def _normalize(message: str) -> str:
+        return " ".join((message or "").split()).strip(" ?!.").lower()
+
+    def match(self, message: str, allowed: Optional[Collection[str]] = None):
+        """(intent, match) for a message the table handles with an allowed tool, else None"""
+        text = self._normalize(message)
+        if not text or len(text) > 80:
+            return None
+        for intent in FAST_PATH_INTENTS:
+            if intent.tool not in self._tools or (allowed is not None and intent.tool not in allowed):
+                continue
+            match = intent.pattern.fullmatch(text)
+            if match:
+                return intent, match
+        return None
+
+    def _answer(self, message: str, intent: FastPathIntent, match: re.Match, args: Dict[str, Any], output: Any) -> Optional[FastPathAnswer]:
+        reply = intent.reply(match, output)
+        if reply is None:
+            logger.info(f"Fast path {intent.name} output did not fit its template, using the agent")
+            return None
+        call_id = f"fast-{uuid.uuid4().hex[:12]}"
+        return FastPathAnswer(intent.name, reply, [
+            HumanMessage(content=message),
+            AIMessage(content="", tool_calls=[{"name": intent.tool, "args": args, "id": call_id}]),
+            ToolMessage(content=str(output), name=intent.tool, tool_call_id=call_id),
+            AIMessage(content=reply),
+        ])
+
+    async def aanswer(
+        self, message: str, config: RunnableConfig, allowed: Optional[Collection[str]] = None
+    ) -> Optional[FastPathAnswer]:
+        """Run the matching tool with the turn's config and template the reply; allowed limits the tools used"""
+        matched = self.match(message, allowed)
+        if matched is None:
+            return None
+        intent, match = matched
+        args = intent.args(match)
+        try:
+            output = await self._tools[intent.tool].ainvoke(args, config)
+        except Exception as e:
+            logger.warning(f"Fast path {intent.name} failed, using the agent: {str(e)}")
+            return None
+        return self._answer(message, intent, match, args, output)
@@ -0,0 +1,155 @@
+"""
+Durable queue of chat and task jobs run by the background worker pool.
+"""
+import uuid
+from datetime import timedelta
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from core.exceptions import AgentConfigurationError
+from ..models import Agent, AgentJob
+from ..toolkits import wallet_write_callback
+from .services import DeFiAgentManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AgentJobQueue:
+    """
+    Submits, claims and settles AgentJob rows.
+
+    Jobs live in the database, so queued jobs survive worker restarts. A
+    worker claims a job with a conditional update and holds it under a
+    lease (locked_until) that it renews while the job runs; jobs whose
+    worker died are put back in the queue once the lease expires, up to
+    AGENT_JOB_MAX_ATTEMPTS runs, so delivery is at least once. A job that
+    already ran a state-changing tool (wallet_written_at) is failed rather
+    than run again, so a transfer or trade is never repeated.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or uuid.uuid4().hex
+        self.lease_ttl = getattr(settings, 'AGENT_JOB_LEASE_TTL', 60)
+        self.max_attempts = getattr(settings, 'AGENT_JOB_MAX_ATTEMPTS', 3)
+
+    @staticmethod
+    def submit(agent: Agent, job_type: str, payload: Dict[str, Any]) -> AgentJob:
+        """Queue a job and return it without waiting for a worker"""
+        if job_type not in AgentJob.JobType.values:
+            raise AgentConfigurationError(f"Unknown job type: {job_type}")
+        job = AgentJob.objects.create(agent=agent, job_type=job_type, payload=payload)
+        logger.info(f"Queued {job_type} job {job.id} for agent {agent.id}")
+        return job
+
+    def _lease_expiry(self):
+        return timezone.now() + timedelta(seconds=self.lease_ttl)
+
+    def claim(self, limit: int) -> List[AgentJob]:
+        """Take up to limit queued jobs, oldest first"""
+        if limit <= 0:
+            return []
+        candidates = list(
+            AgentJob.objects.filter(status=AgentJob.JobStatus.QUEUED)
+            .order_by('created_at')
+            .values_list('pk', flat=True)[:limit]
+        )
+        claimed = []
+        for pk in candidates:
+            # Another worker may have taken it since the select
+            if AgentJob.objects.filter(pk=pk, status=AgentJob.JobStatus.QUEUED).update(
+                status=AgentJob.JobStatus.RUNNING,
+                worker_id=self.worker_id,
+                locked_until=self._lease_expiry(),
+                attempts=F('attempts') + 1,
+                started_at=timezone.now(),
+            ):
+                claimed.append(pk)
+        return list(AgentJob.objects.filter(pk__in=claimed).select_related('agent').order_by('created_at'))
+
+    def heartbeat(self, job_ids: Iterable[uuid.UUID]) -> int:
+        """Renew the lease on jobs this worker is running"""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return 0
+        return AgentJob.objects.filter(
+            pk__in=job_ids, worker_id=self.worker_id, status=AgentJob.JobStatus.RUNNING
+        ).update(locked_until=self._lease_expiry())
+
+    def recover_expired(self) -> int:
+        """Requeue or fail running jobs whose worker stopped renewing the lease"""
+        now = timezone.now()
+        expired = AgentJob.objects.filter(status=AgentJob.JobStatus.RUNNING, locked_until__lt=now)
+        written = expired.filter(wallet_written_at__isnull=False).update(
+            status=AgentJob.JobStatus.FAILED,
+            error_message='Worker stopped after the job changed wallet state; not run again',
+            locked_until=None,
+            finished_at=now,
+        )
+        failed = expired.filter(attempts__gte=self.max_attempts).update(
+            status=AgentJob.JobStatus.FAILED,
+            error_message='Worker stopped before the job finished',
+            locked_until=None,
+            finished_at=now,
+        )
+        requeued = expired.update(status=AgentJob.JobStatus.QUEUED, worker_id='', locked_until=None)
+        if failed or written or requeued:
+            logger.warning(
+                f"Recovered abandoned jobs: {requeued} requeued, {failed + written} failed "
+                f"({written} after changing wallet state)"
+            )
+        return requeued
+
+    def release(self, job_ids: Iterable[uuid.UUID]) -> int:
+        """Put jobs this worker will not finish back in the queue, failing those that changed wallet state"""
+        running = AgentJob.objects.filter(
+            pk__in=list(job_ids), worker_id=self.worker_id, status=AgentJob.JobStatus.RUNNING
+        )
+        running.filter(wallet_written_at__isnull=False).update(
+            status=AgentJob.JobStatus.FAILED,
+            error_message='Worker stopped after the job changed wallet state; not run again',
+            locked_until=None,
+            finished_at=timezone.now(),
+        )
+        return running.update(status=AgentJob.JobStatus.QUEUED, worker_id='', locked_until=None)
+
+    def _record_wallet_write(self, job: AgentJob, tool_name: str):
+        if job.wallet_written_at is not None:
+            return
+        job.wallet_written_at = timezone.now()
+        AgentJob.objects.filter(pk=job.pk, wallet_written_at__isnull=True).update(wallet_written_at=job.wallet_written_at)
+        logger.info(f"Job {job.id} changed wallet state with {tool_name}; it will not be run again")
+
+    def _settle(self, job: AgentJob, **fields) -> bool:
+        # Only the worker holding the lease may record the outcome
+        return bool(AgentJob.objects.filter(
+            pk=job.pk, worker_id=self.worker_id, status=AgentJob.JobStatus.RUNNING
+        ).update(locked_until=None, finished_at=timezone.now(), **fields))
+
+    def _run(self, job: AgentJob) -> Dict[str, Any]:
+        manager = DeFiAgentManager(job.agent)
+        conversation_id = job.payload.get('conversation_id')
+        if job.job_type == AgentJob.JobType.TASK:
+            return async_to_sync(manager.run_agent_task)(job.payload['task'], conversation_id)
+        return manager.chat_sync(job.payload['message'], conversation_id=conversation_id)
+
+    def execute(self, job: AgentJob) -> bool:
+        """Run a claimed job and record its result; returns True on success"""
+        close_old_connections()
+        token = wallet_write_callback.set(partial(self._record_wallet_write, job))
+        try:
+            result = self._run(job)
+            self._settle(job, status=AgentJob.JobStatus.COMPLETED, result=result)
+            logger.info(f"Job {job.id} completed")
+            return True
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            self._settle(job, status=AgentJob.JobStatus.FAILED, error_message=str(e))
+            return False
+        finally:
+            wallet_write_callback.reset(token)
+            close_old_connections()
@@ -0,0 +1,175 @@
+"""
+Per-turn model selection and escalation after failed tool calls.
+"""
+import re
+import threading
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.runnables import Runnable, RunnableConfig
+from .telemetry import TurnMetrics
+from .tool_router import ToolSelection
+import logging
+
+logger = logging.getLogger(__name__)
+
+MULTI_STEP_PATTERN = re.compile(
+    r'\b(and then|after that|afterwards|once (that|done|it)|finally|step \d+)\b|[,;.]\s*then\b|(^|\s)\d+[.)]\s',
+    re.IGNORECASE
+)
+
+
+def _model_name(model: Runnable) -> Optional[str]:
+    """Model name of a chat model or of a RunnableBinding around one"""
+    return getattr(getattr(model, 'bound', model), 'model_name', None)
+
+
+def tool_failed(messages: List[Any]) -> bool:
+    """True if a tool call failed since the last human message"""
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
+            return False
+        if isinstance(msg, ToolMessage) and (
+            getattr(msg, 'status', None) == 'error' or str(msg.content).startswith('Error')
+        ):
+            return True
+    return False
+
+
+class EscalatingChatModel(Runnable):
+    """
+    Chat model that answers with `model` until a tool call of the turn
+    failed, then with `escalation_model` for the rest of the turn.
+
+    Both models are invoked with the run config, so callbacks, token
+    streaming and turn metrics work as for a plain chat model.
+    """
+
+    def __init__(self, model: Runnable, escalation_model: Runnable):
+        self.model = model
+        self.escalation_model = escalation_model
+
+    def bind_tools(self, tools, **kwargs) -> "EscalatingChatModel":
+        return EscalatingChatModel(
+            self.model.bind_tools(tools, **kwargs),
+            self.escalation_model.bind_tools(tools, **kwargs),
+        )
+
+    def _pick(self, input: Any, config: Optional[RunnableConfig]) -> Runnable:
+        messages = input.to_messages() if hasattr(input, 'to_messages') else input
+        if not isinstance(messages, list) or not tool_failed(messages):
+            return self.model
+
+        name = _model_name(self.escalation_model)
+        metrics = TurnMetrics.from_config(config)
+        if metrics is not None and not metrics.escalated:
+            metrics.escalate(name)
+            agent_id = ((config or {}).get("configurable") or {}).get("agent_id")
+            if agent_id is not None:
+                ModelRouter.note_failure(agent_id)
+            logger.info(f"Tool call failed, escalating turn of agent {agent_id} to {name}")
+        return self.escalation_model
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs) -> Any:
+        return self._pick(input, config).invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs) -> Any:
+        return await self._pick(input, config).ainvoke(input, config, **kwargs)
+
+
+class ModelChoice:
+    """The model picked for a turn, the model it escalates to and why"""
+
+    def __init__(self, model: str, escalate_to: Optional[str], reasons: List[str]):
+        self.model = model
+        self.escalate_to = escalate_to
+        self.reasons = reasons
+
+
+class ModelRouter:
+    """
+    Picks the model for each turn.
+
+    Simple turns go to the fast model. Long or multi-step messages, turns
+    needing many tools and agents with recent tool failures go to the
+    strong model. Turns started on the fast model escalate to the strong
+    one after a failed tool call. Agents can pin a model with
+    configuration 'model', start on a tier with 'model_tier', or turn
+    routing off with 'model_routing'.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @property
+    def fast_model(self) -> str:
+        return getattr(settings, 'AGENT_MODEL_FAST', 'gpt-4o-mini')
+
+    @property
+    def strong_model(self) -> str:
+        return getattr(settings, 'AGENT_MODEL_STRONG', 'gpt-4o')
+
+    @staticmethod
+    def _failure_key(agent_id: int) -> str:
+        return f"agent-model-failures:{agent_id}"
+
+    @classmethod
+    def note_failure(cls, agent_id: int):
+        """Count a failed tool call against the agent for the failure window"""
+        key = cls._failure_key(agent_id)
+        cache.add(key, 0, timeout=getattr(settings, 'AGENT_MODEL_ROUTING_FAILURE_WINDOW', 600))
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            cache.add(key, 1, timeout=getattr(settings, 'AGENT_MODEL_ROUTING_FAILURE_WINDOW', 600))
+
+    def recent_failures(self, agent_id: int) -> int:
+        """Failed tool calls of the agent within the failure window"""
+        return cache.get(self._failure_key(agent_id), 0)
+
+    def _reasons(self, message: str, selection: Optional[ToolSelection], agent_id: int) -> List[str]:
+        """Why a turn needs the strong model, empty if it does not"""
+        reasons = []
+        if len((message or '').split()) > getattr(settings, 'AGENT_MODEL_ROUTING_LONG_MESSAGE_WORDS', 60):
+            reasons.append('long_message')
+        if MULTI_STEP_PATTERN.search(message or ''):
+            reasons.append('multi_step')
+        if selection is not None and not selection.fallback:
+            if len(selection.intents) >= 3:
+                reasons.append('many_intents')
+            if len(selection.actions) > getattr(settings, 'AGENT_MODEL_ROUTING_MAX_FAST_TOOLS', 10):
+                reasons.append('many_tools')
+        if self.recent_failures(agent_id) >= getattr(settings, 'AGENT_MODEL_ROUTING_FAILURE_THRESHOLD', 2):
+            reasons.append('recent_failures')
+        return reasons
+
+    def choose(
+        self,
+        message: str,
+        selection: Optional[ToolSelection] = None,
+        configuration: Optional[Dict[str, Any]] = None,
+        agent_id: int = None,
+    ) -> ModelChoice:
+        """Model for a turn of an agent"""
+        configuration = configuration or {}
+        if configuration.get('model'):
+            return ModelChoice(configuration['model'], None, ['pinned'])
+        if not configuration.get('model_routing', getattr(settings, 'AGENT_MODEL_ROUTING_ENABLED', True)):
+            return ModelChoice(self.fast_model, None, [])
+
+        tier = configuration.get('model_tier')
+        if tier == 'strong':
+            return ModelChoice(self.strong_model, None, ['model_tier'])
+        reasons = [] if tier == 'fast' else self._reasons(message, selection, agent_id)
+        if reasons:
+            return ModelChoice(self.strong_model, None, reasons)
+        escalate_to = self.strong_model if self.strong_model != self.fast_model else None
+        return ModelChoice(self.fast_model, escalate_to, [])
@@ -0,0 +1,74 @@
+"""
+In-process cache of chat responses for read-only turns.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of chat responses, shared by all agents in the process.
+
+    Keys combine the agent, the normalized prompt, the wallet state version
+    and the toolset, so any write to the wallet makes older entries
+    unreachable; they then age out through the TTL or LRU eviction.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._entries = OrderedDict()
+                    instance.ttl = getattr(settings, 'AGENT_RESPONSE_CACHE_TTL', 60)
+                    instance.max_entries = getattr(settings, 'AGENT_RESPONSE_CACHE_MAX_ENTRIES', 1024)
+                    cls._instance = instance
+        return cls._instance
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Case-fold, collapse whitespace and drop trailing punctuation"""
+        return re.sub(r'\s+', ' ', message).strip().rstrip('?!. ').casefold()
+
+    @classmethod
+    def make_key(cls, agent_id: int, message: str, wallet_version: int, toolset: Iterable[str]) -> str:
+        """Build the cache key for a prompt"""
+        raw = '\x1f'.join([str(agent_id), cls.normalize(message), str(wallet_version), *toolset])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (entry, age in seconds) for a live entry, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value, age
+
+    def set(self, key: str, entry: Dict[str, Any]):
+        """Store an entry, evicting the least recently used ones"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
@@ -1,7 +1,8 @@
 """
 Main service manager for agents.
 """
-from typing import Optional, Dict, Any, Generator
+from typing import Optional, Dict, Any, Generator, AsyncGenerator
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from core.exceptions import AgentConfigurationError
 from ..models import Agent
@@ -9,7 +10,6 @@ from .wallet import WalletService
 from .chat import ChatService
 from .actions import ActionService
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +74,11 @@ class DeFiAgentManager:
         if not self._services_initialized:
             self._initialize_services()
 
+    def _initialize_wallet(self):
+        """Ensure the agent's wallet and AgentKit are initialized"""
+        self._ensure_services_initialized()
+        return self.wallet_service.wallet
+
     def get_available_actions(self) -> list:
         """Get list of available CDP actions"""
         self._ensure_services_initialized()
@@ -91,7 +96,6 @@ class DeFiAgentManager:
             logger.error(f"Action execution failed: {str(e)}")
             raise
 
-    @transaction.atomic
     def chat_sync(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
         """Process a chat message synchronously"""
         self._ensure_services_initialized()
@@ -116,37 +120,50 @@ class DeFiAgentManager:
             logger.error(f"Stream chat failed: {str(e)}")
             yield {"error": str(e)}
 
-    def stream_auto_chat(self, message: Optional[str] = None, interval: int = 10, strategy: str = None, conversation_id: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
-        """Stream auto-chat responses with interval between iterations"""
+    def stream_chat_tokens(self, message: str, conversation_id: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
+        """Stream chat reply tokens, coalesced into small frames"""
         self._ensure_services_initialized()
-        
-        if message is None:
-            message = (
-                "Choose an action or set of actions and execute it that highlights your abilities."
-            )
-        
         try:
-            while True:
-                try:
-                    # Get the response using the chat service with specified strategy
-                    for chunk in self.chat_service.stream_auto_chat(message, interval, strategy, conversation_id):
-                        yield chunk
-
-                    # Update wallet data after each successful interaction
-                    try:
-                        self.wallet_service.update_wallet_data()
-                    except Exception as e:
-                        logger.warning(f"Failed to update wallet data: {str(e)}")
-                        
-                    # Sleep for the specified interval before next iteration
-                    time.sleep(interval)
-                    
-                except Exception as e:
-                    logger.error(f"Auto-chat iteration failed: {str(e)}")
-                    yield {"error": f"Auto-chat iteration failed: {str(e)}"}
-                    # Still wait before retrying
-                    time.sleep(interval)
-                    
+            for frame in self.chat_service.stream_chat_tokens(message, conversation_id):
+                yield frame
+            self.wallet_service.update_wallet_data()
+        except Exception as e:
+            logger.error(f"Token stream chat failed: {str(e)}")
+            yield {"error": str(e)}
+
+    async def achat(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Process a chat message without blocking a worker thread"""
+        await sync_to_async(self._ensure_services_initialized)()
+        try:
+            result = await self.chat_service.achat(message, conversation_id)
+            await sync_to_async(self.wallet_service.update_wallet_data)()
+            return result
+        except Exception as e:
+            logger.error(f"Chat failed: {str(e)}")
+            raise
+
+    async def run_agent_task(self, task: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Run a task description as a single agent turn"""
+        return await self.achat(task, conversation_id)
+
+    async def astream_chat(self, message: str, conversation_id: Optional[str] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream chat responses without blocking a worker thread"""
+        await sync_to_async(self._ensure_services_initialized)()
+        try:
+            async for chunk in self.chat_service.astream_chat(message, conversation_id):
+                yield chunk
+            await sync_to_async(self.wallet_service.update_wallet_data)()
+        except Exception as e:
+            logger.error(f"Stream chat failed: {str(e)}")
+            yield {"error": str(e)}
+
+    async def astream_chat_tokens(self, message: str, conversation_id: Optional[str] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream chat reply tokens without blocking a worker thread"""
+        await sync_to_async(self._ensure_services_initialized)()
+        try:
+            async for frame in self.chat_service.astream_chat_tokens(message, conversation_id):
+                yield frame
+            await sync_to_async(self.wallet_service.update_wallet_data)()
         except Exception as e:
-            logger.error(f"Auto-chat stream failed: {str(e)}")
+            logger.error(f"Token stream chat failed: {str(e)}")
             yield {"error": str(e)}
@@ -0,0 +1,523 @@
+"""
+Auto-chat sessions run by the background scheduler instead of the HTTP request.
+"""
+import asyncio
+import hashlib
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from core.exceptions import AgentConfigurationError
+from core.pubsub import EventHub
+from ..models import Agent, AgentAction, AgentActionEvent, AutoChatSession
+from .auto_chat import AVAILABLE_STRATEGIES
+from .chat import AutoChatRun
+from .events import ActionEventLog
+from .services import DeFiAgentManager
+from .tick_scheduler import TickScheduler
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTO_CHAT_MESSAGE = (
+    "Be creative and do something interesting on the blockchain. "
+    "Choose an action or set of actions and execute it that highlights your abilities."
+)
+
+# Session ids per query, below SQLite's bound parameter limit
+ID_BATCH_SIZE = 500
+
+
+def session_topic(session_id: uuid.UUID) -> str:
+    """EventHub topic a session's iterations and status changes are published to"""
+    return f"auto-chat.{session_id}"
+
+
+def _batches(session_ids: Iterable[uuid.UUID]) -> Iterator[List[uuid.UUID]]:
+    session_ids = list(session_ids)
+    for start in range(0, len(session_ids), ID_BATCH_SIZE):
+        yield session_ids[start:start + ID_BATCH_SIZE]
+
+
+class AutoChatSessionStore:
+    """
+    Starts, stops, claims and settles AutoChatSession rows.
+
+    Sessions live in the database, so they outlive the HTTP request that
+    started them and the scheduler process running them. A scheduler
+    claims an active session with a conditional update and holds it under
+    a lease (locked_until) renewed while it runs; when a scheduler dies,
+    another one claims its sessions once the lease expires.
+    """
+
+    def __init__(self, scheduler_id: Optional[str] = None):
+        scheduler_id = scheduler_id or uuid.uuid4().hex
+        max_length = AutoChatSession._meta.get_field('scheduler_id').max_length
+        if len(scheduler_id) > max_length:
+            # Keep the readable start and a digest of the whole id so long ids stay distinct
+            digest = hashlib.sha1(scheduler_id.encode()).hexdigest()[:12]
+            scheduler_id = f"{scheduler_id[:max_length - len(digest) - 1]}-{digest}"
+        self.scheduler_id = scheduler_id
+        self.lease_ttl = getattr(settings, 'AGENT_AUTO_CHAT_SESSION_LEASE_TTL', 60)
+
+    @staticmethod
+    def start(
+        agent: Agent,
+        message: Optional[str] = None,
+        interval: int = 10,
+        strategy: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> AutoChatSession:
+        """Persist a new active session for the scheduler to pick up"""
+        # Checked against the strategy's schema here, without importing the strategy
+        strategy_config = AVAILABLE_STRATEGIES.validate(strategy or 'default', config, interval)
+        min_interval = getattr(settings, 'AGENT_AUTO_CHAT_MIN_INTERVAL', 1)
+        if interval < min_interval:
+            raise AgentConfigurationError(f"Auto-chat interval must be at least {min_interval} seconds")
+
+        message = message or DEFAULT_AUTO_CHAT_MESSAGE
+        with transaction.atomic():
+            action = AgentAction.objects.create(
+                agent=agent,
+                action_type="auto_chat",
+                parameters={"message": message, "interval": interval, "strategy": strategy},
+                status="pending"
+            )
+            session = AutoChatSession.objects.create(
+                agent=agent,
+                action=action,
+                message=message,
+                interval=interval,
+                strategy=strategy or '',
+                strategy_config=strategy_config.model_dump(exclude={'interval'}),
+                conversation_id=conversation_id or uuid.uuid4(),
+            )
+        logger.info(f"Started auto-chat session {session.id} for agent {agent.id}")
+        return session
+
+    @staticmethod
+    def stop(session: AutoChatSession) -> bool:
+        """Mark a session stopped; its scheduler cancels it on its next poll"""
+        stopped = AutoChatSession.objects.filter(
+            pk=session.pk, status=AutoChatSession.SessionStatus.ACTIVE
+        ).update(status=AutoChatSession.SessionStatus.STOPPED, finished_at=timezone.now(), locked_until=None)
+        if stopped:
+            logger.info(f"Stopped auto-chat session {session.pk}")
+            EventHub().publish(session_topic(session.pk), {"status": AutoChatSession.SessionStatus.STOPPED})
+        return bool(stopped)
+
+    def _lease_expiry(self):
+        return timezone.now() + timedelta(seconds=self.lease_ttl)
+
+    def claim(self, limit: int) -> List[AutoChatSession]:
+        """Take up to limit active sessions nobody holds, oldest first"""
+        if limit <= 0:
+            return []
+        now = timezone.now()
+        unclaimed = Q(scheduler_id='') | Q(locked_until__lt=now) | Q(locked_until__isnull=True)
+        candidates = list(
+            AutoChatSession.objects.filter(unclaimed, status=AutoChatSession.SessionStatus.ACTIVE)
+            .order_by('created_at')
+            .values_list('pk', flat=True)[:limit]
+        )
+        claimed = []
+        for pk in candidates:
+            # Another scheduler may have taken it since the select
+            if AutoChatSession.objects.filter(unclaimed, pk=pk, status=AutoChatSession.SessionStatus.ACTIVE).update(
+                scheduler_id=self.scheduler_id,
+                locked_until=self._lease_expiry(),
+                started_at=Coalesce('started_at', Value(now)),
+            ):
+                claimed.append(pk)
+        return list(
+            AutoChatSession.objects.filter(pk__in=claimed).select_related('agent', 'action').order_by('created_at')
+        )
+
+    def owned(self, session_ids: Iterable[uuid.UUID]) -> Set[uuid.UUID]:
+        """Sessions of these that are still active and held by this scheduler"""
+        owned = set()
+        for batch in _batches(session_ids):
+            owned.update(AutoChatSession.objects.filter(
+                pk__in=batch, scheduler_id=self.scheduler_id, status=AutoChatSession.SessionStatus.ACTIVE
+            ).values_list('pk', flat=True))
+        return owned
+
+    def heartbeat(self, session_ids: Iterable[uuid.UUID]) -> int:
+        """Renew the lease on sessions this scheduler is running"""
+        expiry = self._lease_expiry()
+        return sum(
+            AutoChatSession.objects.filter(
+                pk__in=batch, scheduler_id=self.scheduler_id, status=AutoChatSession.SessionStatus.ACTIVE
+            ).update(locked_until=expiry)
+            for batch in _batches(session_ids)
+        )
+
+    def record_iteration(self, session_id: uuid.UUID, strategy_state: Optional[Dict[str, Any]] = None) -> int:
+        """Count a finished iteration, saving the strategy's snapshot if given"""
+        fields = {'iterations': F('iterations') + 1, 'last_run_at': timezone.now()}
+        if strategy_state is not None:
+            fields['strategy_state'] = strategy_state
+        return AutoChatSession.objects.filter(pk=session_id, scheduler_id=self.scheduler_id).update(**fields)
+
+    def settle(self, session_id: uuid.UUID, status: str, error_message: str = '') -> bool:
+        """Record how a session ended; only the scheduler holding it may"""
+        return bool(AutoChatSession.objects.filter(
+            pk=session_id, scheduler_id=self.scheduler_id, status=AutoChatSession.SessionStatus.ACTIVE
+        ).update(status=status, error_message=error_message, locked_until=None, finished_at=timezone.now()))
+
+    @staticmethod
+    def close_action(session_id: uuid.UUID) -> int:
+        """Mark the action of a stopped session completed"""
+        return AgentAction.objects.filter(auto_chat_session__pk=session_id, status="pending").update(status="completed")
+
+    def release(self, session_ids: Iterable[uuid.UUID]) -> int:
+        """Hand sessions this scheduler will not keep running to another scheduler"""
+        return sum(
+            AutoChatSession.objects.filter(
+                pk__in=batch, scheduler_id=self.scheduler_id, status=AutoChatSession.SessionStatus.ACTIVE
+            ).update(scheduler_id='', locked_until=None)
+            for batch in _batches(session_ids)
+        )
+
+
+class _ScheduledSession:
+    __slots__ = ('session', 'manager', 'run', 'failures', '_events')
+
+    def __init__(self, session: AutoChatSession):
+        self.session = session
+        self.manager: Optional[DeFiAgentManager] = None
+        self.run: Optional[AutoChatRun] = None
+        self.failures = 0
+        self._events: Optional[ActionEventLog] = None
+
+    @property
+    def events(self) -> Optional[ActionEventLog]:
+        """The session's event log, also before its run could be opened"""
+        if self.run is not None:
+            return self.run.events
+        if self._events is None and self.session.action is not None:
+            self._events = ActionEventLog(self.session.action)
+        return self._events
+
+
+class AutoChatScheduler:
+    """
+    Runs claimed auto-chat sessions as ticks of a TickScheduler.
+
+    A session is not a task sleeping between iterations but a job on the
+    timing wheel, and each tick runs one iteration (ChatService
+    .aauto_chat_step) on a bounded pool of workers. `workers` caps how
+    many iterations, and so LLM turns, run at once and `per_owner` how
+    many of one user's agents do. A tick coming due while the session's
+    previous iteration is still queued or running is merged or skipped.
+    A failed iteration is reported to subscribers and retried with
+    exponential backoff; only `max_failures` failures in a row fail the
+    session.
+    Every poll the scheduler claims new sessions up to max_sessions and
+    drops the ones stopped through the API.
+    """
+
+    def __init__(
+        self,
+        scheduler_id: Optional[str] = None,
+        max_sessions: int = None,
+        poll_interval: float = None,
+        workers: int = None,
+        per_owner: int = None,
+        jitter: float = None,
+    ):
+        self.store = AutoChatSessionStore(scheduler_id)
+        self.max_sessions = max_sessions or getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_MAX_SESSIONS', 5000)
+        self.poll_interval = poll_interval or getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_POLL_INTERVAL', 1.0)
+        self.ticks = TickScheduler(
+            workers=workers or getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_WORKERS', 64),
+            per_owner=per_owner or getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_PER_OWNER', 8),
+            jitter=getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_JITTER', 0.1) if jitter is None else jitter,
+            resolution=getattr(settings, 'AGENT_AUTO_CHAT_SCHEDULER_RESOLUTION', 0.1),
+        )
+        self.persist_state = getattr(settings, 'AGENT_AUTO_CHAT_PERSIST_STRATEGY_STATE', True)
+        self.max_failures = getattr(settings, 'AGENT_AUTO_CHAT_MAX_FAILURES', 5)
+        self.max_backoff = getattr(settings, 'AGENT_AUTO_CHAT_MAX_BACKOFF', 300)
+        self._sessions: Dict[uuid.UUID, _ScheduledSession] = {}
+
+    @property
+    def scheduler_id(self) -> str:
+        return self.store.scheduler_id
+
+    @property
+    def running(self) -> int:
+        return len(self._sessions)
+
+    async def _tick(self, session_id: uuid.UUID):
+        """Run one iteration of a session, opening it on its first tick"""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return
+        session = entry.session
+        try:
+            if entry.run is None:
+                entry.manager = await sync_to_async(DeFiAgentManager)(session.agent)
+                await sync_to_async(entry.manager._ensure_services_initialized)()
+                entry.run = await entry.manager.chat_service.aopen_auto_chat(
+                    session.message,
+                    session.interval,
+                    session.strategy or None,
+                    session.conversation_id,
+                    action=session.action,
+                    strategy_config=session.strategy_config,
+                )
+                if session.strategy_state:
+                    # Taken over from another scheduler: continue where it left off
+                    entry.run.strategy.restore(session.strategy_state)
+                    entry.run.iterations = session.iterations
+            response = await entry.manager.chat_service.aauto_chat_step(entry.run)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._failed(entry, f"Auto-chat iteration failed: {str(e)}")
+            return
+
+        entry.failures = 0
+        if response is None:
+            # Event-driven strategy idle on this tick
+            return
+        if session_id not in self._sessions:
+            # Stopped while the iteration ran
+            await entry.run.events.aflush()
+            return
+        # Subscribers get the iteration once from the hub instead of each reading the log
+        await EventHub().apublish(session_topic(session_id), {"sequence": entry.run.events.count, "frame": response})
+        await sync_to_async(self.store.record_iteration)(
+            session_id, entry.run.strategy.snapshot() if self.persist_state else None
+        )
+        try:
+            await sync_to_async(entry.manager.wallet_service.update_wallet_data)()
+        except Exception as e:
+            logger.warning(f"Failed to update wallet data: {str(e)}")
+        if entry.run.finished:
+            await self._finish(session_id)
+
+    async def _failed(self, entry: _ScheduledSession, error: str):
+        """Report a failed iteration and retry it later, or fail the session after max_failures in a row"""
+        session_id = entry.session.pk
+        entry.failures += 1
+        logger.error(f"Auto-chat session {session_id} iteration failed ({entry.failures}/{self.max_failures}): {error}")
+        if entry.failures >= self.max_failures or session_id not in self._sessions:
+            await self._finish(session_id, error)
+            return
+
+        retry_in = min(entry.session.interval * 2 ** (entry.failures - 1), self.max_backoff)
+        self.ticks.postpone(session_id, retry_in)
+        frame = {"error": error, "failures": entry.failures, "retry_in": retry_in}
+        events = entry.events
+        if events is None:
+            return
+        try:
+            await events.aappend(frame)
+            await events.aflush()
+        except Exception as e:
+            logger.warning(f"Failed to record error of auto-chat session {session_id}: {str(e)}")
+            return
+        await EventHub().apublish(session_topic(session_id), {"sequence": events.count, "frame": frame})
+
+    def _schedule(self, session: AutoChatSession):
+        self._sessions[session.pk] = _ScheduledSession(session)
+        self.ticks.add(
+            session.pk,
+            session.interval,
+            lambda: self._tick(session.pk),
+            owner=session.agent.owner_id,
+        )
+
+    async def _drop(self, session_id: uuid.UUID, error: Optional[str] = None) -> Optional[_ScheduledSession]:
+        """Take a session off the wheel and settle its action"""
+        entry = self._sessions.pop(session_id, None)
+        self.ticks.remove(session_id)
+        if entry is None:
+            return None
+        if entry.run is not None:
+            await entry.manager.chat_service.aclose_auto_chat(entry.run, error)
+        else:
+            if entry._events is not None:
+                await entry._events.aflush()
+            await sync_to_async(self.store.close_action)(session_id)
+        return entry
+
+    async def _finish(self, session_id: uuid.UUID, error: str = ''):
+        if await self._drop(session_id, error or None) is None:
+            return
+        status = AutoChatSession.SessionStatus.FAILED if error else AutoChatSession.SessionStatus.COMPLETED
+        await sync_to_async(self.store.settle)(session_id, status, error)
+        await EventHub().apublish(session_topic(session_id), {"status": status})
+        logger.info(f"Auto-chat session {session_id} {status}")
+
+    async def poll(self) -> int:
+        """Drop stopped sessions and claim new ones; returns sessions claimed"""
+        if self._sessions:
+            owned = await sync_to_async(self.store.owned)(list(self._sessions))
+            for session_id in [session_id for session_id in self._sessions if session_id not in owned]:
+                await self._drop(session_id)
+
+        claimed = await sync_to_async(self.store.claim)(self.max_sessions - len(self._sessions))
+        for session in claimed:
+            self._schedule(session)
+        return len(claimed)
+
+    async def run(self, stopping: asyncio.Event):
+        """Poll and tick until stopping is set, then hand running sessions back"""
+        heartbeat_interval = self.store.lease_ttl / 3
+        last_heartbeat = time.monotonic()
+        ticking_stopped = asyncio.Event()
+        ticking = asyncio.create_task(self.ticks.run(ticking_stopped), name=f"auto-chat-ticks-{self.scheduler_id}")
+        try:
+            while not stopping.is_set():
+                claimed = await self.poll()
+                if time.monotonic() - last_heartbeat >= heartbeat_interval:
+                    await sync_to_async(self.store.heartbeat)(list(self._sessions))
+                    last_heartbeat = time.monotonic()
+                if not claimed:
+                    try:
+                        await asyncio.wait_for(stopping.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            # Stop the wheel, cancelling iterations in progress
+            ticking_stopped.set()
+            await ticking
+            session_ids = list(self._sessions)
+            for entry in self._sessions.values():
+                if entry.run is not None or entry._events is not None:
+                    await entry.events.aflush()
+            self._sessions.clear()
+            await sync_to_async(self.store.release)(session_ids)
+            logger.info(f"Scheduler {self.scheduler_id} stopped: {self.ticks.summary()}")
+
+
+class AutoChatSessionEvents:
+    """
+    Follows a session for an HTTP subscriber.
+
+    Yields (event id, frame) pairs: the session itself first, then each
+    event payload as it is written, and a closing session frame once the
+    session has finished and every event was delivered. Event ids are
+    "<session id>:<sequence>", so a reconnecting client's Last-Event-ID
+    names both the session and where to resume; session frames carry no
+    id. When the events after `after` were already pruned from the replay
+    buffer, a gap frame says how many were lost. Unsubscribing does not
+    affect the session.
+
+    Missed events are read from the session's event log, live ones come
+    from its EventHub topic. The log is read again only when a published
+    item shows a gap (the subscription dropped some) or a status change,
+    or when nothing arrives for a while: every poll_interval until the
+    publisher's items are seen to reach this process, then every
+    fallback_interval.
+    """
+
+    def __init__(self, session: AutoChatSession, after: int = 0, poll_interval: float = None, fallback_interval: float = None):
+        self.session = session
+        self.after = after
+        self.poll_interval = poll_interval or getattr(settings, 'AGENT_AUTO_CHAT_SUBSCRIBE_POLL_INTERVAL', 0.5)
+        self.fallback_interval = fallback_interval or getattr(settings, 'AGENT_AUTO_CHAT_SUBSCRIBE_FALLBACK_INTERVAL', 5.0)
+
+    def event_id(self, sequence: int) -> str:
+        return f"{self.session.pk}:{sequence}"
+
+    @staticmethod
+    def parse_event_id(value: Optional[str]) -> Optional[Tuple[uuid.UUID, int]]:
+        """(session id, sequence) from a Last-Event-ID, or None if it is not one of ours"""
+        try:
+            session_id, sequence = (value or '').strip().rsplit(':', 1)
+            return uuid.UUID(session_id), max(0, int(sequence))
+        except ValueError:
+            return None
+
+    def _session_frame(self) -> Tuple[None, Dict[str, Any]]:
+        from ..serializers import AutoChatSessionSerializer
+        return None, {"session": AutoChatSessionSerializer(self.session).data}
+
+    def _poll(self) -> Tuple[List[Tuple[Optional[str], Dict[str, Any]]], bool]:
+        """New frames from the log and whether the session has finished"""
+        # Read the status first so no event written before it finished is missed
+        self.session.refresh_from_db(fields=['status', 'iterations', 'error_message', 'last_run_at', 'finished_at'])
+        finished = self.session.is_finished
+        events = list(
+            AgentActionEvent.objects.filter(action_id=self.session.action_id, sequence__gt=self.after)
+            .order_by('sequence')[:100]
+        )
+        frames = []
+        if events:
+            if events[0].sequence > self.after + 1:
+                frames.append((None, {"gap": {"after": self.after, "missed": events[0].sequence - self.after - 1}}))
+            frames.extend((self.event_id(event.sequence), event.payload) for event in events)
+            self.after = events[-1].sequence
+        return frames, finished
+
+    def _live(self, items: List[Dict[str, Any]]) -> Tuple[List[Tuple[str, Dict[str, Any]]], bool]:
+        """Frames from published items and whether the log must be read next"""
+        frames = []
+        if not items:
+            return frames, True
+        for item in items:
+            sequence = item.get('sequence')
+            if sequence is None or sequence > self.after + 1:
+                # Status change, or items dropped from a full subscription
+                return frames, True
+            if sequence == self.after + 1:
+                self.after = sequence
+                frames.append((self.event_id(sequence), item['frame']))
+        return frames, not frames
+
+    def _timeout(self, subscription) -> float:
+        return self.fallback_interval if subscription.received else self.poll_interval
+
+    def __iter__(self) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+        hub = EventHub()
+        # Subscribe before reading the log so nothing published meanwhile is lost
+        subscription = hub.subscribe(session_topic(self.session.pk))
+        try:
+            yield self._session_frame()
+            poll = True
+            while True:
+                if poll:
+                    frames, finished = self._poll()
+                    yield from frames
+                    if finished and not frames:
+                        yield self._session_frame()
+                        return
+                    if frames:
+                        continue
+                frames, poll = self._live(subscription.get(self._timeout(subscription)))
+                yield from frames
+        finally:
+            hub.unsubscribe(subscription)
+            close_old_connections()
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[Optional[str], Dict[str, Any]]]:
+        hub = EventHub()
+        subscription = hub.subscribe(session_topic(self.session.pk))
+        try:
+            yield await sync_to_async(self._session_frame)()
+            poll = True
+            while True:
+                if poll:
+                    frames, finished = await sync_to_async(self._poll)()
+                    for frame in frames:
+                        yield frame
+                    if finished and not frames:
+                        yield await sync_to_async(self._session_frame)()
+                        return
+                    if frames:
+                        continue
+                frames, poll = self._live(await subscription.aget(self._timeout(subscription)))
+                for frame in frames:
+                    yield frame
+        finally:
+            hub.unsubscribe(subscription)
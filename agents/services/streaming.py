@@ -0,0 +1,92 @@
+"""
+Helpers for streaming agent output to clients.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+from django.conf import settings
+
+
+def _token_frame(parts: List[str]) -> Dict[str, Any]:
+    return {"type": "token", "content": "".join(parts)}
+
+
+async def coalesce_tokens(
+    events: AsyncIterator[Dict[str, Any]],
+    window: float = None,
+    max_chars: int = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Merge consecutive token events into frames.
+
+    A frame is emitted once `window` seconds have passed since its first
+    token, once it holds `max_chars` characters, or when a non-token event
+    arrives. Non-token events are passed through unchanged, in order.
+    """
+    if window is None:
+        window = getattr(settings, 'CHAT_STREAM_COALESCE_WINDOW_MS', 50) / 1000
+    if max_chars is None:
+        max_chars = getattr(settings, 'CHAT_STREAM_COALESCE_MAX_CHARS', 256)
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def pump():
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(done)
+
+    pump_task = asyncio.ensure_future(pump())
+    get_task = None
+    parts: List[str] = []
+    size = 0
+    deadline = None
+
+    try:
+        while True:
+            if get_task is None:
+                get_task = asyncio.ensure_future(queue.get())
+
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            finished, _ = await asyncio.wait({get_task}, timeout=timeout)
+
+            if not finished:
+                # Window elapsed with no new event: flush what we have
+                yield _token_frame(parts)
+                parts, size, deadline = [], 0, None
+                continue
+
+            event = get_task.result()
+            get_task = None
+
+            if event is done:
+                break
+            if isinstance(event, Exception):
+                raise event
+
+            if event.get("type") == "token":
+                parts.append(event["content"])
+                size += len(event["content"])
+                if deadline is None:
+                    deadline = loop.time() + window
+                if size >= max_chars:
+                    yield _token_frame(parts)
+                    parts, size, deadline = [], 0, None
+                continue
+
+            if parts:
+                yield _token_frame(parts)
+                parts, size, deadline = [], 0, None
+            yield event
+
+        if parts:
+            yield _token_frame(parts)
+
+    finally:
+        for task in (get_task, pump_task):
+            if task is not None and not task.done():
+                task.cancel()
@@ -0,0 +1,375 @@
+"""
+Per-turn latency and token accounting for agent chats.
+"""
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import RunnableConfig
+from langgraph.constants import TAG_NOSTREAM
+from ..models import AgentAction, AgentActionSpan, ChatMessage
+import logging
+
+logger = logging.getLogger(__name__)
+
+TURN_METRIC_FIELDS = (
+    'latency_ms', 'llm_ms', 'tool_ms', 'persistence_ms', 'routing_ms',
+    'llm_calls', 'tool_calls', 'prompt_tokens', 'completion_tokens', 'unrouted_prompt_tokens',
+)
+
+
+def percentiles(values: Iterable[float], points: Iterable[int] = (50, 95, 99)) -> Dict[str, Optional[float]]:
+    """Nearest-rank percentiles, None for an empty sample"""
+    ordered = sorted(value for value in values if value is not None)
+    return {
+        f"p{point}": ordered[max(0, math.ceil(point / 100 * len(ordered)) - 1)] if ordered else None
+        for point in points
+    }
+
+
+def _usage(response: LLMResult):
+    """(prompt, completion) tokens reported for an LLM call"""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None)
+            if usage:
+                return usage.get('input_tokens', 0), usage.get('output_tokens', 0)
+    usage = (response.llm_output or {}).get('token_usage') or {}
+    return usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0)
+
+
+class ToolInvocation:
+    """One tool call made during a turn, captured as it ran"""
+
+    def __init__(self, name: str, args: Dict[str, Any], result: Any = None, duration_ms: float = 0.0, error: bool = False):
+        self.name = name
+        self.args = args
+        self.result = result
+        self.duration_ms = duration_ms
+        self.error = error
+
+    @staticmethod
+    def parse(output: Any) -> Any:
+        """A tool's output with JSON content decoded once, here, rather than by every reader"""
+        content = getattr(output, 'content', output)
+        if isinstance(content, str) and content[:1] in ('{', '['):
+            try:
+                return json.loads(content)
+            except ValueError:
+                pass
+        return content
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call raised or returned a {"success": false} result"""
+        return not self.error and not (isinstance(self.result, dict) and self.result.get('success') is False)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'args': self.args,
+            'result': self.result,
+            'duration_ms': self.duration_ms,
+            'error': self.error,
+        }
+
+
+class ToolInvocations:
+    """A turn's tool invocations in call order, indexed by tool name"""
+
+    def __init__(self, invocations: Iterable[ToolInvocation] = ()):
+        self._invocations = list(invocations)
+        self._by_name: Dict[str, List[ToolInvocation]] = {}
+        for invocation in self._invocations:
+            self._by_name.setdefault(invocation.name, []).append(invocation)
+
+    def __iter__(self) -> Iterator[ToolInvocation]:
+        return iter(self._invocations)
+
+    def __len__(self) -> int:
+        return len(self._invocations)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def named(self, name: str) -> List[ToolInvocation]:
+        """Calls of a tool, oldest first"""
+        return self._by_name.get(name, [])
+
+    def latest(self, name: str) -> Optional[ToolInvocation]:
+        """Most recent call of a tool"""
+        calls = self._by_name.get(name)
+        return calls[-1] if calls else None
+
+
+class TurnMetrics(BaseCallbackHandler):
+    """
+    Timings and token usage for one chat turn.
+
+    Passed as a callback in the run config, it times every LLM and tool
+    call made by the graph, including context summary calls. Database
+    writes are timed with persisting(); checkpoint writes find the
+    collector under configurable["turn_metrics"]. With tool routing,
+    unrouted_prompt_tokens estimates the prompt tokens the turn would have
+    used with every tool bound. The model picked for the turn, and whether
+    it escalated to a stronger one, are recorded with the totals. Tool
+    calls are also kept as ToolInvocations (name, args, parsed result,
+    duration) for auto-chat strategies.
+    """
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._open = {}
+        self._tool_args = {}
+        self.spans = []
+        self.tool_invocations: List[ToolInvocation] = []
+        self.llm_ms = self.tool_ms = self.persistence_ms = self.routing_ms = 0.0
+        self.model = ''
+        self.escalated = False
+        self.llm_calls = self.tool_calls = 0
+        self.prompt_tokens = self.completion_tokens = self.unrouted_prompt_tokens = 0
+        self._tool_tokens_saved = 0
+
+    @staticmethod
+    def from_config(config: Optional[RunnableConfig]) -> Optional["TurnMetrics"]:
+        """The collector bound to a run, if any"""
+        return ((config or {}).get("configurable") or {}).get("turn_metrics")
+
+    @classmethod
+    def timing(cls, config: Optional[RunnableConfig]):
+        """persisting() of the run's collector, or a no-op outside a measured turn"""
+        metrics = cls.from_config(config)
+        return metrics.persisting() if metrics is not None else nullcontext()
+
+    @contextmanager
+    def persisting(self):
+        """Count the block as time spent writing to the database"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.persistence_ms += elapsed
+
+    def route(self, model: str, routing_ms: float, tool_tokens_saved: int = 0):
+        """Note the model picked for the turn, the time taken to pick the model and tools,
+        and the tool schema tokens each LLM call saves by tool routing"""
+        with self._lock:
+            self.model = model
+            self.routing_ms += routing_ms
+            self._tool_tokens_saved = tool_tokens_saved
+
+    def escalate(self, model: str):
+        """Note that the rest of the turn runs on a stronger model"""
+        with self._lock:
+            self.model = model
+            self.escalated = True
+
+    def _start(self, run_id: UUID, kind: str, name: str):
+        with self._lock:
+            self._open[run_id] = (kind, name, time.perf_counter())
+
+    def _finish(self, run_id: UUID, prompt_tokens: int = 0, completion_tokens: int = 0, error: bool = False, output: Any = None):
+        with self._lock:
+            opened = self._open.pop(run_id, None)
+            if opened is None:
+                return
+            kind, name, started = opened
+            duration_ms = (time.perf_counter() - started) * 1000
+            if kind == AgentActionSpan.SpanKind.TOOL:
+                self.tool_ms += duration_ms
+                self.tool_calls += 1
+                self.tool_invocations.append(ToolInvocation(
+                    name,
+                    self._tool_args.pop(run_id, None) or {},
+                    str(output) if error else ToolInvocation.parse(output),
+                    round(duration_ms, 3),
+                    error,
+                ))
+            else:
+                self.llm_ms += duration_ms
+                self.llm_calls += 1
+                self.prompt_tokens += prompt_tokens
+                self.completion_tokens += completion_tokens
+                self.unrouted_prompt_tokens += prompt_tokens
+                if kind == AgentActionSpan.SpanKind.LLM:
+                    # Summary calls carry no tool schemas
+                    self.unrouted_prompt_tokens += self._tool_tokens_saved
+            self.spans.append(AgentActionSpan(
+                kind=kind,
+                name=name[:100],
+                duration_ms=round(duration_ms, 3),
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                error=error,
+            ))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, tags=None, metadata=None, **kwargs):
+        kind = AgentActionSpan.SpanKind.SUMMARY if TAG_NOSTREAM in (tags or []) else AgentActionSpan.SpanKind.LLM
+        name = (metadata or {}).get('ls_model_name') or (serialized or {}).get('name') or 'llm'
+        self._start(run_id, kind, name)
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs):
+        prompt_tokens, completion_tokens = _usage(response)
+        self._finish(run_id, prompt_tokens, completion_tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=True)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, inputs=None, **kwargs):
+        with self._lock:
+            self._tool_args[run_id] = inputs
+        self._start(run_id, AgentActionSpan.SpanKind.TOOL, (serialized or {}).get('name') or 'tool')
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id, output=output)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=True, output=error)
+
+    @property
+    def tools(self) -> ToolInvocations:
+        """Tool calls of the turn so far"""
+        with self._lock:
+            return ToolInvocations(self.tool_invocations)
+
+    def merge(self, other: "TurnMetrics"):
+        """Add another turn's counters to these (spans are not carried over)"""
+        with self._lock:
+            for field in TURN_METRIC_FIELDS[1:]:
+                setattr(self, field, getattr(self, field) + getattr(other, field))
+            self.model = other.model or self.model
+            self.escalated = self.escalated or other.escalated
+
+    @property
+    def latency_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def fields(self) -> Dict[str, Any]:
+        """Column values for ChatMessage / AgentAction"""
+        with self._lock:
+            values = {field: getattr(self, field) for field in TURN_METRIC_FIELDS}
+            model, escalated = self.model, self.escalated
+        return {
+            **{key: round(value, 3) if isinstance(value, float) else value for key, value in values.items()},
+            'model': model,
+            'escalated': escalated,
+        }
+
+    def _take_spans(self, action: AgentAction):
+        with self._lock:
+            spans, self.spans = self.spans, []
+        for span in spans:
+            span.action = action
+        return spans
+
+    def save_spans(self, action: AgentAction):
+        """Store the spans recorded so far against the action"""
+        spans = self._take_spans(action)
+        if spans:
+            AgentActionSpan.objects.bulk_create(spans)
+
+    async def asave_spans(self, action: AgentAction):
+        """Async version of save_spans"""
+        spans = self._take_spans(action)
+        if spans:
+            await AgentActionSpan.objects.abulk_create(spans)
+
+    def record(self, action: AgentAction):
+        """Copy the totals onto the action, save it and store its spans"""
+        for field, value in self.fields().items():
+            setattr(action, field, value)
+        action.save()
+        self.save_spans(action)
+
+    async def arecord(self, action: AgentAction):
+        """Async version of record"""
+        for field, value in self.fields().items():
+            setattr(action, field, value)
+        await action.asave()
+        await self.asave_spans(action)
+
+
+def turn_stats(agent_id: int, since: datetime, sample_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    p50/p95/p99 of turn timings, tokens and per-call spans since a point in time.
+
+    Counts and token sums are aggregated in SQL over the whole window;
+    percentiles come from the newest `sample_size` turns and spans
+    (AGENT_TURN_STATS_SAMPLE_SIZE), so a long window never loads every row.
+    """
+    sample_size = sample_size or getattr(settings, 'AGENT_TURN_STATS_SAMPLE_SIZE', 5000)
+    turns = ChatMessage.objects.filter(
+        agent_id=agent_id,
+        message_type=ChatMessage.MessageType.AI,
+        created_at__gte=since,
+        latency_ms__isnull=False,
+    )
+    totals = turns.aggregate(
+        turns=Count('id'),
+        prompt=Sum('prompt_tokens'),
+        completion=Sum('completion_tokens'),
+        prompt_unrouted=Sum('unrouted_prompt_tokens'),
+    )
+    rows = list(turns.order_by('-created_at').values_list(*TURN_METRIC_FIELDS, 'model')[:sample_size])
+    columns = dict(zip((*TURN_METRIC_FIELDS, 'model'), zip(*rows))) if rows else {}
+
+    stats = {
+        "since": since.isoformat(),
+        "turns": totals["turns"],
+        "sampled_turns": len(rows),
+        "failed_turns": AgentAction.objects.filter(
+            agent_id=agent_id, created_at__gte=since, status='error', latency_ms__isnull=False
+        ).count(),
+        "tokens": {
+            "prompt": totals["prompt"] or 0,
+            "completion": totals["completion"] or 0,
+            "prompt_unrouted": totals["prompt_unrouted"] or 0,
+        },
+    }
+    for field in TURN_METRIC_FIELDS:
+        stats[field] = percentiles(columns.get(field, ()))
+
+    latencies = {}
+    for model, latency_ms in zip(columns.get('model', ()), columns.get('latency_ms', ())):
+        latencies.setdefault(model or 'unknown', []).append(latency_ms)
+    stats["models"] = {}
+    for group in turns.values('model').annotate(
+        count=Count('id'),
+        escalated=Count('id', filter=Q(escalated=True)),
+        prompt=Sum('prompt_tokens'),
+        completion=Sum('completion_tokens'),
+    ).order_by():
+        model = group['model'] or 'unknown'
+        stats["models"][model] = {
+            "turns": group['count'],
+            "escalated": group['escalated'],
+            "tokens": {"prompt": group['prompt'] or 0, "completion": group['completion'] or 0},
+            "latency_ms": percentiles(latencies.get(model, ())),
+        }
+
+    spans = AgentActionSpan.objects.filter(action__agent_id=agent_id, created_at__gte=since)
+    durations = {}
+    for kind, name, duration_ms in spans.order_by('-created_at').values_list('kind', 'name', 'duration_ms')[:sample_size]:
+        durations.setdefault((kind, name), []).append(duration_ms)
+    stats["calls"] = {}
+    for group in spans.values('kind', 'name').annotate(
+        count=Count('id'), errors=Count('id', filter=Q(error=True))
+    ).order_by():
+        stats["calls"].setdefault(group['kind'], {})[group['name']] = {
+            "count": group['count'],
+            "errors": group['errors'],
+            **percentiles(durations.get((group['kind'], group['name']), ())),
+        }
+    return stats
@@ -0,0 +1,243 @@
+"""
+Timing-wheel scheduler for periodic async jobs with bounded concurrency.
+"""
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel.
+
+    Scheduling appends to the slot of the target tick, O(1) however many
+    items are pending. Each tick only looks at its own slot; items due in
+    a later lap of the wheel stay in it until their tick comes round.
+    """
+
+    def __init__(self, resolution: float = 0.1, slots: int = 512, start: Optional[float] = None):
+        self.resolution = resolution
+        self.slots = slots
+        self._wheel: List[List[Tuple[int, Any]]] = [[] for _ in range(slots)]
+        self._start = time.monotonic() if start is None else start
+        self._tick = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ticks(self, when: float) -> int:
+        return math.ceil((when - self._start) / self.resolution)
+
+    def schedule(self, item: Any, when: float):
+        """Fire item at monotonic time `when` (at the earliest on the next tick)"""
+        target = max(self._tick + 1, self._ticks(when))
+        self._wheel[target % self.slots].append((target, item))
+        self._size += 1
+
+    def advance(self, now: float) -> List[Any]:
+        """Items whose tick passed since the last call, in tick order"""
+        due = []
+        current = int((now - self._start) / self.resolution)
+        while self._tick < current:
+            self._tick += 1
+            index = self._tick % self.slots
+            bucket = self._wheel[index]
+            if not bucket:
+                continue
+            keep = []
+            for entry in bucket:
+                if entry[0] <= self._tick:
+                    due.append(entry[1])
+                else:
+                    keep.append(entry)
+            self._wheel[index] = keep
+            self._size -= len(bucket) - len(keep)
+        return due
+
+
+class _Job:
+    __slots__ = ('key', 'interval', 'func', 'owner', 'generation', 'queued', 'running')
+
+    def __init__(self, key: Hashable, interval: float, func: Callable[[], Awaitable[Any]], owner: Hashable, generation: int):
+        self.key = key
+        self.interval = interval
+        self.func = func
+        self.owner = owner
+        self.generation = generation
+        self.queued = False
+        self.running = False
+
+
+class TickScheduler:
+    """
+    Runs periodic async jobs off a timing wheel on a bounded worker pool.
+
+    `workers` caps how many jobs run at once and `per_owner` how many of
+    one owner's jobs do; jobs over the owner cap wait in that owner's
+    backlog without holding a worker. Periods are jittered by +/-`jitter`
+    so jobs added together drift apart. A job due while its previous run
+    is still waiting is merged into it, and one due while its previous run
+    is still executing is skipped, so a slow job never piles up ticks.
+    """
+
+    def __init__(
+        self,
+        workers: int = 64,
+        per_owner: Optional[int] = None,
+        jitter: float = 0.1,
+        resolution: float = 0.1,
+        slots: int = 512,
+    ):
+        self.workers = workers
+        self.per_owner = per_owner
+        self.jitter = jitter
+        self.wheel = TimingWheel(resolution, slots)
+        self._jobs: Dict[Hashable, _Job] = {}
+        self._generation = 0
+        self._queue: Deque[Tuple[_Job, float]] = deque()
+        self._ready = asyncio.Event()
+        self._backlog: Dict[Hashable, Deque[Tuple[_Job, float]]] = defaultdict(deque)
+        self._owner_running: Dict[Hashable, int] = defaultdict(int)
+        self.stats = {
+            'fired': 0, 'completed': 0, 'failed': 0, 'skipped': 0, 'merged': 0, 'deferred': 0,
+            'running': 0, 'max_running': 0,
+        }
+        self.lateness: Deque[float] = deque(maxlen=10000)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._jobs
+
+    def _period(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def add(self, key: Hashable, interval: float, func: Callable[[], Awaitable[Any]], owner: Hashable = None, delay: Optional[float] = None):
+        """Run func every interval seconds, first after delay (a jittered fraction of interval by default)"""
+        self._generation += 1
+        job = self._jobs[key] = _Job(key, interval, func, owner, self._generation)
+        if delay is None:
+            delay = random.uniform(0, interval * max(self.jitter, 0.01))
+        self.wheel.schedule((key, job.generation, time.monotonic() + delay), time.monotonic() + delay)
+
+    def postpone(self, key: Hashable, delay: float):
+        """Run a job next after delay seconds instead of at its scheduled tick, then every interval again"""
+        job = self._jobs.get(key)
+        if job is not None:
+            self.add(key, job.interval, job.func, job.owner, delay)
+
+    def remove(self, key: Hashable):
+        """Stop scheduling a job; a run in progress finishes"""
+        self._jobs.pop(key, None)
+
+    def _current(self, key: Hashable, generation: int) -> Optional[_Job]:
+        job = self._jobs.get(key)
+        return job if job is not None and job.generation == generation else None
+
+    def _fire(self, key: Hashable, generation: int, due_at: float):
+        job = self._current(key, generation)
+        if job is None:
+            return
+        # Fixed rate from the due time, so slow dispatch does not drift the schedule
+        next_at = max(due_at + self._period(job.interval), time.monotonic())
+        self.wheel.schedule((key, generation, next_at), next_at)
+
+        self.stats['fired'] += 1
+        if job.running:
+            self.stats['skipped'] += 1
+        elif job.queued:
+            self.stats['merged'] += 1
+        else:
+            job.queued = True
+            self._queue.append((job, due_at))
+            self._ready.set()
+
+    def _take(self) -> Optional[Tuple[_Job, float]]:
+        """Next job whose owner is under its cap; others move to their owner's backlog"""
+        while self._queue:
+            job, due_at = self._queue.popleft()
+            if self._current(job.key, job.generation) is None:
+                job.queued = False
+                continue
+            if self.per_owner and self._owner_running[job.owner] >= self.per_owner:
+                self.stats['deferred'] += 1
+                self._backlog[job.owner].append((job, due_at))
+                continue
+            return job, due_at
+        return None
+
+    def _release(self, owner: Hashable):
+        self._owner_running[owner] -= 1
+        if not self._owner_running[owner]:
+            del self._owner_running[owner]
+        backlog = self._backlog.get(owner)
+        if backlog:
+            # Owner has room again: its oldest waiting job goes to the front
+            self._queue.appendleft(backlog.popleft())
+            if not backlog:
+                del self._backlog[owner]
+            self._ready.set()
+
+    async def _worker(self):
+        while True:
+            taken = self._take()
+            if taken is None:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            job, due_at = taken
+            job.queued = False
+            job.running = True
+            self._owner_running[job.owner] += 1
+            self.stats['running'] += 1
+            self.stats['max_running'] = max(self.stats['max_running'], self.stats['running'])
+            self.lateness.append(time.monotonic() - due_at)
+            try:
+                await job.func()
+                self.stats['completed'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"Scheduled job {job.key} failed: {str(e)}")
+            finally:
+                job.running = False
+                self.stats['running'] -= 1
+                self._release(job.owner)
+
+    async def run(self, stopping: asyncio.Event):
+        """Drive the wheel until stopping is set; running jobs are cancelled on exit"""
+        workers = [asyncio.create_task(self._worker(), name=f"tick-worker-{i}") for i in range(self.workers)]
+        try:
+            while not stopping.is_set():
+                for key, generation, due_at in self.wheel.advance(time.monotonic()):
+                    self._fire(key, generation, due_at)
+                try:
+                    await asyncio.wait_for(stopping.wait(), self.wheel.resolution)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters plus lateness percentiles in milliseconds"""
+        ordered = sorted(self.lateness)
+        percentile = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000 if ordered else 0.0
+        return {
+            **self.stats,
+            'jobs': len(self._jobs),
+            'backlog': sum(len(backlog) for backlog in self._backlog.values()),
+            'lateness_p50_ms': percentile(0.5),
+            'lateness_p95_ms': percentile(0.95),
+            'lateness_p99_ms': percentile(0.99),
+        }
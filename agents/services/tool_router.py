@@ -0,0 +1,125 @@
+"""
+Per-message selection of the tools bound to an agent turn.
+"""
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple
+from django.conf import settings
+from ..actions import ALL_ACTIONS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Intent -> (keyword pattern, tools the intent needs)
+TOOL_ROUTES = {
+    'wallet': (
+        r'wallet|address(es)?|balances?|holdings?|portfolio|funds?|faucet|testnet|network',
+        ['get_wallet_details', 'get_balance', 'get_balance_nft', 'request_faucet_funds'],
+    ),
+    'transfer': (
+        r'send|transfer|pay|payment',
+        ['transfer', 'transfer_nft', 'get_balance'],
+    ),
+    'trade': (
+        r'swap|trade|exchange|buy|sell|convert|wrap|weth',
+        ['trade', 'wrap_eth', 'get_balance', 'get_token_price'],
+    ),
+    'deploy': (
+        r'deploy|contract|erc-?20|erc-?721|mint|nfts?|collection|create (a |an |my )?(new )?token',
+        ['deploy_token', 'deploy_nft', 'deploy_contract', 'mint_nft', 'transfer_nft', 'get_balance_nft'],
+    ),
+    'price': (
+        r'prices?|worth|cost|value|market|history|historical|trend|usd|pyth',
+        ['get_token_price', 'get_token_price_storage', 'pyth_fetch_price', 'pyth_fetch_price_feed_id'],
+    ),
+    'reputation': (
+        r'reputation|risk|risky|safe|scam|trust(ed)?',
+        ['address_reputation'],
+    ),
+    'research': (
+        r'search|news|latest|docs?|documentation|guide|tutorial|explain|how (do|to|can)|what is',
+        ['search_web', 'search_documentation'],
+    ),
+    'basename': (
+        r'basenames?|\.base\.eth|register (a )?name',
+        ['register_basename'],
+    ),
+    'morpho': (
+        r'morpho|vaults?|deposit|withdraw|yield|lend(ing)?',
+        ['morpho_deposit', 'morpho_withdraw'],
+    ),
+    'superfluid': (
+        r'superfluid|stream(ing)?|flows?',
+        ['superfluid_create_flow', 'superfluid_update_flow', 'superfluid_delete_flow'],
+    ),
+    'wow': (
+        r'wow|zora|memecoins?|meme',
+        ['wow_create_token', 'wow_buy_token', 'wow_sell_token'],
+    ),
+}
+
+
+class ToolSelection:
+    """The tools chosen for one message"""
+
+    def __init__(self, actions: Sequence, intents: Tuple[str, ...], fallback: bool):
+        self.actions = list(actions)
+        self.intents = intents
+        self.fallback = fallback
+
+    @property
+    def names(self) -> List[str]:
+        return [action.name for action in self.actions]
+
+
+class ToolRouter:
+    """
+    Picks the subset of agent actions relevant to a message.
+
+    Each intent matched by keyword adds its tools, on top of the core tools
+    always bound (wallet details, which the system prompt asks for first).
+    A message matching no intent gets the full toolset. A per-agent
+    allow-list limits both the routed subset and the fallback, and one
+    naming no known tool leaves the agent without tools rather than with
+    all of them.
+    """
+
+    def __init__(self, actions: Sequence = ALL_ACTIONS, routes: Optional[dict] = None, core_tools: Optional[Iterable[str]] = None):
+        self.actions = list(actions)
+        self.routes = {
+            intent: (re.compile(rf'\b({pattern})\b', re.IGNORECASE), set(tools))
+            for intent, (pattern, tools) in (routes or TOOL_ROUTES).items()
+        }
+        self.core_tools = set(
+            core_tools if core_tools is not None
+            else getattr(settings, 'AGENT_TOOL_ROUTING_CORE_TOOLS', ['get_wallet_details'])
+        )
+
+    def allowed(self, allowlist: Optional[Iterable[str]] = None) -> list:
+        """Actions permitted by an allow-list, all of them without one and none if it matches nothing"""
+        if allowlist is None:
+            return self.actions
+        names = set(allowlist)
+        allowed = [action for action in self.actions if action.name in names]
+        if not allowed:
+            logger.warning(f"Tool allow-list {sorted(names)} matches no known tool, binding no tools")
+        return allowed
+
+    def intents(self, message: str) -> Tuple[str, ...]:
+        """Intents whose keywords appear in the message"""
+        return tuple(intent for intent, (pattern, _) in self.routes.items() if pattern.search(message or ''))
+
+    def select(self, message: str, allowlist: Optional[Iterable[str]] = None, routing: bool = True) -> ToolSelection:
+        """Tools to bind for a message, keeping the toolset order so graphs are shared"""
+        allowed = self.allowed(allowlist)
+        intents = self.intents(message) if routing else ()
+        if not intents:
+            return ToolSelection(allowed, intents, fallback=routing)
+
+        names = set(self.core_tools)
+        for intent in intents:
+            names |= self.routes[intent][1]
+        selected = [action for action in allowed if action.name in names]
+        if not selected or all(action.name in self.core_tools for action in selected):
+            # Matched intents whose tools are not allowed here
+            return ToolSelection(allowed, intents, fallback=True)
+        return ToolSelection(selected, intents, fallback=False)
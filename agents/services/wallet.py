@@ -4,7 +4,7 @@ Wallet management services for agents.
 from typing import Optional, Dict, Any
 from django.db import transaction
 from core.exceptions import AgentConfigurationError
-from cdp_langchain.utils import CdpAgentkitWrapper
+from ..backends import agentkit_wrapper
 from ..models import AgentWallet
 from .base import BaseAgentService
 import logging
@@ -37,7 +37,7 @@ class WalletService(BaseAgentService):
                     values = {"cdp_wallet_data": wallet_data}
                 
                 # Create CDP Agentkit wrapper
-                self._agentkit = CdpAgentkitWrapper(
+                self._agentkit = agentkit_wrapper(
                     agent_id=str(self.agent.id),
                     wallet_id=self.wallet.wallet_id,
                     wallet_address=self.wallet.address,
@@ -66,7 +66,7 @@ class WalletService(BaseAgentService):
                 )
                 
                 # Create new CDP Agentkit wrapper
-                self._agentkit = CdpAgentkitWrapper(
+                self._agentkit = agentkit_wrapper(
                     agent_id=str(self.agent.id),
                     network_id=network_id
                 )
@@ -1,8 +1,18 @@
 """
 Custom toolkits for the framework
 """
-from typing import List
+import asyncio
+import os
+import threading
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from functools import partial
+from typing import Any, Hashable, List, Optional, Sequence
+from django.conf import settings
 from pydantic import BaseModel, ConfigDict
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 from langchain_core.tools.base import BaseToolkit
 from cdp_langchain.tools import CdpTool
@@ -10,6 +20,132 @@ from cdp_langchain.utils import CdpAgentkitWrapper
 from agents.actions import ALL_ACTIONS
 
 
+# Called with the tool name after a state-changing tool ran in this context,
+# e.g. by the job queue to know a job must not run again
+wallet_write_callback: ContextVar[Optional[Callable[[str], None]]] = ContextVar('wallet_write_callback', default=None)
+
+
+class _WalletLock:
+    """threading.Lock that can be weakly referenced"""
+    __slots__ = ('_lock', '__weakref__')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+
+class ToolConcurrency:
+    """
+    Process-wide thread pool for tool calls and per-wallet write locks.
+
+    Tool calls from one ReAct step run concurrently on the pool, bounded by
+    AGENT_TOOL_MAX_WORKERS. Read-only tools never wait on each other; tools
+    that change wallet state take their wallet's lock, so transfers, trades
+    and deployments against one wallet run one at a time.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._executor = None
+                    instance._pid = None
+                    # A wallet's lock lives while some call holds or waits on it
+                    instance._wallet_locks = weakref.WeakValueDictionary()
+                    instance.max_workers = getattr(settings, 'AGENT_TOOL_MAX_WORKERS', 8)
+                    cls._instance = instance
+        return cls._instance
+
+    def executor(self) -> ThreadPoolExecutor:
+        """The tool pool, recreated in forked worker processes"""
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='agent-tool')
+                    self._pid = os.getpid()
+        return self._executor
+
+    def wallet_lock(self, key: Hashable) -> _WalletLock:
+        """Lock serializing state-changing tool calls on one wallet"""
+        lock = self._wallet_locks.get(key)
+        if lock is None:
+            with self._lock:
+                lock = self._wallet_locks.get(key)
+                if lock is None:
+                    lock = self._wallet_locks[key] = _WalletLock()
+        return lock
+
+
+class WalletBoundTool(BaseTool):
+    """
+    CDP tool that takes its wallet from the run config.
+
+    Equivalent to CdpTool, but the CdpAgentkitWrapper is read from
+    config["configurable"]["cdp_agentkit_wrapper"] on each call, so one
+    tool instance can be shared by every agent in the process. Tools that
+    are not read-only hold the wallet's write lock (keyed by
+    config["configurable"]["wallet_key"]) while running, and call
+    config["configurable"]["on_wallet_write"] and wallet_write_callback
+    afterwards, if they are set.
+    """
+
+    name: str = ""
+    description: str = ""
+    args_schema: Optional[type[BaseModel]] = None
+    func: Callable[..., str]
+    read_only: bool = False
+
+    def _run(
+        self,
+        instructions: Optional[str] = "",
+        config: RunnableConfig = None,
+        **kwargs: Any,
+    ) -> str:
+        """Run the action against the calling agent's wallet"""
+        configurable = (config or {}).get("configurable") or {}
+        wrapper = configurable.get("cdp_agentkit_wrapper")
+        if wrapper is None:
+            raise ValueError(f"No CDP Agentkit wrapper in the run config for tool {self.name}")
+
+        if not instructions or instructions == "{}":
+            instructions = ""
+        if self.args_schema is not None:
+            parsed_input_args = self.args_schema(**kwargs).model_dump()
+        else:
+            parsed_input_args = {"instructions": instructions}
+
+        if self.read_only:
+            return wrapper.run_action(self.func, **parsed_input_args)
+
+        with ToolConcurrency().wallet_lock(configurable.get("wallet_key", id(wrapper))):
+            result = wrapper.run_action(self.func, **parsed_input_args)
+
+        if on_wallet_write := configurable.get("on_wallet_write"):
+            on_wallet_write(self.name)
+        if callback := wallet_write_callback.get():
+            callback(self.name)
+        return result
+
+    async def _arun(
+        self,
+        instructions: Optional[str] = "",
+        config: RunnableConfig = None,
+        **kwargs: Any,
+    ) -> str:
+        """Run on the tool pool so the calls of one step overlap"""
+        call = partial(copy_context().run, self._run, instructions, config=config, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(ToolConcurrency().executor(), call)
+
+
 class CustomAgentToolkit(BaseToolkit, BaseModel):
     """Extended toolkit including custom actions"""
     
@@ -35,6 +171,23 @@ class CustomAgentToolkit(BaseToolkit, BaseModel):
         
         return toolkit
 
+    @classmethod
+    def from_actions(cls, actions: Sequence = ALL_ACTIONS) -> "CustomAgentToolkit":
+        """Create a wallet-independent toolkit; the wallet is bound per call"""
+        read_only_tools = set(getattr(settings, 'AGENT_READ_ONLY_TOOLS', []))
+        toolkit = cls()
+        toolkit._tools = [
+            WalletBoundTool(
+                name=action.name,
+                description=action.description,
+                func=action.func,
+                args_schema=action.args_schema,
+                read_only=action.name in read_only_tools
+            )
+            for action in actions
+        ]
+        return toolkit
+
     def get_tools(self) -> List[BaseTool]:
         """Get all tools"""
         return self._tools
\ No newline at end of file
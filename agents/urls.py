@@ -14,6 +14,10 @@ urlpatterns = [
     # Chat functionality
     path('<int:pk>/chat/', views.AgentChatView.as_view(), name='agent-chat'),
     path('<int:pk>/auto-chat/', views.AgentAutoChatView.as_view(), name='agent-auto-chat'),
+    path('<int:pk>/chat/async/', views.AsyncAgentChatView.as_view(), name='agent-chat-async'),
+    path('<int:pk>/auto-chat/async/', views.AsyncAgentAutoChatView.as_view(), name='agent-auto-chat-async'),
+    path('<int:pk>/turn-metrics/', views.AgentTurnMetricsView.as_view(), name='agent-turn-metrics'),
+    path('<int:pk>/turn-stats/', views.AgentTurnStatsView.as_view(), name='agent-turn-stats'),
     
     # Wallet management
     path('<int:pk>/wallet/', views.AgentWalletView.as_view(), name='agent-wallet'),
@@ -22,6 +26,16 @@ urlpatterns = [
     path('<int:pk>/actions/', views.AgentActionView.as_view(), name='agent-actions'),
     path('<int:pk>/tasks/', views.AgentTaskView.as_view(), name='agent-tasks'),
     path('actions/', views.AgentAvailableActionsView.as_view(), name='available-actions'),
+
+    # Background jobs
+    path('<int:pk>/jobs/', views.AgentJobListView.as_view(), name='agent-jobs'),
+    path('jobs/<uuid:job_id>/', views.AgentJobDetailView.as_view(), name='agent-job-detail'),
+    path('jobs/<uuid:job_id>/events/', views.AgentJobEventsView.as_view(), name='agent-job-events'),
+
+    # Scheduled auto-chat sessions
+    path('<int:pk>/auto-chat/sessions/', views.AgentAutoChatSessionListView.as_view(), name='agent-auto-chat-sessions'),
+    path('auto-chat/sessions/<uuid:session_id>/', views.AutoChatSessionDetailView.as_view(), name='auto-chat-session-detail'),
+    path('auto-chat/sessions/<uuid:session_id>/events/', views.AutoChatSessionEventsView.as_view(), name='auto-chat-session-events'),
     
     # Asset management
     path('<int:pk>/tokens/', views.AgentTokenView.as_view(), name='agent-tokens'),
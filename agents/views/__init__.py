@@ -3,12 +3,29 @@ Views package for agent management
 """
 from .agent_views import AgentListView, AgentDetailView
 from .wallet_views import AgentWalletView
-from .chat_views import AgentChatView, AgentAutoChatView
+from .chat_views import (
+    AgentChatView,
+    AgentAutoChatView,
+    AgentTurnMetricsView,
+    AgentTurnStatsView,
+    AsyncAgentChatView,
+    AsyncAgentAutoChatView
+)
 from .action_views import (
     AgentActionView,
     AgentAvailableActionsView,
     AgentTaskView
 )
+from .job_views import (
+    AgentJobListView,
+    AgentJobDetailView,
+    AgentJobEventsView
+)
+from .session_views import (
+    AgentAutoChatSessionListView,
+    AutoChatSessionDetailView,
+    AutoChatSessionEventsView
+)
 from .asset_views import (
     AgentTokenView,
     AgentBalanceView,
@@ -21,9 +38,19 @@ __all__ = [
     'AgentWalletView',
     'AgentChatView',
     'AgentAutoChatView',
+    'AgentTurnMetricsView',
+    'AgentTurnStatsView',
+    'AsyncAgentChatView',
+    'AsyncAgentAutoChatView',
     'AgentActionView',
     'AgentAvailableActionsView',
     'AgentTaskView',
+    'AgentJobListView',
+    'AgentJobDetailView',
+    'AgentJobEventsView',
+    'AgentAutoChatSessionListView',
+    'AutoChatSessionDetailView',
+    'AutoChatSessionEventsView',
     'AgentTokenView',
     'AgentBalanceView',
     'AgentTestFundsView',
@@ -14,9 +14,10 @@ from concurrent.futures import ThreadPoolExecutor
 
 from core.auth import AgentPermission
 from core.throttling import AgentActionThrottle
-from ..models import Agent
+from ..models import Agent, AgentJob
 from ..serializers import AgentActionSerializer
 from ..services import DeFiAgentManager
+from .job_views import queue_job_response
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,7 @@ class AgentActionView(views.APIView):
         agent = get_object_or_404(Agent, pk=pk)
         self.check_object_permissions(request, agent)
         
-        actions = agent.actions.all()[:10]
+        actions = agent.actions.prefetch_related('events')[:10]
         serializer = AgentActionSerializer(actions, many=True)
         return Response(serializer.data)
 
@@ -90,6 +91,17 @@ class AgentTaskView(views.APIView):
         agent = get_object_or_404(Agent, pk=pk)
         self.check_object_permissions(request, agent)
         
+        task = request.data.get('task')
+        if not task:
+            raise ValidationError("task description is required")
+
+        # ?mode=job queues the task for the worker pool and returns at once
+        if request.query_params.get('mode') == 'job':
+            return queue_job_response(request, agent, AgentJob.JobType.TASK, {
+                'task': task,
+                'conversation_id': request.data.get('conversation_id'),
+            })
+
         if not hasattr(agent, 'wallet'):
             try:
                 manager = DeFiAgentManager(agent)
@@ -97,10 +109,6 @@ class AgentTaskView(views.APIView):
             except Exception as e:
                 logger.error(f"Failed to initialize wallet for task: {str(e)}")
                 raise ValidationError("Agent needs a wallet to perform tasks. Wallet initialization failed.")
-        
-        task = request.data.get('task')
-        if not task:
-            raise ValidationError("task description is required")
 
         manager = DeFiAgentManager(agent)
         try:
@@ -7,13 +7,23 @@ from django.shortcuts import get_object_or_404
 from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from asgiref.sync import sync_to_async
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
 import json
 import logging
 
 from core.auth import AgentPermission
 from core.throttling import AgentActionThrottle
-from ..models import Agent
+from core.views import AsyncAPIView
+from ..models import Agent, AgentJob
 from ..services import DeFiAgentManager
+from ..services.concurrency import AgentTurnController
+from ..services.telemetry import turn_stats
+from ..services.sessions import AutoChatSessionEvents
+from .job_views import queue_job_response
+from .session_views import event_stream_response, resume_events, start_session
 
 logger = logging.getLogger(__name__)
 
@@ -37,16 +47,28 @@ class AgentChatView(views.APIView):
                     {"error": "message is required"}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
+
+            # ?mode=job queues the message for the worker pool and returns at once
+            if request.query_params.get('mode') == 'job':
+                return queue_job_response(request, agent, AgentJob.JobType.CHAT, {
+                    'message': message,
+                    'conversation_id': conversation_id,
+                })
             
             manager = DeFiAgentManager(agent)
             
-            # Check if streaming is requested
-            stream = request.query_params.get('stream', 'false').lower() == 'true'
+            # Check if streaming is requested: "true" streams graph steps, "tokens" streams LLM tokens
+            stream = request.query_params.get('stream', 'false').lower()
             
-            if stream:
+            if stream in ('true', 'tokens'):
                 def stream_generator():
                     try:
-                        for chunk in manager.stream_chat_sync(message, conversation_id=conversation_id):
+                        chunks = (
+                            manager.stream_chat_tokens(message, conversation_id=conversation_id)
+                            if stream == 'tokens'
+                            else manager.stream_chat_sync(message, conversation_id=conversation_id)
+                        )
+                        for chunk in chunks:
                             yield f"data: {json.dumps(chunk)}\n\n"
                     except Exception as e:
                         logger.error(f"Stream generation error: {str(e)}")
@@ -82,45 +104,148 @@ class AgentChatView(views.APIView):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class AgentAutoChatView(views.APIView):
-    """Run agent in autonomous chat mode"""
+    """Start an autonomous chat session and follow its output"""
     permission_classes = [AgentPermission]
     throttle_classes = [AgentActionThrottle]
     
     def post(self, request, pk):
-        """Start autonomous chat mode"""
+        """Start a scheduled auto-chat session and subscribe to its events, or resume one from Last-Event-ID"""
         try:
             agent = get_object_or_404(Agent, pk=pk)
             self.check_object_permissions(request, agent)
-            
-            interval = int(request.data.get('interval', 10))
+
+            # The scheduler runs the session; disconnecting only ends the subscription
+            events = resume_events(request, agent) or AutoChatSessionEvents(start_session(request, agent))
+            return event_stream_response(iter(events))
+                
+        except Exception as e:
+            logger.error(f"Auto-chat failed for agent {pk}: {str(e)}")
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class AgentTurnMetricsView(views.APIView):
+    """Turn queue metrics for an agent in the serving process"""
+    permission_classes = [AgentPermission]
+
+    def get(self, request, pk):
+        """Get queue depth, wait times and coalescing counters"""
+        agent = get_object_or_404(Agent, pk=pk)
+        self.check_object_permissions(request, agent)
+        return Response(AgentTurnController().metrics(agent.id))
+
+
+class AgentTurnStatsView(views.APIView):
+    """Latency and token percentiles of an agent's recent turns"""
+    permission_classes = [AgentPermission]
+
+    def get(self, request, pk):
+        """Get p50/p95/p99 per turn, per LLM call and per tool over ?window= seconds"""
+        agent = get_object_or_404(Agent, pk=pk)
+        self.check_object_permissions(request, agent)
+
+        try:
+            window = int(request.query_params.get('window', getattr(settings, 'AGENT_TURN_STATS_WINDOW', 3600)))
+        except ValueError:
+            return Response({"error": "window must be a number of seconds"}, status=status.HTTP_400_BAD_REQUEST)
+
+        window = min(max(window, 1), getattr(settings, 'AGENT_TURN_STATS_MAX_WINDOW', 7 * 24 * 3600))
+        return Response(turn_stats(agent.id, timezone.now() - timedelta(seconds=window)))
+
+
+class AsyncAgentViewMixin:
+    """Helpers for async agent views"""
+
+    def _get_agent(self, request, pk):
+        """Load the agent and check object permissions"""
+        agent = get_object_or_404(Agent.objects.select_related('owner'), pk=pk)
+        self.check_object_permissions(request, agent)
+        return agent
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAgentChatView(AsyncAgentViewMixin, AsyncAPIView):
+    """Chat with an agent without holding a worker thread (ASGI only)"""
+    permission_classes = [AgentPermission]
+    throttle_classes = [AgentActionThrottle]
+
+    async def post(self, request, pk):
+        """Process chat message"""
+        try:
+            agent = await sync_to_async(self._get_agent)(request, pk)
+
+            message = request.data.get('message')
             conversation_id = request.data.get('conversation_id')
-            message = request.data.get('message', (
-                "Be creative and do something interesting on the blockchain. "
-                "Choose an action or set of actions and execute it that highlights your abilities."
-            ))
-            
-            manager = DeFiAgentManager(agent)
-            
-            def stream_generator():
-                try:
-                    for chunk in manager.stream_auto_chat(
-                        message,
-                        interval=interval,
-                        conversation_id=conversation_id
-                    ):
-                        yield f"data: {json.dumps(chunk)}\n\n"
-                except Exception as e:
-                    logger.error(f"Auto-chat stream error: {str(e)}")
-                    yield f"data: {json.dumps({'error': str(e)})}\n\n"
 
-            response = StreamingHttpResponse(
-                stream_generator(),
-                content_type='text/event-stream'
+            if not message:
+                return Response(
+                    {"error": "message is required"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            manager = await sync_to_async(DeFiAgentManager)(agent)
+
+            # Check if streaming is requested: "true" streams graph steps, "tokens" streams LLM tokens
+            stream = request.query_params.get('stream', 'false').lower()
+
+            if stream in ('true', 'tokens'):
+                async def stream_generator():
+                    try:
+                        chunks = (
+                            manager.astream_chat_tokens(message, conversation_id=conversation_id)
+                            if stream == 'tokens'
+                            else manager.astream_chat(message, conversation_id=conversation_id)
+                        )
+                        async for chunk in chunks:
+                            yield f"data: {json.dumps(chunk)}\n\n"
+                    except Exception as e:
+                        logger.error(f"Stream generation error: {str(e)}")
+                        yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+                response = StreamingHttpResponse(
+                    stream_generator(),
+                    content_type='text/event-stream'
+                )
+                response["X-Accel-Buffering"] = "no"
+                response["Cache-Control"] = "no-cache"
+                return response
+
+            try:
+                result = await manager.achat(message, conversation_id=conversation_id)
+                return Response(result)
+            except Exception as e:
+                logger.error(f"Chat processing error: {str(e)}")
+                return Response(
+                    {"error": str(e)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        except Exception as e:
+            logger.error(f"Chat failed for agent {pk}: {str(e)}")
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            response["X-Accel-Buffering"] = "no"
-            response["Cache-Control"] = "no-cache"
-            return response
-                
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAgentAutoChatView(AsyncAgentViewMixin, AsyncAPIView):
+    """Start an autonomous chat session and follow its output without holding a worker thread (ASGI only)"""
+    permission_classes = [AgentPermission]
+    throttle_classes = [AgentActionThrottle]
+
+    async def post(self, request, pk):
+        """Start a scheduled auto-chat session and subscribe to its events, or resume one from Last-Event-ID"""
+        try:
+            agent = await sync_to_async(self._get_agent)(request, pk)
+
+            events = await sync_to_async(resume_events)(request, agent)
+            if events is None:
+                events = AutoChatSessionEvents(await sync_to_async(start_session)(request, agent))
+            return event_stream_response(events.__aiter__())
+
         except Exception as e:
             logger.error(f"Auto-chat failed for agent {pk}: {str(e)}")
             return Response(
@@ -0,0 +1,117 @@
+"""
+Background job submission and result views
+"""
+import asyncio
+import json
+import logging
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.decorators import method_decorator
+from asgiref.sync import sync_to_async
+from rest_framework import views, status
+from rest_framework.response import Response
+
+from core.auth import AgentPermission
+from core.throttling import AgentActionThrottle
+from core.views import AsyncAPIView
+from ..models import Agent, AgentJob
+from ..serializers import AgentJobSerializer
+from ..services.jobs import AgentJobQueue
+
+logger = logging.getLogger(__name__)
+
+
+def queue_job_response(request, agent: Agent, job_type: str, payload: dict) -> Response:
+    """Queue a job and answer 202 with where to poll or subscribe for its result"""
+    job = AgentJobQueue.submit(agent, job_type, payload)
+    data = AgentJobSerializer(job).data
+    data['status_url'] = request.build_absolute_uri(reverse('agents:agent-job-detail', args=[job.id]))
+    data['events_url'] = request.build_absolute_uri(reverse('agents:agent-job-events', args=[job.id]))
+    return Response(data, status=status.HTTP_202_ACCEPTED)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AgentJobListView(views.APIView):
+    """Submit and list background jobs for an agent"""
+    permission_classes = [AgentPermission]
+    throttle_classes = [AgentActionThrottle]
+
+    def get(self, request, pk):
+        """Get recent jobs"""
+        agent = get_object_or_404(Agent, pk=pk)
+        self.check_object_permissions(request, agent)
+
+        jobs = agent.jobs.all()
+        job_status = request.query_params.get('status')
+        if job_status:
+            jobs = jobs.filter(status=job_status)
+        return Response(AgentJobSerializer(jobs[:20], many=True).data)
+
+    def post(self, request, pk):
+        """Queue a chat or task job"""
+        agent = get_object_or_404(Agent, pk=pk)
+        self.check_object_permissions(request, agent)
+
+        job_type = request.data.get('job_type', AgentJob.JobType.CHAT)
+        field = 'task' if job_type == AgentJob.JobType.TASK else 'message'
+        if job_type not in AgentJob.JobType.values:
+            return Response({"error": f"Unknown job type: {job_type}"}, status=status.HTTP_400_BAD_REQUEST)
+        if not request.data.get(field):
+            return Response({"error": f"{field} is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return queue_job_response(request, agent, job_type, {
+            field: request.data[field],
+            'conversation_id': request.data.get('conversation_id'),
+        })
+
+
+class AgentJobDetailView(views.APIView):
+    """Poll a background job for its status and result"""
+    permission_classes = [AgentPermission]
+
+    def get(self, request, job_id):
+        """Get job status and result"""
+        job = get_object_or_404(AgentJob.objects.select_related('agent'), pk=job_id)
+        self.check_object_permissions(request, job.agent)
+        return Response(AgentJobSerializer(job).data)
+
+
+class AgentJobEventsView(AsyncAPIView):
+    """Subscribe to a background job's status changes over SSE (ASGI only)"""
+    permission_classes = [AgentPermission]
+
+    def _get_job(self, request, job_id):
+        job = get_object_or_404(AgentJob.objects.select_related('agent', 'agent__owner'), pk=job_id)
+        self.check_object_permissions(request, job.agent)
+        return job
+
+    async def get(self, request, job_id):
+        """Stream the job until it completes or fails"""
+        job = await sync_to_async(self._get_job)(request, job_id)
+        interval = getattr(settings, 'AGENT_JOB_SUBSCRIBE_POLL_INTERVAL', 0.5)
+
+        async def stream_generator():
+            current, last_status = job, None
+            try:
+                while True:
+                    if current.status != last_status:
+                        last_status = current.status
+                        yield f"data: {json.dumps(AgentJobSerializer(current).data, default=str)}\n\n"
+                    if current.is_finished:
+                        return
+                    await asyncio.sleep(interval)
+                    current = await AgentJob.objects.aget(pk=job_id)
+            except Exception as e:
+                logger.error(f"Job event stream error: {str(e)}")
+                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+        response = StreamingHttpResponse(
+            stream_generator(),
+            content_type='text/event-stream'
+        )
+        response["X-Accel-Buffering"] = "no"
+        response["Cache-Control"] = "no-cache"
+        return response
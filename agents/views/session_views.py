@@ -0,0 +1,163 @@
+"""
+Scheduled auto-chat session views
+"""
+import json
+import logging
+from typing import Optional
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.decorators import method_decorator
+from asgiref.sync import sync_to_async
+from rest_framework import views, status
+from rest_framework.response import Response
+
+from core.auth import AgentPermission
+from core.exceptions import AgentConfigurationError
+from core.throttling import AgentActionThrottle
+from core.views import AsyncAPIView
+from ..models import Agent, AutoChatSession
+from ..serializers import AutoChatSessionSerializer
+from ..services.sessions import AutoChatSessionEvents, AutoChatSessionStore
+
+logger = logging.getLogger(__name__)
+
+
+def start_session(request, agent: Agent) -> AutoChatSession:
+    """Start a session from auto-chat request parameters"""
+    try:
+        interval = int(request.data.get('interval', 10))
+    except (TypeError, ValueError):
+        raise AgentConfigurationError("interval must be a number of seconds")
+    return AutoChatSessionStore.start(
+        agent,
+        message=request.data.get('message'),
+        interval=interval,
+        strategy=request.data.get('strategy'),
+        conversation_id=request.data.get('conversation_id'),
+        config=request.data.get('config'),
+    )
+
+
+def last_event_id(request) -> Optional[str]:
+    """Last-Event-ID sent by a reconnecting EventSource, or ?last_event_id= for a fresh page"""
+    return request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+
+
+def resume_events(request, agent: Agent) -> Optional[AutoChatSessionEvents]:
+    """Events of the agent's session named by the request's Last-Event-ID, after that event"""
+    parsed = AutoChatSessionEvents.parse_event_id(last_event_id(request))
+    if parsed is None:
+        return None
+    session_id, sequence = parsed
+    session = AutoChatSession.objects.filter(pk=session_id, agent=agent).first()
+    if session is None:
+        return None
+    logger.info(f"Resuming auto-chat session {session_id} after event {sequence}")
+    return AutoChatSessionEvents(session, after=sequence)
+
+
+def _sse(event_id: Optional[str], frame) -> str:
+    data = f"data: {json.dumps(frame, default=str)}\n\n"
+    return f"id: {event_id}\n{data}" if event_id else data
+
+
+def event_stream_response(frames) -> StreamingHttpResponse:
+    """SSE response relaying (event id, frame) pairs from a sync or async iterator"""
+    if hasattr(frames, '__aiter__'):
+        async def stream_generator():
+            try:
+                async for event_id, frame in frames:
+                    yield _sse(event_id, frame)
+            except Exception as e:
+                logger.error(f"Auto-chat session stream error: {str(e)}")
+                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+    else:
+        def stream_generator():
+            try:
+                for event_id, frame in frames:
+                    yield _sse(event_id, frame)
+            except Exception as e:
+                logger.error(f"Auto-chat session stream error: {str(e)}")
+                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+    response = StreamingHttpResponse(
+        stream_generator(),
+        content_type='text/event-stream'
+    )
+    response["X-Accel-Buffering"] = "no"
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AgentAutoChatSessionListView(views.APIView):
+    """Start and list scheduled auto-chat sessions for an agent"""
+    permission_classes = [AgentPermission]
+    throttle_classes = [AgentActionThrottle]
+
+    def get(self, request, pk):
+        """Get recent sessions"""
+        agent = get_object_or_404(Agent, pk=pk)
+        self.check_object_permissions(request, agent)
+
+        sessions = agent.auto_chat_sessions.all()
+        session_status = request.query_params.get('status')
+        if session_status:
+            sessions = sessions.filter(status=session_status)
+        return Response(AutoChatSessionSerializer(sessions[:20], many=True).data)
+
+    def post(self, request, pk):
+        """Start a session and answer with where to follow it"""
+        agent = get_object_or_404(Agent, pk=pk)
+        self.check_object_permissions(request, agent)
+
+        try:
+            session = start_session(request, agent)
+        except AgentConfigurationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = AutoChatSessionSerializer(session).data
+        data['status_url'] = request.build_absolute_uri(reverse('agents:auto-chat-session-detail', args=[session.id]))
+        data['events_url'] = request.build_absolute_uri(reverse('agents:auto-chat-session-events', args=[session.id]))
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AutoChatSessionDetailView(views.APIView):
+    """Get or stop a scheduled auto-chat session"""
+    permission_classes = [AgentPermission]
+
+    def _get_session(self, request, session_id):
+        session = get_object_or_404(AutoChatSession.objects.select_related('agent'), pk=session_id)
+        self.check_object_permissions(request, session.agent)
+        return session
+
+    def get(self, request, session_id):
+        """Get session status"""
+        return Response(AutoChatSessionSerializer(self._get_session(request, session_id)).data)
+
+    def delete(self, request, session_id):
+        """Stop the session"""
+        session = self._get_session(request, session_id)
+        AutoChatSessionStore.stop(session)
+        session.refresh_from_db()
+        return Response(AutoChatSessionSerializer(session).data)
+
+
+class AutoChatSessionEventsView(AsyncAPIView):
+    """Subscribe to a scheduled auto-chat session's output over SSE (ASGI only)"""
+    permission_classes = [AgentPermission]
+
+    def _get_session(self, request, session_id):
+        session = get_object_or_404(AutoChatSession.objects.select_related('agent', 'agent__owner'), pk=session_id)
+        self.check_object_permissions(request, session.agent)
+        return session
+
+    async def get(self, request, session_id):
+        """Stream the session's events until it finishes, after Last-Event-ID when reconnecting"""
+        session = await sync_to_async(self._get_session)(request, session_id)
+        parsed = AutoChatSessionEvents.parse_event_id(last_event_id(request))
+        after = parsed[1] if parsed and parsed[0] == session.pk else 0
+        return event_stream_response(AutoChatSessionEvents(session, after=after).__aiter__())
@@ -102,6 +102,7 @@ CDP_NETWORK_ID = env('CDP_NETWORK_ID', default='base-sepolia')
 
 # Tavily Search Configuration
 TAVILY_API_KEY = env('TAVILY_API_KEY', default='')
+TAVILY_API_URL = env('TAVILY_API_URL', default='https://api.tavily.com')
 
 # Twitter Configuration (if needed)
 TWITTER_API_KEY = env('TWITTER_API_KEY', default='')
@@ -228,4 +229,188 @@ CDP_CACHE = {
 
 # Background task configuration
 BACKGROUND_TASK_RUN_ASYNC = True
-BACKGROUND_TASK_ASYNC_THREADS = 4
\ No newline at end of file
+BACKGROUND_TASK_ASYNC_THREADS = 4
+# Agent conversation checkpoints
+AGENT_CHECKPOINT_COMPRESSION = env.bool('AGENT_CHECKPOINT_COMPRESSION', default=True)
+AGENT_CHECKPOINT_COMPRESSION_MIN_BYTES = env.int('AGENT_CHECKPOINT_COMPRESSION_MIN_BYTES', default=1024)
+# Newest checkpoints kept per conversation thread (a turn writes a few); 0 keeps all
+AGENT_CHECKPOINT_KEEP = env.int('AGENT_CHECKPOINT_KEEP', default=20)
+
+# Token streaming: tokens are merged into one SSE frame per window or size limit
+CHAT_STREAM_COALESCE_WINDOW_MS = env.int('CHAT_STREAM_COALESCE_WINDOW_MS', default=50)
+CHAT_STREAM_COALESCE_MAX_CHARS = env.int('CHAT_STREAM_COALESCE_MAX_CHARS', default=256)
+
+# Streamed action events are buffered and written in batches
+AGENT_EVENT_FLUSH_SIZE = env.int('AGENT_EVENT_FLUSH_SIZE', default=20)
+AGENT_EVENT_FLUSH_INTERVAL = env.float('AGENT_EVENT_FLUSH_INTERVAL', default=1.0)
+
+# Conversation context: token budget per model call (overridable per agent via
+# configuration['context_token_budget']), tool output cap and rolling summary size
+AGENT_CONTEXT_TOKEN_BUDGET = env.int('AGENT_CONTEXT_TOKEN_BUDGET', default=8000)
+AGENT_CONTEXT_TOOL_OUTPUT_MAX_TOKENS = env.int('AGENT_CONTEXT_TOOL_OUTPUT_MAX_TOKENS', default=1000)
+AGENT_CONTEXT_SUMMARY_MAX_TOKENS = env.int('AGENT_CONTEXT_SUMMARY_MAX_TOKENS', default=500)
+AGENT_CONTEXT_SUMMARY_TIMEOUT = env.int('AGENT_CONTEXT_SUMMARY_TIMEOUT', default=7 * 24 * 3600)
+
+# Opt-in cache for repeated chat turns that only used read-only tools
+# (can also be enabled per agent via configuration['response_cache'])
+AGENT_RESPONSE_CACHE_ENABLED = env.bool('AGENT_RESPONSE_CACHE_ENABLED', default=False)
+AGENT_RESPONSE_CACHE_TTL = env.int('AGENT_RESPONSE_CACHE_TTL', default=60)
+AGENT_RESPONSE_CACHE_MAX_ENTRIES = env.int('AGENT_RESPONSE_CACHE_MAX_ENTRIES', default=1024)
+AGENT_READ_ONLY_TOOLS = env.list('AGENT_READ_ONLY_TOOLS', default=[
+    'address_reputation',
+    'get_balance',
+    'get_balance_nft',
+    'get_wallet_details',
+    'pyth_fetch_price',
+    'pyth_fetch_price_feed_id',
+    'search_documentation',
+    'get_token_price_storage',
+    'get_token_price',
+    'search_web',
+])
+
+# Tool calls from one agent step run concurrently on a shared pool; tools
+# not listed above hold a per-wallet lock
+AGENT_TOOL_MAX_WORKERS = env.int('AGENT_TOOL_MAX_WORKERS', default=8)
+
+# Bind only the tools a message needs (agents.services.tool_router); agents
+# can override with configuration 'tool_routing' and limit tools with
+# 'tool_allowlist' (tool names, checked on save; a list naming no known tool
+# binds none). Core tools are bound to every routed turn
+AGENT_TOOL_ROUTING_ENABLED = env.bool('AGENT_TOOL_ROUTING_ENABLED', default=True)
+AGENT_TOOL_ROUTING_CORE_TOOLS = env.list('AGENT_TOOL_ROUTING_CORE_TOOLS', default=['get_wallet_details'])
+# Compiled agent graphs (one per model and toolset) kept in memory, least
+# recently used evicted first
+AGENT_GRAPH_CACHE_SIZE = env.int('AGENT_GRAPH_CACHE_SIZE', default=64)
+
+# Answer simple requests ("balance?", "price of X") with one tool call and a
+# reply template instead of an LLM turn (agents.services.fast_path); agents
+# can override with configuration 'fast_path'
+AGENT_FAST_PATH_ENABLED = env.bool('AGENT_FAST_PATH_ENABLED', default=True)
+
+# Per-turn model tiers (agents.services.model_router): simple turns use the
+# fast model and escalate to the strong one after a failed tool call; long,
+# multi-step or tool-heavy turns and agents with recent tool failures start
+# on the strong model. Agents can override with configuration 'model',
+# 'model_tier' and 'model_routing'
+AGENT_MODEL_ROUTING_ENABLED = env.bool('AGENT_MODEL_ROUTING_ENABLED', default=True)
+AGENT_MODEL_FAST = env('AGENT_MODEL_FAST', default='gpt-4o-mini')
+AGENT_MODEL_STRONG = env('AGENT_MODEL_STRONG', default='gpt-4o')
+AGENT_MODEL_ROUTING_LONG_MESSAGE_WORDS = env.int('AGENT_MODEL_ROUTING_LONG_MESSAGE_WORDS', default=60)
+AGENT_MODEL_ROUTING_MAX_FAST_TOOLS = env.int('AGENT_MODEL_ROUTING_MAX_FAST_TOOLS', default=10)
+AGENT_MODEL_ROUTING_FAILURE_THRESHOLD = env.int('AGENT_MODEL_ROUTING_FAILURE_THRESHOLD', default=2)
+AGENT_MODEL_ROUTING_FAILURE_WINDOW = env.int('AGENT_MODEL_ROUTING_FAILURE_WINDOW', default=600)
+
+# LLM and CDP backends (agents.backends): 'openai' / 'cdp' in production,
+# 'fake' for the scripted chat model and in-memory wallets used by
+# `manage.py load_test_agents`. Fake latencies are in seconds
+AGENT_LLM_BACKEND = env('AGENT_LLM_BACKEND', default='openai')
+AGENT_CDP_BACKEND = env('AGENT_CDP_BACKEND', default='cdp')
+AGENT_FAKE_LLM_LATENCY = env.float('AGENT_FAKE_LLM_LATENCY', default=0.2)
+AGENT_FAKE_LLM_TOKEN_LATENCY = env.float('AGENT_FAKE_LLM_TOKEN_LATENCY', default=0.0)
+AGENT_FAKE_CDP_LATENCY = env.float('AGENT_FAKE_CDP_LATENCY', default=0.05)
+
+# Pooled outbound HTTP clients (core.http.HTTPClientRegistry); per-service
+# entries override 'default'
+HTTP_CLIENTS = {
+    'default': {
+        'timeout': env.float('HTTP_CLIENT_TIMEOUT', default=30.0),
+        'connect_timeout': env.float('HTTP_CLIENT_CONNECT_TIMEOUT', default=5.0),
+        'max_connections': env.int('HTTP_CLIENT_MAX_CONNECTIONS', default=100),
+        'max_keepalive_connections': env.int('HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS', default=20),
+        'keepalive_expiry': env.float('HTTP_CLIENT_KEEPALIVE_EXPIRY', default=30.0),
+    },
+    'openai': {
+        'timeout': env.float('OPENAI_HTTP_TIMEOUT', default=120.0),
+    },
+    'coingecko': {
+        'retries': 5,
+    },
+}
+
+# Per-agent turn serialization: turns queue in-process and hold a DB lease
+# across processes, renewed every TTL/3 seconds while the turn runs;
+# identical pending messages can optionally be coalesced (also per agent via
+# configuration['coalesce_messages'])
+AGENT_TURN_QUEUE_TIMEOUT = env.float('AGENT_TURN_QUEUE_TIMEOUT', default=300)
+AGENT_TURN_LEASE_ENABLED = env.bool('AGENT_TURN_LEASE_ENABLED', default=True)
+AGENT_TURN_LEASE_TTL = env.int('AGENT_TURN_LEASE_TTL', default=60)
+AGENT_TURN_LEASE_POLL_INTERVAL = env.float('AGENT_TURN_LEASE_POLL_INTERVAL', default=0.1)
+AGENT_TURN_COALESCE = env.bool('AGENT_TURN_COALESCE', default=False)
+AGENT_TURN_METRICS_SAMPLE_SIZE = env.int('AGENT_TURN_METRICS_SAMPLE_SIZE', default=1000)
+AGENT_TURN_STATE_IDLE_TTL = env.int('AGENT_TURN_STATE_IDLE_TTL', default=600)
+
+# Window (seconds) of the per-agent turn latency/token percentiles endpoint
+AGENT_TURN_STATS_WINDOW = env.int('AGENT_TURN_STATS_WINDOW', default=3600)
+AGENT_TURN_STATS_MAX_WINDOW = env.int('AGENT_TURN_STATS_MAX_WINDOW', default=7 * 24 * 3600)
+# Newest turns and spans the percentiles are computed from; counts and token
+# sums cover the whole window
+AGENT_TURN_STATS_SAMPLE_SIZE = env.int('AGENT_TURN_STATS_SAMPLE_SIZE', default=5000)
+
+# Background chat/task jobs (?mode=job) run by `manage.py run_agent_workers`;
+# running jobs hold a renewed lease and are requeued if their worker dies
+AGENT_JOB_WORKER_CONCURRENCY = env.int('AGENT_JOB_WORKER_CONCURRENCY', default=4)
+AGENT_JOB_POLL_INTERVAL = env.float('AGENT_JOB_POLL_INTERVAL', default=1.0)
+AGENT_JOB_LEASE_TTL = env.int('AGENT_JOB_LEASE_TTL', default=60)
+AGENT_JOB_MAX_ATTEMPTS = env.int('AGENT_JOB_MAX_ATTEMPTS', default=3)
+AGENT_JOB_SUBSCRIBE_POLL_INTERVAL = env.float('AGENT_JOB_SUBSCRIBE_POLL_INTERVAL', default=0.5)
+
+# Auto-chat sessions (agents.services.sessions) run by
+# `manage.py run_auto_chat_scheduler`; HTTP clients only subscribe to their
+# events. Running sessions hold a renewed lease and move to another
+# scheduler if theirs dies
+AGENT_AUTO_CHAT_SCHEDULER_MAX_SESSIONS = env.int('AGENT_AUTO_CHAT_SCHEDULER_MAX_SESSIONS', default=5000)
+AGENT_AUTO_CHAT_SCHEDULER_POLL_INTERVAL = env.float('AGENT_AUTO_CHAT_SCHEDULER_POLL_INTERVAL', default=1.0)
+AGENT_AUTO_CHAT_SESSION_LEASE_TTL = env.int('AGENT_AUTO_CHAT_SESSION_LEASE_TTL', default=60)
+AGENT_AUTO_CHAT_SUBSCRIBE_POLL_INTERVAL = env.float('AGENT_AUTO_CHAT_SUBSCRIBE_POLL_INTERVAL', default=0.5)
+AGENT_AUTO_CHAT_MIN_INTERVAL = env.int('AGENT_AUTO_CHAT_MIN_INTERVAL', default=1)
+# Events kept per session for subscribers resuming with Last-Event-ID
+AGENT_AUTO_CHAT_REPLAY_BUFFER = env.int('AGENT_AUTO_CHAT_REPLAY_BUFFER', default=500)
+# Strategies keep their newest HISTORY_SIZE iterations and PRICE_SAMPLES prices
+# per token; with PERSIST_STRATEGY_STATE the scheduler saves that snapshot on
+# the session each iteration and restores it when it takes the session over
+AGENT_AUTO_CHAT_HISTORY_SIZE = env.int('AGENT_AUTO_CHAT_HISTORY_SIZE', default=50)
+AGENT_AUTO_CHAT_PRICE_SAMPLES = env.int('AGENT_AUTO_CHAT_PRICE_SAMPLES', default=256)
+AGENT_AUTO_CHAT_PERSIST_STRATEGY_STATE = env.bool('AGENT_AUTO_CHAT_PERSIST_STRATEGY_STATE', default=True)
+# Auto-chat strategies beyond the built-in ones (agents.services.auto_chat.registry),
+# imported on first use: name -> dotted class path, or {'class': ..., 'config': ...}
+# naming a pydantic config schema too; None removes a name. Installed packages
+# may also register strategies under the STRATEGY_ENTRY_POINTS group
+AGENT_AUTO_CHAT_STRATEGIES = {}
+AGENT_AUTO_CHAT_STRATEGY_ENTRY_POINTS = env('AGENT_AUTO_CHAT_STRATEGY_ENTRY_POINTS', default='agents.auto_chat_strategies')
+# Subscribers of one session share each published iteration (core.pubsub.EventHub);
+# set AGENT_EVENT_HUB_CHANNEL_LAYER to a CHANNEL_LAYERS alias to deliver across
+# processes, otherwise subscribers outside the scheduler process read the event
+# log. A subscriber queue keeps the newest QUEUE_SIZE items
+AGENT_EVENT_HUB_QUEUE_SIZE = env.int('AGENT_EVENT_HUB_QUEUE_SIZE', default=100)
+AGENT_EVENT_HUB_CHANNEL_LAYER = env('AGENT_EVENT_HUB_CHANNEL_LAYER', default='')
+AGENT_AUTO_CHAT_SUBSCRIBE_FALLBACK_INTERVAL = env.float('AGENT_AUTO_CHAT_SUBSCRIBE_FALLBACK_INTERVAL', default=5.0)
+
+# Stored price feed (TokenPrice) written by `manage.py run_price_feed`; reads
+# fetch again when a token's latest row is older than MAX_AGE seconds
+AGENT_PRICE_FEED_TOKENS = env.list('AGENT_PRICE_FEED_TOKENS', default=['ethereum', 'bitcoin'])
+AGENT_PRICE_FEED_INTERVAL = env.float('AGENT_PRICE_FEED_INTERVAL', default=60)
+AGENT_PRICE_FEED_MAX_AGE = env.int('AGENT_PRICE_FEED_MAX_AGE', default=300)
+
+# Trading strategy trigger: "interval" runs the LLM on every tick, "price" only
+# when a monitored token moves MOVE_THRESHOLD percent, the stdev of its returns
+# over VOLATILITY_WINDOW seconds reaches VOLATILITY_THRESHOLD percent, or
+# MAX_IDLE seconds pass (per agent via configuration['trading_trigger'])
+AGENT_TRADING_TRIGGER_MODE = env('AGENT_TRADING_TRIGGER_MODE', default='interval')
+AGENT_TRADING_TRIGGER_MOVE_THRESHOLD = env.float('AGENT_TRADING_TRIGGER_MOVE_THRESHOLD', default=2.0)
+AGENT_TRADING_TRIGGER_VOLATILITY_THRESHOLD = env.float('AGENT_TRADING_TRIGGER_VOLATILITY_THRESHOLD', default=1.0)
+AGENT_TRADING_TRIGGER_VOLATILITY_WINDOW = env.int('AGENT_TRADING_TRIGGER_VOLATILITY_WINDOW', default=3600)
+AGENT_TRADING_TRIGGER_MAX_IDLE = env.int('AGENT_TRADING_TRIGGER_MAX_IDLE', default=3600)
+
+# Session iterations are ticks on a timing wheel (agents.services.tick_scheduler)
+# run by a bounded pool of workers: WORKERS caps concurrent iterations (LLM
+# turns) per scheduler and PER_OWNER those of one user's agents. Intervals
+# are jittered by +/-JITTER so sessions started together spread out
+AGENT_AUTO_CHAT_SCHEDULER_WORKERS = env.int('AGENT_AUTO_CHAT_SCHEDULER_WORKERS', default=64)
+AGENT_AUTO_CHAT_SCHEDULER_PER_OWNER = env.int('AGENT_AUTO_CHAT_SCHEDULER_PER_OWNER', default=8)
+AGENT_AUTO_CHAT_SCHEDULER_JITTER = env.float('AGENT_AUTO_CHAT_SCHEDULER_JITTER', default=0.1)
+AGENT_AUTO_CHAT_SCHEDULER_RESOLUTION = env.float('AGENT_AUTO_CHAT_SCHEDULER_RESOLUTION', default=0.1)
+# A failed iteration is retried after interval * 2^(failures - 1) seconds, at
+# most MAX_BACKOFF; MAX_FAILURES failures in a row fail the session
+AGENT_AUTO_CHAT_MAX_FAILURES = env.int('AGENT_AUTO_CHAT_MAX_FAILURES', default=5)
+AGENT_AUTO_CHAT_MAX_BACKOFF = env.int('AGENT_AUTO_CHAT_MAX_BACKOFF', default=300)
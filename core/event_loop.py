@@ -0,0 +1,126 @@
+"""
+Process-wide background event loop for running coroutines from sync code,
+and worker threads for running short database calls from async code
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundEventLoop:
+    """
+    Singleton owning one long-lived asyncio loop on a dedicated daemon thread.
+
+    Sync callers submit coroutines and get futures back, so connection pools,
+    TLS sessions and other loop-bound state survive between calls instead of
+    being thrown away with a fresh loop per call.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._loop = None
+                    instance._thread = None
+                    instance._pid = None
+                    cls._instance = instance
+        return cls._instance
+
+    def _ensure_started(self):
+        """Start the loop thread, restarting it in forked worker processes"""
+        if self._loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+
+            ready = threading.Event()
+            loop = asyncio.new_event_loop()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run, name='background-event-loop', daemon=True)
+            thread.start()
+            ready.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.info(f"Background event loop started in process {self._pid}")
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Get the running background loop"""
+        self._ensure_started()
+        return self._loop
+
+    def in_loop_thread(self) -> bool:
+        """Check whether the caller is running on the background loop thread"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule a coroutine on the background loop and return its future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the background loop and block until it finishes"""
+        if self.in_loop_thread():
+            # Blocking here would wait on ourselves forever
+            coro.close()
+            raise RuntimeError("Cannot block on the background event loop from its own thread")
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, agen: AsyncIterator) -> Iterator:
+        """Consume an async iterator from sync code, one item at a time"""
+        try:
+            while True:
+                try:
+                    yield self.run(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            aclose = getattr(agen, 'aclose', None)
+            if aclose is not None:
+                try:
+                    self.run(aclose())
+                except Exception as e:
+                    logger.warning(f"Failed to close async iterator: {str(e)}")
+
+
+def run_sync(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared background loop"""
+    return BackgroundEventLoop().run(coro, timeout)
+
+
+def _db_call(func: Callable, *args, **kwargs) -> Any:
+    """Run a database call on a worker thread, dropping its connection again unless it is persistent"""
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_db(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a short sync database call off the event loop.
+
+    Not thread-sensitive, so calls of concurrent requests do not queue on
+    one shared thread. Only for calls that return promptly: the threads
+    come from the loop's small default executor.
+    """
+    return await sync_to_async(_db_call, thread_sensitive=False)(func, *args, **kwargs)
@@ -0,0 +1,168 @@
+"""
+Process-wide pooled HTTP clients for outbound API calls
+"""
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CLIENT_CONFIG = {
+    'timeout': 30.0,
+    'connect_timeout': 5.0,
+    'max_connections': 100,
+    'max_keepalive_connections': 20,
+    'keepalive_expiry': 30.0,
+    'retries': 0,
+}
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter applying a default timeout to requests that don't set one"""
+
+    def __init__(self, timeout: httpx.Timeout, **kwargs):
+        self.timeout = (timeout.connect, timeout.read)
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport keeping a separate connection pool per event loop.
+
+    Pooled connections belong to the loop that opened them, and the same
+    client is used both from the background loop and from ASGI request
+    loops, so each loop gets its own pool.
+    """
+
+    def __init__(self, **transport_kwargs):
+        self._transport_kwargs = transport_kwargs
+        self._transports = weakref.WeakKeyDictionary()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._transport_kwargs)
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self):
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+class HTTPClientRegistry:
+    """
+    Singleton handing out pooled, keep-alive HTTP clients per upstream service.
+
+    Each named service (e.g. 'openai', 'tavily', 'coingecko') gets one httpx
+    client, one async httpx client and one requests session per process,
+    configured from HTTP_CLIENTS[name] on top of HTTP_CLIENTS['default'].
+    Clients are recreated in forked worker processes.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._clients = {}
+                    instance._pid = os.getpid()
+                    cls._instance = instance
+        return cls._instance
+
+    @staticmethod
+    def get_config(name: str) -> Dict[str, Any]:
+        """Client settings for a service, falling back to the defaults"""
+        configured = getattr(settings, 'HTTP_CLIENTS', {})
+        return {
+            **DEFAULT_HTTP_CLIENT_CONFIG,
+            **configured.get('default', {}),
+            **configured.get(name, {}),
+        }
+
+    def _timeout(self, config: Dict[str, Any]) -> httpx.Timeout:
+        return httpx.Timeout(config['timeout'], connect=config['connect_timeout'])
+
+    def _limits(self, config: Dict[str, Any]) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=config['max_connections'],
+            max_keepalive_connections=config['max_keepalive_connections'],
+            keepalive_expiry=config['keepalive_expiry'],
+        )
+
+    def _get(self, kind: str, name: str, factory):
+        """Return the cached client of a kind for a service, creating it once"""
+        if self._pid != os.getpid():
+            # Sockets must not be shared with the parent process
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._clients = {}
+                    self._pid = os.getpid()
+
+        key = (kind, name)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    config = self.get_config(name)
+                    client = self._clients[key] = factory(config)
+                    logger.info(f"Created pooled {kind} HTTP client for {name}")
+        return client
+
+    def client(self, name: str = 'default') -> httpx.Client:
+        """Pooled sync httpx client"""
+        return self._get('httpx', name, lambda config: httpx.Client(
+            timeout=self._timeout(config),
+            limits=self._limits(config),
+        ))
+
+    def async_client(self, name: str = 'default') -> httpx.AsyncClient:
+        """Pooled async httpx client, safe to use from any event loop"""
+        return self._get('httpx-async', name, lambda config: httpx.AsyncClient(
+            timeout=self._timeout(config),
+            transport=_LoopLocalTransport(limits=self._limits(config)),
+        ))
+
+    def session(self, name: str = 'default') -> requests.Session:
+        """Pooled requests session"""
+        def create(config):
+            session = requests.Session()
+            adapter = _TimeoutHTTPAdapter(
+                self._timeout(config),
+                pool_connections=config['max_keepalive_connections'],
+                pool_maxsize=config['max_connections'],
+                max_retries=config['retries'],
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            return session
+
+        return self._get('requests', name, create)
+
+    def close(self):
+        """Close the sync clients; async pools are dropped with their loops"""
+        with self._lock:
+            for (kind, _), client in self._clients.items():
+                if kind in ('httpx', 'requests'):
+                    client.close()
+            self._clients = {}
@@ -0,0 +1,210 @@
+"""
+In-process publish/subscribe hub with optional cross-process delivery over a Channels layer
+"""
+import asyncio
+import threading
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+import logging
+from django.conf import settings
+from .event_loop import BackgroundEventLoop
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Bounded queue of items published to one topic for one subscriber.
+
+    A full queue drops its oldest item, so a slow reader loses history
+    instead of stalling the publisher; `dropped` counts what it lost.
+    Readers may wait from any thread or event loop.
+    """
+
+    def __init__(self, topic: str, maxsize: int):
+        self.topic = topic
+        self.dropped = 0
+        self.received = 0
+        self._items: Deque[Any] = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._waiters: Set[tuple] = set()
+
+    def put(self, item: Any):
+        with self._lock:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self.received += 1
+            waiters = list(self._waiters)
+        self._ready.set()
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def drain(self) -> List[Any]:
+        """Take everything queued"""
+        with self._lock:
+            items = list(self._items)
+            self._items.clear()
+            self._ready.clear()
+        return items
+
+    def get(self, timeout: Optional[float] = None) -> List[Any]:
+        """Queued items, waiting up to timeout for the first one"""
+        items = self.drain()
+        if not items and self._ready.wait(timeout):
+            items = self.drain()
+        return items
+
+    async def aget(self, timeout: Optional[float] = None) -> List[Any]:
+        """Async version of get"""
+        items = self.drain()
+        if items:
+            return items
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._items:
+                waiter = None
+            else:
+                self._waiters.add(waiter)
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(waiter[1].wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    self._waiters.discard(waiter)
+        return self.drain()
+
+
+class EventHub:
+    """
+    Process-wide fan-out of published items to topic subscribers.
+
+    Publishing hands each item once to every local subscription of the
+    topic. With AGENT_EVENT_HUB_CHANNEL_LAYER naming a configured Channels
+    layer, items also go to the topic's group on that layer, and each
+    process with local subscribers relays the group into them from one
+    receiver on the background event loop, so a publisher in another
+    process (the auto-chat scheduler) reaches every web worker.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._topics: Dict[str, Set[Subscription]] = {}
+                    instance._relays: Dict[str, Any] = {}
+                    instance._origin = uuid.uuid4().hex
+                    instance.queue_size = getattr(settings, 'AGENT_EVENT_HUB_QUEUE_SIZE', 100)
+                    cls._instance = instance
+        return cls._instance
+
+    @property
+    def channel_layer(self):
+        """The configured Channels layer, or None for in-process delivery only"""
+        alias = getattr(settings, 'AGENT_EVENT_HUB_CHANNEL_LAYER', '')
+        if not alias:
+            return None
+        try:
+            from channels.layers import get_channel_layer
+        except ImportError:  # pragma: no cover - channels is optional
+            return None
+        return get_channel_layer(alias)
+
+    @staticmethod
+    def _group(topic: str) -> str:
+        # Channels group names: ASCII letters, digits, hyphens, periods
+        return f"hub.{topic}"[:99]
+
+    def subscribe(self, topic: str, maxsize: Optional[int] = None) -> Subscription:
+        """Start receiving a topic's items"""
+        subscription = Subscription(topic, maxsize or self.queue_size)
+        with self._lock:
+            self._topics.setdefault(topic, set()).add(subscription)
+            start_relay = topic not in self._relays and self.channel_layer is not None
+            if start_relay:
+                self._relays[topic] = None
+        if start_relay:
+            relay = BackgroundEventLoop().submit(self._relay(topic))
+            with self._lock:
+                # The last subscriber may have left meanwhile
+                if topic in self._topics and self._relays.get(topic) is None:
+                    self._relays[topic] = relay
+                    relay = None
+            if relay is not None:
+                relay.cancel()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._topics.get(subscription.topic)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if subscribers:
+                return
+            del self._topics[subscription.topic]
+            relay = self._relays.pop(subscription.topic, None)
+        if relay is not None:
+            relay.cancel()
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            return len(self._topics.get(topic, ()))
+
+    def _deliver(self, topic: str, item: Any) -> int:
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+        for subscription in subscribers:
+            subscription.put(item)
+        return len(subscribers)
+
+    def _message(self, item: Any) -> Dict[str, Any]:
+        return {"type": "hub.item", "origin": self._origin, "item": item}
+
+    def publish(self, topic: str, item: Any) -> int:
+        """Deliver item to local subscribers (and the channel layer); returns local deliveries"""
+        delivered = self._deliver(topic, item)
+        layer = self.channel_layer
+        if layer is not None:
+            BackgroundEventLoop().submit(layer.group_send(self._group(topic), self._message(item)))
+        return delivered
+
+    async def apublish(self, topic: str, item: Any) -> int:
+        """Async version of publish"""
+        delivered = self._deliver(topic, item)
+        layer = self.channel_layer
+        if layer is not None:
+            try:
+                await layer.group_send(self._group(topic), self._message(item))
+            except Exception as e:
+                logger.warning(f"Failed to publish to channel layer: {str(e)}")
+        return delivered
+
+    async def _relay(self, topic: str):
+        """Feed a topic's group on the channel layer into local subscribers"""
+        layer = self.channel_layer
+        group = self._group(topic)
+        channel = await layer.new_channel()
+        await layer.group_add(group, channel)
+        try:
+            while True:
+                message = await layer.receive(channel)
+                # Items this process published were delivered locally already
+                if message.get("origin") != self._origin:
+                    self._deliver(topic, message.get("item"))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Channel layer relay for {topic} failed: {str(e)}")
+        finally:
+            try:
+                await layer.group_discard(group, channel)
+            except Exception as e:
+                logger.warning(f"Failed to leave channel layer group {group}: {str(e)}")
@@ -2,8 +2,8 @@
 Core services for the framework
 """
 from typing import Dict, Any
-from tavily import TavilyClient
 from django.conf import settings
+from core.http import HTTPClientRegistry
 
 
 async def tavily_web_search(query: str, count: int = 5) -> Dict[str, Any]:
@@ -17,10 +17,23 @@ async def tavily_web_search(query: str, count: int = 5) -> Dict[str, Any]:
     Returns:
         dict: Search results containing webpage data formatted like Brave Search API
     """
-    client = TavilyClient(api_key=settings.TAVILY_API_KEY)
+    client = HTTPClientRegistry().async_client('tavily')
     
     try:
-        response = client.search(query, search_depth="basic", max_results=min(count, 10))
+        if not settings.TAVILY_API_KEY:
+            raise ValueError("TAVILY_API_KEY is not configured")
+
+        http_response = await client.post(
+            f"{settings.TAVILY_API_URL}/search",
+            json={
+                'api_key': settings.TAVILY_API_KEY,
+                'query': query,
+                'search_depth': 'basic',
+                'max_results': min(count, 10),
+            }
+        )
+        http_response.raise_for_status()
+        response = http_response.json()
         
         # Transform Tavily response to match Brave Search format
         results = [
@@ -0,0 +1,41 @@
+"""
+Base views shared across apps
+"""
+from asgiref.sync import sync_to_async
+from rest_framework import views
+
+
+class AsyncAPIView(views.APIView):
+    """
+    APIView whose handlers are coroutines.
+
+    Authentication, permission and throttle checks run exactly as in
+    APIView, but in a thread via sync_to_async, so under ASGI the handler
+    itself never blocks a worker thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Async counterpart of APIView.dispatch"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if hasattr(response, '__await__'):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response